@@ -59,6 +59,13 @@ def run_migrations_online() -> None:
     and associate a connection with the context.
 
     """
+    # A caller may hand over an open connection (e.g. the migration tests,
+    # which drive the async engine through run_sync)
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        _run_with_connection(connection)
+        return
+
     connectable = engine_from_config(
         config.get_section(config.config_ini_section, {}),
         prefix="sqlalchemy.",
@@ -66,12 +73,16 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
-        context.configure(
-            connection=connection, target_metadata=target_metadata
-        )
+        _run_with_connection(connection)
+
 
-        with context.begin_transaction():
-            context.run_migrations()
+def _run_with_connection(connection) -> None:
+    context.configure(
+        connection=connection, target_metadata=target_metadata
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
 
 
 if context.is_offline_mode():
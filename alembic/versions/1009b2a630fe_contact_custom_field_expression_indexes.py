@@ -0,0 +1,34 @@
+"""Expression indexes on hot contact custom_fields keys
+
+Revision ID: 1009b2a630fe
+Revises: 8c01b6616b80
+Create Date: 2026-10-16 10:25:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1009b2a630fe'
+down_revision: Union[str, None] = '8c01b6616b80'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_contact_cf_lead_score "
+        "ON contacts (((custom_fields ->> 'lead_score')::int)) "
+        "WHERE custom_fields ? 'lead_score'"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_contact_cf_preferences_gin "
+        "ON contacts USING gin ((custom_fields -> 'preferences') jsonb_path_ops)"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_contact_cf_preferences_gin', table_name='contacts', if_exists=True)
+    op.drop_index('idx_contact_cf_lead_score', table_name='contacts', if_exists=True)
@@ -0,0 +1,51 @@
+"""messages.country_code and messages.template_id columns
+
+Revision ID: 11998552e148
+Revises: c13d881f3aa7
+Create Date: 2026-10-16 11:50:00.000000
+
+Existing rows keep these values in message_metadata until the
+backfill_message_columns maintenance task copies them over, in batches
+outside the migration.
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '11998552e148'
+down_revision: Union[str, None] = 'c13d881f3aa7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _columns(table: str) -> set:
+    if context.is_offline_mode():
+        return set()
+    return {c["name"] for c in sa.inspect(op.get_bind()).get_columns(table)}
+
+
+def upgrade() -> None:
+    existing = _columns("messages")
+    if "country_code" not in existing:
+        op.add_column("messages", sa.Column("country_code", sa.CHAR(2)))
+        op.create_index("ix_messages_country_code", "messages", ["country_code"])
+    if "template_id" not in existing:
+        op.add_column("messages", sa.Column("template_id", postgresql.UUID(as_uuid=True)))
+        op.create_foreign_key(
+            "messages_template_id_fkey", "messages", "message_templates",
+            ["template_id"], ["id"], ondelete="SET NULL",
+        )
+        op.create_index("ix_messages_template_id", "messages", ["template_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_messages_template_id", table_name="messages")
+    op.drop_constraint("messages_template_id_fkey", "messages", type_="foreignkey")
+    op.drop_column("messages", "template_id")
+    op.drop_index("ix_messages_country_code", table_name="messages")
+    op.drop_column("messages", "country_code")
@@ -0,0 +1,47 @@
+"""Generate messages.contains_url from content, with a partial index
+
+Revision ID: 12cf096431bd
+Revises: bbf6db4436ca
+Create Date: 2026-10-16 12:20:00.000000
+
+The stored flags are replaced by the generated ones. The downgrade
+keeps the generated values as plain data.
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '12cf096431bd'
+down_revision: Union[str, None] = 'bbf6db4436ca'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _contains_url_is_generated() -> bool:
+    if context.is_offline_mode():
+        return False
+    columns = {c["name"]: c for c in sa.inspect(op.get_bind()).get_columns("messages")}
+    return "computed" in columns.get("contains_url", {})
+
+
+def upgrade() -> None:
+    if not _contains_url_is_generated():
+        op.drop_column("messages", "contains_url")
+        op.add_column("messages", sa.Column(
+            "contains_url", sa.Boolean(),
+            sa.Computed(r"content ~* 'https?://[^\s]+'", persisted=True),
+            nullable=False,
+        ))
+    op.create_index(
+        "idx_message_url", "messages", ["created_at"],
+        postgresql_where=sa.text("contains_url"), if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_message_url", table_name="messages")
+    op.execute("ALTER TABLE messages ALTER COLUMN contains_url DROP EXPRESSION")
@@ -0,0 +1,41 @@
+"""Drop contacts.full_name; Contact.full_name is derived from first/last name
+
+Revision ID: 133005529eda
+Revises: 15b937e316e9
+Create Date: 2026-10-16 11:25:00.000000
+
+The downgrade rebuilds the column from first_name/last_name the way the
+Contact.full_name property does.
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '133005529eda'
+down_revision: Union[str, None] = '15b937e316e9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _has_column(table: str, column: str) -> bool:
+    if context.is_offline_mode():
+        return True
+    return column in {c["name"] for c in sa.inspect(op.get_bind()).get_columns(table)}
+
+
+def upgrade() -> None:
+    if _has_column("contacts", "full_name"):
+        op.drop_column("contacts", "full_name")
+
+
+def downgrade() -> None:
+    op.add_column("contacts", sa.Column("full_name", sa.String(200)))
+    op.execute(
+        "UPDATE contacts SET full_name = CASE "
+        "WHEN first_name <> '' AND last_name <> '' THEN first_name || ' ' || last_name "
+        "ELSE COALESCE(NULLIF(first_name, ''), NULLIF(last_name, '')) END"
+    )
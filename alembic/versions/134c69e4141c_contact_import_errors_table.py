@@ -0,0 +1,93 @@
+"""Move contact import errors into contact_import_errors
+
+Revision ID: 134c69e4141c
+Revises: 985d248ccbc1
+Create Date: 2026-10-16 11:35:00.000000
+
+Each element of contact_imports.errors becomes one row. Row numbers,
+messages and row data are read from the row_number/row, error_text/
+error/message and raw_row/data keys; non-object elements are kept as
+the error text. contacts.import_row_number is dropped (its values are
+not restored on downgrade) and import_batch_id gets a partial index.
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '134c69e4141c'
+down_revision: Union[str, None] = '985d248ccbc1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _columns(table: str) -> set:
+    if context.is_offline_mode():
+        return {"errors", "import_row_number"}
+    return {c["name"] for c in sa.inspect(op.get_bind()).get_columns(table)}
+
+
+def _has_table(table: str) -> bool:
+    return not context.is_offline_mode() and sa.inspect(op.get_bind()).has_table(table)
+
+
+def upgrade() -> None:
+    if not _has_table("contact_import_errors"):
+        op.create_table(
+            "contact_import_errors",
+            sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+            sa.Column("import_id", postgresql.UUID(as_uuid=True), nullable=False),
+            sa.Column("row_number", sa.Integer()),
+            sa.Column("error_text", sa.Text(), nullable=False),
+            sa.Column("raw_row", postgresql.JSONB()),
+            sa.ForeignKeyConstraint(["import_id"], ["contact_imports.id"], ondelete="CASCADE"),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index(
+            "idx_contact_import_error_import_row", "contact_import_errors", ["import_id", "row_number"]
+        )
+
+    if "errors" in _columns("contact_imports"):
+        op.execute(
+            "INSERT INTO contact_import_errors (id, import_id, row_number, error_text, raw_row) "
+            "SELECT gen_random_uuid(), i.id, "
+            "  CASE WHEN jsonb_typeof(e.item) = 'object' "
+            "       THEN (substring(coalesce(e.item->>'row_number', e.item->>'row') FROM '^[0-9]{1,9}$'))::int END, "
+            "  CASE WHEN jsonb_typeof(e.item) = 'object' "
+            "       THEN coalesce(e.item->>'error_text', e.item->>'error', e.item->>'message', e.item::text) "
+            "       ELSE coalesce(e.item #>> '{}', 'unknown error') END, "
+            "  CASE WHEN jsonb_typeof(e.item) = 'object' "
+            "       THEN coalesce(e.item->'raw_row', e.item->'data') END "
+            "FROM contact_imports AS i, jsonb_array_elements(i.errors) WITH ORDINALITY AS e(item, n) "
+            "WHERE jsonb_typeof(i.errors) = 'array' "
+            "ORDER BY i.id, e.n"
+        )
+        op.drop_column("contact_imports", "errors")
+
+    if "import_row_number" in _columns("contacts"):
+        op.drop_column("contacts", "import_row_number")
+    op.create_index(
+        "idx_contact_import_batch", "contacts", ["import_batch_id"],
+        postgresql_where=sa.text("import_batch_id IS NOT NULL"), if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_contact_import_batch", table_name="contacts", if_exists=True)
+    op.add_column("contacts", sa.Column("import_row_number", sa.Integer()))
+    op.add_column("contact_imports", sa.Column("errors", postgresql.JSONB()))
+    op.execute(
+        "UPDATE contact_imports AS i SET errors = e.items "
+        "FROM ("
+        "  SELECT import_id, jsonb_agg(jsonb_strip_nulls(jsonb_build_object("
+        "    'row_number', row_number, 'error_text', error_text, 'raw_row', raw_row"
+        "  )) ORDER BY row_number NULLS LAST) AS items "
+        "  FROM contact_import_errors GROUP BY import_id"
+        ") AS e "
+        "WHERE i.id = e.import_id"
+    )
+    op.drop_table("contact_import_errors")
@@ -0,0 +1,43 @@
+"""Make idx_contact_user_phone unique
+
+Revision ID: 159fe8f87978
+Revises: 1bb13f52c8a5
+Create Date: 2026-10-16 10:35:00.000000
+
+Contact.bulk_import() relies on ON CONFLICT (user_id, phone_number),
+which needs a unique arbiter index. Duplicate (user_id, phone_number)
+pairs must be merged by hand first; the upgrade refuses to run otherwise.
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '159fe8f87978'
+down_revision: Union[str, None] = '1bb13f52c8a5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if not context.is_offline_mode():
+        duplicates = op.get_bind().execute(sa.text(
+            "SELECT count(*) FROM ("
+            "  SELECT 1 FROM contacts GROUP BY user_id, phone_number HAVING count(*) > 1"
+            ") AS dup"
+        )).scalar()
+        if duplicates:
+            raise RuntimeError(
+                f"{duplicates} (user_id, phone_number) pairs have duplicate contacts; "
+                "merge them before upgrading"
+            )
+    op.drop_index('idx_contact_user_phone', table_name='contacts', if_exists=True)
+    op.create_index('idx_contact_user_phone', 'contacts', ['user_id', 'phone_number'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_contact_user_phone', table_name='contacts', if_exists=True)
+    op.create_index('idx_contact_user_phone', 'contacts', ['user_id', 'phone_number'])
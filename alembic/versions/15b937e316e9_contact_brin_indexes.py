@@ -0,0 +1,33 @@
+"""BRIN indexes on contact activity and last-sent timestamps
+
+Revision ID: 15b937e316e9
+Revises: 37eff36d2749
+Create Date: 2026-10-16 11:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '15b937e316e9'
+down_revision: Union[str, None] = '37eff36d2749'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'idx_contact_activity_occurred_brin', 'contact_activities', ['occurred_at'],
+        postgresql_using='brin', postgresql_with={'pages_per_range': 32}, if_not_exists=True,
+    )
+    op.create_index(
+        'idx_contact_last_sent_brin', 'contacts', ['last_message_sent'],
+        postgresql_using='brin', if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_contact_last_sent_brin', table_name='contacts', if_exists=True)
+    op.drop_index('idx_contact_activity_occurred_brin', table_name='contact_activities', if_exists=True)
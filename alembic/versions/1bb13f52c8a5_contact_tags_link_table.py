@@ -0,0 +1,50 @@
+"""contact_tags link table, backfilled from contacts.tags
+
+Revision ID: 1bb13f52c8a5
+Revises: 1009b2a630fe
+Create Date: 2026-10-16 10:30:00.000000
+
+contacts.tags stays in place (CONTACT_TAGS_ARRAY_DUAL_WRITE keeps it
+written), so the downgrade only drops the link table.
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1bb13f52c8a5'
+down_revision: Union[str, None] = '1009b2a630fe'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _has_table(table: str) -> bool:
+    return not context.is_offline_mode() and sa.inspect(op.get_bind()).has_table(table)
+
+
+def upgrade() -> None:
+    if not _has_table("contact_tags"):
+        op.create_table(
+            "contact_tags",
+            sa.Column("contact_id", postgresql.UUID(as_uuid=True), nullable=False),
+            sa.Column("tag", sa.String(64), nullable=False),
+            sa.ForeignKeyConstraint(["contact_id"], ["contacts.id"], ondelete="CASCADE"),
+            sa.PrimaryKeyConstraint("contact_id", "tag"),
+        )
+        op.create_index("idx_contact_tags_tag_contact", "contact_tags", ["tag", "contact_id"])
+
+    op.execute(
+        "INSERT INTO contact_tags (contact_id, tag) "
+        "SELECT DISTINCT c.id, left(t.tag, 64) "
+        "FROM contacts AS c, unnest(c.tags) AS t(tag) "
+        "WHERE t.tag <> '' "
+        "ON CONFLICT DO NOTHING"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("contact_tags")
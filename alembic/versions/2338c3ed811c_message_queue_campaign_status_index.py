@@ -0,0 +1,27 @@
+"""Composite (campaign_id, status) index on message_queue
+
+Revision ID: 2338c3ed811c
+Revises: 4eb2d1a96cbc
+Create Date: 2026-10-16 12:35:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2338c3ed811c'
+down_revision: Union[str, None] = '4eb2d1a96cbc'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "idx_queue_campaign_status", "message_queue", ["campaign_id", "status"], if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_queue_campaign_status", table_name="message_queue")
@@ -0,0 +1,66 @@
+"""Move message error text into the message_details sidecar table
+
+Revision ID: 340a471de0da
+Revises: 4b7490c8b275
+Create Date: 2026-10-16 12:00:00.000000
+
+Only messages with error text get a row. There is no foreign key to
+messages: once it is partitioned, rows of dropped partitions are purged
+by the retention task instead. The downgrade truncates the text to the
+old VARCHAR lengths.
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '340a471de0da'
+down_revision: Union[str, None] = '4b7490c8b275'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _columns(table: str) -> set:
+    if context.is_offline_mode():
+        return {"error_message"}
+    return {c["name"] for c in sa.inspect(op.get_bind()).get_columns(table)}
+
+
+def _has_table(table: str) -> bool:
+    return not context.is_offline_mode() and sa.inspect(op.get_bind()).has_table(table)
+
+
+def upgrade() -> None:
+    if not _has_table("message_details"):
+        op.create_table(
+            "message_details",
+            sa.Column("message_id", postgresql.UUID(as_uuid=True), nullable=False),
+            sa.Column("error_message", sa.Text()),
+            sa.Column("dlr_error_message", sa.Text()),
+            sa.PrimaryKeyConstraint("message_id"),
+        )
+    if "error_message" in _columns("messages"):
+        op.execute(
+            "INSERT INTO message_details (message_id, error_message, dlr_error_message) "
+            "SELECT id, error_message, dlr_error_message FROM messages "
+            "WHERE error_message IS NOT NULL OR dlr_error_message IS NOT NULL "
+            "ON CONFLICT (message_id) DO NOTHING"
+        )
+        op.drop_column("messages", "error_message")
+        op.drop_column("messages", "dlr_error_message")
+
+
+def downgrade() -> None:
+    op.add_column("messages", sa.Column("error_message", sa.String(500)))
+    op.add_column("messages", sa.Column("dlr_error_message", sa.String(255)))
+    op.execute(
+        "UPDATE messages AS m "
+        "SET error_message = left(d.error_message, 500), dlr_error_message = left(d.dlr_error_message, 255) "
+        "FROM message_details AS d "
+        "WHERE d.message_id = m.id"
+    )
+    op.drop_table("message_details")
@@ -0,0 +1,34 @@
+"""Server-side '{}' default for contact list and segment metadata
+
+Revision ID: 37eff36d2749
+Revises: 6fa27520cddf
+Create Date: 2026-10-16 11:15:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '37eff36d2749'
+down_revision: Union[str, None] = '6fa27520cddf'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+METADATA_COLUMNS = [
+    ("contact_lists", "contact_metadata"),
+    ("contact_segments", "contactsegment_metadata"),
+]
+
+
+def upgrade() -> None:
+    for table, column in METADATA_COLUMNS:
+        op.alter_column(table, column, server_default=sa.text("'{}'::jsonb"))
+
+
+def downgrade() -> None:
+    for table, column in METADATA_COLUMNS:
+        op.alter_column(table, column, server_default=None)
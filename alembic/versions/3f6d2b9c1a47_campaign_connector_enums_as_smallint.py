@@ -0,0 +1,160 @@
+"""Store campaign/connector enums as SMALLINT codes
+
+Revision ID: 3f6d2b9c1a47
+Revises: a9eb68031457
+Create Date: 2026-10-16 09:12:00.000000
+
+Existing columns are native PostgreSQL ENUMs labelled with the member
+names ('SCHEDULED'); the models now store each member's 1-based
+declaration position (models.types.SmallEnum) in a SMALLINT column
+guarded by a named CHECK. connector_logs.level/event_type were free text;
+labels outside their enums become INFO / status_change, and the original
+event type is kept in data->>'legacy_event_type'.
+
+Columns that create_all already built as SMALLINT (fresh databases) are
+left alone, so the revision is safe to run either way.
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f6d2b9c1a47'
+down_revision: Union[str, None] = 'a9eb68031457'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (table, column, CHECK name, old native ENUM type, values in code order)
+ENUM_COLUMNS = [
+    ("campaigns", "campaign_type", "ck_campaign_type", "campaigntype",
+     ("immediate", "scheduled", "recurring", "triggered", "a_b_test")),
+    ("campaigns", "status", "ck_campaign_status", "campaignstatus",
+     ("draft", "scheduled", "running", "paused", "completed", "cancelled", "failed")),
+    ("campaigns", "priority", "ck_campaign_priority", "messagepriority",
+     ("low", "normal", "high", "urgent")),
+    ("smpp_connectors", "connector_type", "ck_connector_type", "connectortype",
+     ("smpp_client", "smpp_server", "http")),
+    ("smpp_connectors", "bind_type", "ck_connector_bind_type", "bindtype",
+     ("transceiver", "transmitter", "receiver")),
+    ("smpp_connectors", "status", "ck_connector_status", "connectorstatus",
+     ("stopped", "starting", "started", "stopping", "bound", "unbound", "error")),
+    ("routes", "type", "ck_route_type", "routetype",
+     ("default", "static_mt", "random_round_robin", "failover")),
+    ("filters", "type", "ck_filter_type", "filtertype",
+     ("destination", "source", "short_code", "content", "tag", "user", "group")),
+]
+
+LOG_LEVELS = ("DEBUG", "INFO", "WARN", "ERROR")
+LOG_EVENT_TYPES = (
+    "start", "stop", "bind", "unbind", "submit", "deliver", "dlr",
+    "status_change", "config_change", "error",
+)
+
+
+def _code_case(expr: str, values, default: Union[int, None] = None) -> str:
+    """CASE mapping each label in ``values`` to its 1-based code"""
+    whens = " ".join(f"WHEN '{value}' THEN {code}" for code, value in enumerate(values, start=1))
+    other = f" ELSE {default}" if default is not None else ""
+    return f"CASE {expr} {whens}{other} END"
+
+
+def _label_array(values) -> str:
+    return "ARRAY[" + ", ".join(f"'{value}'" for value in values) + "]"
+
+
+def _has_table(table: str) -> bool:
+    return context.is_offline_mode() or sa.inspect(op.get_bind()).has_table(table)
+
+
+def _legacy_columns(table: str) -> set:
+    """Columns of ``table`` still in the pre-migration layout
+
+    That is native ENUMs, or the free-text VARCHARs of connector_logs.
+    Offline (--sql) runs assume every column is legacy.
+    """
+    if context.is_offline_mode():
+        return {column for t, column, *_ in ENUM_COLUMNS if t == table} | {"level", "event_type"}
+    if not _has_table(table):
+        return set()
+    return {
+        column["name"] for column in sa.inspect(op.get_bind()).get_columns(table)
+        if isinstance(column["type"], (sa.Enum, sa.String))
+    }
+
+
+def upgrade() -> None:
+    for table, column, check, old_type, values in ENUM_COLUMNS:
+        if column not in _legacy_columns(table):
+            continue
+        op.alter_column(
+            table, column,
+            type_=sa.SmallInteger(),
+            postgresql_using=_code_case(f"lower({column}::text)", values),
+        )
+        op.create_check_constraint(check, table, f"{column} BETWEEN 1 AND {len(values)}")
+        op.execute(f"DROP TYPE IF EXISTS {old_type}")
+
+    if "level" in _legacy_columns("connector_logs"):
+        _upgrade_connector_logs()
+
+
+def _upgrade_connector_logs() -> None:
+    op.execute(
+        "UPDATE connector_logs "
+        "SET data = coalesce(data, '{}'::jsonb) || jsonb_build_object('legacy_event_type', event_type) "
+        f"WHERE lower(event_type) <> ALL ({_label_array(LOG_EVENT_TYPES)})"
+    )
+    op.alter_column(
+        "connector_logs", "level",
+        type_=sa.SmallInteger(),
+        postgresql_using=_code_case(
+            "CASE upper(level) WHEN 'WARNING' THEN 'WARN' ELSE upper(level) END",
+            LOG_LEVELS, default=LOG_LEVELS.index("INFO") + 1,
+        ),
+    )
+    op.create_check_constraint(
+        "ck_connector_log_level", "connector_logs", f"level BETWEEN 1 AND {len(LOG_LEVELS)}"
+    )
+    op.alter_column(
+        "connector_logs", "event_type",
+        type_=sa.SmallInteger(),
+        postgresql_using=_code_case(
+            "lower(event_type)", LOG_EVENT_TYPES,
+            default=LOG_EVENT_TYPES.index("status_change") + 1,
+        ),
+    )
+    op.create_check_constraint(
+        "ck_connector_log_event_type", "connector_logs",
+        f"event_type BETWEEN 1 AND {len(LOG_EVENT_TYPES)}",
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint("ck_connector_log_event_type", "connector_logs", type_="check")
+    op.alter_column(
+        "connector_logs", "event_type",
+        type_=sa.String(50),
+        postgresql_using=f"coalesce(data->>'legacy_event_type', ({_label_array(LOG_EVENT_TYPES)})[event_type])",
+    )
+    op.execute("UPDATE connector_logs SET data = data - 'legacy_event_type' WHERE data ? 'legacy_event_type'")
+    op.drop_constraint("ck_connector_log_level", "connector_logs", type_="check")
+    op.alter_column(
+        "connector_logs", "level",
+        type_=sa.String(10),
+        postgresql_using=f"({_label_array(LOG_LEVELS)})[level]",
+    )
+
+    for table, column, check, old_type, values in reversed(ENUM_COLUMNS):
+        labels = [value.upper() for value in values]
+        op.drop_constraint(check, table, type_="check")
+        op.execute(f"CREATE TYPE {old_type} AS ENUM ({', '.join(repr(label) for label in labels)})")
+        op.alter_column(
+            table, column,
+            type_=postgresql.ENUM(name=old_type, create_type=False),
+            postgresql_using=f"({_label_array(labels)})[{column}]::{old_type}",
+        )
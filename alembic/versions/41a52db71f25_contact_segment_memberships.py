@@ -0,0 +1,77 @@
+"""Materialized contact_segment_memberships with estimated_size triggers
+
+Revision ID: 41a52db71f25
+Revises: ccfeb54dfcaf
+Create Date: 2026-10-16 11:00:00.000000
+
+The table starts empty and estimated_size is reset to match it; the
+refresh_contact_segments task fills both in on its next run.
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '41a52db71f25'
+down_revision: Union[str, None] = 'ccfeb54dfcaf'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SEGMENT_SIZE_FUNCTION = """
+    CREATE OR REPLACE FUNCTION contact_segment_size_trg() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            UPDATE contact_segments s SET estimated_size = s.estimated_size + d.n
+            FROM (SELECT segment_id, count(*) AS n FROM new_rows GROUP BY segment_id) d
+            WHERE s.id = d.segment_id;
+        ELSE
+            UPDATE contact_segments s SET estimated_size = s.estimated_size - d.n
+            FROM (SELECT segment_id, count(*) AS n FROM old_rows GROUP BY segment_id) d
+            WHERE s.id = d.segment_id;
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+"""
+
+
+def _has_table(table: str) -> bool:
+    return not context.is_offline_mode() and sa.inspect(op.get_bind()).has_table(table)
+
+
+def upgrade() -> None:
+    if _has_table("contact_segment_memberships"):
+        return
+    op.create_table(
+        "contact_segment_memberships",
+        sa.Column("segment_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("contact_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.ForeignKeyConstraint(["segment_id"], ["contact_segments.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["contact_id"], ["contacts.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("segment_id", "contact_id"),
+    )
+    op.create_index("idx_segment_membership_contact", "contact_segment_memberships", ["contact_id"])
+    op.execute(SEGMENT_SIZE_FUNCTION)
+    op.execute(
+        "CREATE TRIGGER contact_segment_size_insert "
+        "AFTER INSERT ON contact_segment_memberships "
+        "REFERENCING NEW TABLE AS new_rows "
+        "FOR EACH STATEMENT EXECUTE FUNCTION contact_segment_size_trg()"
+    )
+    op.execute(
+        "CREATE TRIGGER contact_segment_size_delete "
+        "AFTER DELETE ON contact_segment_memberships "
+        "REFERENCING OLD TABLE AS old_rows "
+        "FOR EACH STATEMENT EXECUTE FUNCTION contact_segment_size_trg()"
+    )
+    op.execute("UPDATE contact_segments SET estimated_size = 0")
+
+
+def downgrade() -> None:
+    op.drop_table("contact_segment_memberships")
+    op.execute("DROP FUNCTION IF EXISTS contact_segment_size_trg()")
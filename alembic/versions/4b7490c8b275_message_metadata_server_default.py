@@ -0,0 +1,26 @@
+"""Server-side '{}' default for messages.message_metadata
+
+Revision ID: 4b7490c8b275
+Revises: 11998552e148
+Create Date: 2026-10-16 11:55:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b7490c8b275'
+down_revision: Union[str, None] = '11998552e148'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.alter_column("messages", "message_metadata", server_default=sa.text("'{}'::jsonb"))
+
+
+def downgrade() -> None:
+    op.alter_column("messages", "message_metadata", server_default=None)
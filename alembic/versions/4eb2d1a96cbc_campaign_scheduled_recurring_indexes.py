@@ -0,0 +1,45 @@
+"""Split idx_campaign_active into scheduled and recurring partial indexes
+
+Revision ID: 4eb2d1a96cbc
+Revises: e006647d47a0
+Create Date: 2026-10-16 12:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4eb2d1a96cbc'
+down_revision: Union[str, None] = 'e006647d47a0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# CampaignStatus codes (see 3f6d2b9c1a47): scheduled = 2, running = 3
+STATUS_SCHEDULED = 2
+STATUS_RUNNING = 3
+
+
+def upgrade() -> None:
+    op.drop_index("idx_campaign_active", table_name="campaigns", if_exists=True)
+    op.create_index(
+        "idx_campaign_scheduled", "campaigns", ["scheduled_at"],
+        postgresql_where=sa.text(f"status = {STATUS_SCHEDULED}"), if_not_exists=True,
+    )
+    op.create_index(
+        "idx_campaign_recurring", "campaigns", ["next_run_at"],
+        postgresql_where=sa.text(f"is_recurring AND status = {STATUS_SCHEDULED}"),
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_campaign_recurring", table_name="campaigns")
+    op.drop_index("idx_campaign_scheduled", table_name="campaigns")
+    op.create_index(
+        "idx_campaign_active", "campaigns", ["next_run_at"],
+        postgresql_where=sa.text(f"status IN ({STATUS_SCHEDULED}, {STATUS_RUNNING})"),
+    )
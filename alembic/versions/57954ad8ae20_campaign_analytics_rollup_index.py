@@ -0,0 +1,29 @@
+"""Covering index for campaign analytics roll-ups
+
+Revision ID: 57954ad8ae20
+Revises: ea5d6c26f1aa
+Create Date: 2026-10-16 10:15:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '57954ad8ae20'
+down_revision: Union[str, None] = 'ea5d6c26f1aa'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'idx_ca_rollup', 'campaign_analytics', ['campaign_id', 'date'],
+        postgresql_include=['messages_sent', 'messages_delivered', 'messages_failed', 'cost'],
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_ca_rollup', table_name='campaign_analytics', if_exists=True)
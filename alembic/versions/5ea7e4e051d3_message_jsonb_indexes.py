@@ -0,0 +1,38 @@
+"""Containment indexes on message metadata and tags
+
+Revision ID: 5ea7e4e051d3
+Revises: 134c69e4141c
+Create Date: 2026-10-16 11:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5ea7e4e051d3'
+down_revision: Union[str, None] = '134c69e4141c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'idx_message_metadata_gin', 'messages', ['message_metadata'],
+        postgresql_using='gin', postgresql_ops={'message_metadata': 'jsonb_path_ops'}, if_not_exists=True,
+    )
+    op.create_index(
+        'idx_message_tags_gin', 'messages', ['tags'],
+        postgresql_using='gin', postgresql_ops={'tags': 'jsonb_path_ops'}, if_not_exists=True,
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_message_campaign_ref "
+        "ON messages ((message_metadata ->> 'campaign_ref'))"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_message_campaign_ref', table_name='messages', if_exists=True)
+    op.drop_index('idx_message_tags_gin', table_name='messages', if_exists=True)
+    op.drop_index('idx_message_metadata_gin', table_name='messages', if_exists=True)
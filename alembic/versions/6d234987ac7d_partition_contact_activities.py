@@ -0,0 +1,32 @@
+"""Range-partition contact_activities by month on occurred_at
+
+Revision ID: 6d234987ac7d
+Revises: 159fe8f87978
+Create Date: 2026-10-16 10:40:00.000000
+
+The table is rebuilt as a partitioned parent with primary key
+(id, occurred_at); existing rows are copied into one partition per month
+(see app.core.partitions.partition_existing_table). Needs a live
+connection, so it cannot be rendered with --sql.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from app.core.partitions import partition_existing_table, unpartition_table
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6d234987ac7d'
+down_revision: Union[str, None] = '159fe8f87978'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    partition_existing_table(op.get_bind(), "contact_activities", "occurred_at")
+
+
+def downgrade() -> None:
+    unpartition_table(op.get_bind(), "contact_activities")
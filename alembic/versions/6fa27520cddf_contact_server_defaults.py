@@ -0,0 +1,40 @@
+"""Server-side defaults for contact JSONB, tags and counters
+
+Revision ID: 6fa27520cddf
+Revises: d3425b085fcc
+Create Date: 2026-10-16 11:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6fa27520cddf'
+down_revision: Union[str, None] = 'd3425b085fcc'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# column -> server default
+CONTACT_DEFAULTS = {
+    "custom_fields": "'{}'::jsonb",
+    "contact_metadata": "'{}'::jsonb",
+    "tags": "'{}'",
+    "total_messages_sent": "0",
+    "total_messages_delivered": "0",
+    "total_messages_failed": "0",
+    "total_clicks": "0",
+}
+
+
+def upgrade() -> None:
+    for column, default in CONTACT_DEFAULTS.items():
+        op.alter_column("contacts", column, server_default=sa.text(default))
+
+
+def downgrade() -> None:
+    for column in CONTACT_DEFAULTS:
+        op.alter_column("contacts", column, server_default=None)
@@ -0,0 +1,139 @@
+"""Store message/user/contact/queue enums as SMALLINT codes
+
+Revision ID: 7c2e4a91d5b8
+Revises: 3f6d2b9c1a47
+Create Date: 2026-10-16 09:40:00.000000
+
+Same conversion as 3f6d2b9c1a47 for the remaining enum columns: native
+PostgreSQL ENUMs labelled with member names ('PENDING') become SMALLINT
+codes behind named CHECK constraints. message_queue.status and
+campaign_contacts.delivery_status were free-text VARCHARs; unknown queue
+states become 'failed' and unknown delivery states 'unknown'. The
+messages/message_queue priority columns shrink from INTEGER to SMALLINT.
+
+Columns that create_all already built in the new layout (fresh
+databases) are left alone.
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c2e4a91d5b8'
+down_revision: Union[str, None] = '3f6d2b9c1a47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+MESSAGE_STATUSES = ("pending", "queued", "sent", "delivered", "failed", "rejected", "expired", "unknown")
+QUEUE_STATUSES = ("pending", "processing", "paused", "cancelled", "sent", "failed")
+
+# (table, column, CHECK name, old native ENUM type, values in code order)
+ENUM_COLUMNS = [
+    ("users", "role", "ck_user_role", "userrole",
+     ("super_admin", "admin", "campaign_manager", "analyst", "client")),
+    ("users", "status", "ck_user_status", "userstatus",
+     ("active", "inactive", "suspended", "pending")),
+    ("messages", "message_type", "ck_message_type", "messagetype",
+     ("sms", "mms", "flash", "binary")),
+    ("messages", "direction", "ck_message_direction", "messagedirection",
+     ("outbound", "inbound")),
+    ("messages", "status", "ck_message_status", "messagestatus", MESSAGE_STATUSES),
+    ("contacts", "status", "ck_contact_status", "contactstatus",
+     ("active", "inactive", "opted_out", "bounced", "invalid", "blocked")),
+    ("contacts", "source", "ck_contact_source", "contactsource",
+     ("manual", "import", "api", "form", "integration")),
+]
+
+# (table, column, CHECK name, VARCHAR length, values in code order, code for unknown labels)
+TEXT_COLUMNS = [
+    ("message_queue", "status", "ck_queue_status", 20, QUEUE_STATUSES,
+     QUEUE_STATUSES.index("failed") + 1),
+    ("campaign_contacts", "delivery_status", "ck_campaign_contact_delivery_status", 20, MESSAGE_STATUSES,
+     MESSAGE_STATUSES.index("unknown") + 1),
+]
+
+PRIORITY_TABLES = ("messages", "message_queue")
+
+
+def _code_case(expr: str, values, default: Union[int, None] = None) -> str:
+    """CASE mapping each label in ``values`` to its 1-based code"""
+    whens = " ".join(f"WHEN '{value}' THEN {code}" for code, value in enumerate(values, start=1))
+    other = f" ELSE {default}" if default is not None else ""
+    return f"CASE {expr} {whens}{other} END"
+
+
+def _label_array(values) -> str:
+    return "ARRAY[" + ", ".join(f"'{value}'" for value in values) + "]"
+
+
+def _has_table(table: str) -> bool:
+    return context.is_offline_mode() or sa.inspect(op.get_bind()).has_table(table)
+
+
+def _column_types(table: str) -> dict:
+    if not _has_table(table) or context.is_offline_mode():
+        return {}
+    return {column["name"]: column["type"] for column in sa.inspect(op.get_bind()).get_columns(table)}
+
+
+def _is_legacy(table: str, column: str, legacy_types) -> bool:
+    """Whether ``column`` still has its pre-migration type (always, when offline)"""
+    if context.is_offline_mode():
+        return True
+    column_type = _column_types(table).get(column)
+    return isinstance(column_type, legacy_types) and not isinstance(column_type, sa.SmallInteger)
+
+
+def upgrade() -> None:
+    for table, column, check, old_type, values in ENUM_COLUMNS:
+        if not _is_legacy(table, column, sa.Enum):
+            continue
+        op.alter_column(
+            table, column,
+            type_=sa.SmallInteger(),
+            postgresql_using=_code_case(f"lower({column}::text)", values),
+        )
+        op.create_check_constraint(check, table, f"{column} BETWEEN 1 AND {len(values)}")
+        op.execute(f"DROP TYPE IF EXISTS {old_type}")
+
+    for table, column, check, length, values, unknown in TEXT_COLUMNS:
+        if not _is_legacy(table, column, sa.String):
+            continue
+        op.alter_column(
+            table, column,
+            type_=sa.SmallInteger(),
+            postgresql_using=_code_case(f"lower({column})", values, default=unknown),
+        )
+        op.create_check_constraint(check, table, f"{column} BETWEEN 1 AND {len(values)}")
+
+    for table in PRIORITY_TABLES:
+        if _is_legacy(table, "priority", sa.Integer):
+            op.alter_column(table, "priority", type_=sa.SmallInteger())
+
+
+def downgrade() -> None:
+    for table in reversed(PRIORITY_TABLES):
+        op.alter_column(table, "priority", type_=sa.Integer())
+
+    for table, column, check, length, values, unknown in reversed(TEXT_COLUMNS):
+        op.drop_constraint(check, table, type_="check")
+        op.alter_column(
+            table, column,
+            type_=sa.String(length),
+            postgresql_using=f"({_label_array(values)})[{column}]",
+        )
+
+    for table, column, check, old_type, values in reversed(ENUM_COLUMNS):
+        labels = [value.upper() for value in values]
+        op.drop_constraint(check, table, type_="check")
+        op.execute(f"CREATE TYPE {old_type} AS ENUM ({', '.join(repr(label) for label in labels)})")
+        op.alter_column(
+            table, column,
+            type_=postgresql.ENUM(name=old_type, create_type=False),
+            postgresql_using=f"({_label_array(labels)})[{column}]::{old_type}",
+        )
@@ -0,0 +1,47 @@
+"""jsonb_path_ops GIN indexes for contact JSONB columns
+
+Revision ID: 8c01b6616b80
+Revises: 57954ad8ae20
+Create Date: 2026-10-16 10:20:00.000000
+
+Contact queries only use @> containment on these columns, which
+jsonb_path_ops serves with a smaller index than the default jsonb_ops.
+The btree on contacts.tags is dropped; the existing GIN index covers
+array lookups.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c01b6616b80'
+down_revision: Union[str, None] = '57954ad8ae20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (index, table, column)
+PATH_OPS_INDEXES = [
+    ('idx_contact_custom_fields', 'contacts', 'custom_fields'),
+    ('idx_contact_import_settings', 'contact_imports', 'import_settings'),
+    ('idx_contact_segment_rules', 'contact_segments', 'rules'),
+]
+
+
+def upgrade() -> None:
+    op.drop_index('ix_contacts_tags', table_name='contacts', if_exists=True)
+    for name, table, column in PATH_OPS_INDEXES:
+        op.drop_index(name, table_name=table, if_exists=True)
+        op.create_index(
+            name, table, [column],
+            postgresql_using='gin', postgresql_ops={column: 'jsonb_path_ops'},
+        )
+
+
+def downgrade() -> None:
+    for name, table, column in reversed(PATH_OPS_INDEXES):
+        op.drop_index(name, table_name=table)
+    op.create_index('idx_contact_custom_fields', 'contacts', ['custom_fields'], postgresql_using='gin')
+    op.create_index('ix_contacts_tags', 'contacts', ['tags'])
@@ -0,0 +1,56 @@
+"""Widen contact message counters to BIGINT
+
+Revision ID: 985d248ccbc1
+Revises: 133005529eda
+Create Date: 2026-10-16 11:30:00.000000
+
+PostgreSQL can't change the type of a column a generated column reads,
+so delivery_rate (and its index) is dropped and re-added around the
+ALTER.
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '985d248ccbc1'
+down_revision: Union[str, None] = '133005529eda'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+COUNTERS = ("total_messages_sent", "total_messages_delivered", "total_messages_failed", "total_clicks")
+DELIVERY_RATE = (
+    "CASE WHEN total_messages_sent = 0 THEN 0 "
+    "ELSE total_messages_delivered::float / total_messages_sent * 100 END"
+)
+
+
+def _counters_are_bigint() -> bool:
+    if context.is_offline_mode():
+        return False
+    columns = {c["name"]: c["type"] for c in sa.inspect(op.get_bind()).get_columns("contacts")}
+    return isinstance(columns["total_messages_sent"], sa.BigInteger)
+
+
+def _retype_counters(type_) -> None:
+    op.drop_index("idx_contact_delivery_rate", table_name="contacts")
+    op.drop_column("contacts", "delivery_rate")
+    for column in COUNTERS:
+        op.alter_column("contacts", column, type_=type_)
+    op.add_column("contacts", sa.Column(
+        "delivery_rate", sa.Float(), sa.Computed(DELIVERY_RATE, persisted=True)
+    ))
+    op.create_index("idx_contact_delivery_rate", "contacts", ["delivery_rate"])
+
+
+def upgrade() -> None:
+    if not _counters_are_bigint():
+        _retype_counters(sa.BigInteger())
+
+
+def downgrade() -> None:
+    _retype_counters(sa.Integer())
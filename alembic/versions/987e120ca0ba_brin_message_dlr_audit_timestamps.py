@@ -0,0 +1,55 @@
+"""BRIN indexes on message, DLR and audit log timestamps
+
+Revision ID: 987e120ca0ba
+Revises: f077a9fef265
+Create Date: 2026-10-16 12:10:00.000000
+
+audit_logs gains created_at; existing rows get the migration time. The
+idx_message_created_status btree is replaced by the BRIN on created_at.
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '987e120ca0ba'
+down_revision: Union[str, None] = 'f077a9fef265'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (index, table, column)
+BRIN_INDEXES = [
+    ('brin_msg_created', 'messages', 'created_at'),
+    ('brin_dlr_received', 'delivery_reports', 'received_at'),
+    ('brin_audit_created', 'audit_logs', 'created_at'),
+]
+
+
+def _columns(table: str) -> set:
+    if context.is_offline_mode():
+        return set()
+    return {c["name"] for c in sa.inspect(op.get_bind()).get_columns(table)}
+
+
+def upgrade() -> None:
+    if "created_at" not in _columns("audit_logs"):
+        op.add_column("audit_logs", sa.Column(
+            "created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ))
+    for name, table, column in BRIN_INDEXES:
+        op.create_index(
+            name, table, [column],
+            postgresql_using='brin', postgresql_with={'pages_per_range': 32}, if_not_exists=True,
+        )
+    op.drop_index('idx_message_created_status', table_name='messages', if_exists=True)
+
+
+def downgrade() -> None:
+    op.create_index('idx_message_created_status', 'messages', ['created_at', 'status'])
+    for name, table, column in reversed(BRIN_INDEXES):
+        op.drop_index(name, table_name=table)
+    op.drop_column("audit_logs", "created_at")
@@ -0,0 +1,38 @@
+"""BRIN indexes on connector log and campaign analytics timestamps
+
+Revision ID: a4f965b50652
+Revises: c57e6e61428c
+Create Date: 2026-10-16 10:05:00.000000
+
+Both tables are append-only in time order, so a BRIN summary replaces the
+btree on connector_logs.timestamp at a fraction of its size.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4f965b50652'
+down_revision: Union[str, None] = 'c57e6e61428c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.drop_index('ix_connector_logs_timestamp', table_name='connector_logs', if_exists=True)
+    op.create_index(
+        'idx_connector_log_ts_brin', 'connector_logs', ['timestamp'],
+        postgresql_using='brin', postgresql_with={'pages_per_range': 128}, if_not_exists=True,
+    )
+    op.create_index(
+        'idx_campaign_analytics_date_brin', 'campaign_analytics', ['date'],
+        postgresql_using='brin', postgresql_with={'pages_per_range': 128}, if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_campaign_analytics_date_brin', table_name='campaign_analytics', if_exists=True)
+    op.drop_index('idx_connector_log_ts_brin', table_name='connector_logs', if_exists=True)
+    op.create_index('ix_connector_logs_timestamp', 'connector_logs', ['timestamp'])
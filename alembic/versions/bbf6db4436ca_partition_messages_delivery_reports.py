@@ -0,0 +1,54 @@
+"""Range-partition messages and delivery_reports by month
+
+Revision ID: bbf6db4436ca
+Revises: 987e120ca0ba
+Create Date: 2026-10-16 12:15:00.000000
+
+Both tables are rebuilt as partitioned parents (see
+app.core.partitions.partition_existing_table) with primary keys
+(id, created_at) and (id, received_at), and their rows copied into one
+partition per month. A partitioned table can't be referenced by id
+alone, so the foreign keys into messages are dropped first; the
+downgrade restores them, which fails if retention has since left
+orphaned rows behind. Needs a live connection, so it cannot be rendered
+with --sql.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from app.core.partitions import partition_existing_table, unpartition_table
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'bbf6db4436ca'
+down_revision: Union[str, None] = '987e120ca0ba'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (constraint, referencing table)
+MESSAGE_FKS = [
+    ("delivery_reports_message_id_fkey", "delivery_reports"),
+    ("click_events_message_id_fkey", "click_events"),
+    ("campaign_contacts_message_id_fkey", "campaign_contacts"),
+]
+
+
+def upgrade() -> None:
+    for name, table in MESSAGE_FKS:
+        op.execute(f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {name}")
+    connection = op.get_bind()
+    partition_existing_table(connection, "delivery_reports", "received_at")
+    partition_existing_table(connection, "messages", "created_at")
+    op.create_index("idx_dlr_message", "delivery_reports", ["message_id"], if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index("idx_dlr_message", table_name="delivery_reports")
+    connection = op.get_bind()
+    unpartition_table(connection, "messages")
+    unpartition_table(connection, "delivery_reports")
+    for name, table in reversed(MESSAGE_FKS):
+        op.create_foreign_key(name, table, "messages", ["message_id"], ["id"])
@@ -0,0 +1,44 @@
+"""Partial dispatch indexes on messages and message_queue
+
+Revision ID: c13d881f3aa7
+Revises: 5ea7e4e051d3
+Create Date: 2026-10-16 11:45:00.000000
+
+Predicates compare SMALLINT status codes (see 7c2e4a91d5b8). Run VACUUM
+ANALYZE on both tables afterwards so the planner has fresh statistics.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c13d881f3aa7'
+down_revision: Union[str, None] = '5ea7e4e051d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# MessageStatus: pending = 1, queued = 2; QueueStatus: pending = 1
+MESSAGE_DISPATCHABLE = "status IN (1, 2)"
+QUEUE_PENDING = "status = 1"
+
+
+def upgrade() -> None:
+    op.create_index(
+        'idx_message_dispatch', 'messages', [sa.text('priority DESC'), 'scheduled_at'],
+        postgresql_where=sa.text(MESSAGE_DISPATCHABLE), if_not_exists=True,
+    )
+    op.drop_index('idx_queue_status_priority', table_name='message_queue', if_exists=True)
+    op.create_index(
+        'idx_queue_pending', 'message_queue', [sa.text('priority DESC'), 'scheduled_at'],
+        postgresql_where=sa.text(QUEUE_PENDING), if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_queue_pending', table_name='message_queue', if_exists=True)
+    op.create_index('idx_queue_status_priority', 'message_queue', ['status', 'priority'])
+    op.drop_index('idx_message_dispatch', table_name='messages', if_exists=True)
@@ -0,0 +1,48 @@
+"""Partial indexes for live campaigns and active routes, filters and connectors
+
+Revision ID: c57e6e61428c
+Revises: 7c2e4a91d5b8
+Create Date: 2026-10-16 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c57e6e61428c'
+down_revision: Union[str, None] = '7c2e4a91d5b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# CampaignStatus codes (see 3f6d2b9c1a47): scheduled = 2, running = 3
+CAMPAIGN_LIVE = "status IN (2, 3)"
+
+
+def upgrade() -> None:
+    op.create_index(
+        'idx_campaign_active', 'campaigns', ['next_run_at'],
+        postgresql_where=sa.text(CAMPAIGN_LIVE), if_not_exists=True,
+    )
+    op.create_index(
+        'idx_route_order_active_partial', 'routes', ['order'],
+        postgresql_where=sa.text('is_active'), if_not_exists=True,
+    )
+    op.create_index(
+        'idx_filter_user_type_active', 'filters', ['user_id', 'type'],
+        postgresql_where=sa.text('is_active'), if_not_exists=True,
+    )
+    op.create_index(
+        'idx_connector_enabled_status', 'smpp_connectors', ['status'],
+        postgresql_where=sa.text('is_enabled'), if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_connector_enabled_status', table_name='smpp_connectors', if_exists=True)
+    op.drop_index('idx_filter_user_type_active', table_name='filters', if_exists=True)
+    op.drop_index('idx_route_order_active_partial', table_name='routes', if_exists=True)
+    op.drop_index('idx_campaign_active', table_name='campaigns', if_exists=True)
@@ -0,0 +1,42 @@
+"""Partial indexes for sendable and opted-out contacts
+
+Revision ID: ccfeb54dfcaf
+Revises: d807dd454df0
+Create Date: 2026-10-16 10:55:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ccfeb54dfcaf'
+down_revision: Union[str, None] = 'd807dd454df0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# ContactStatus codes (see 7c2e4a91d5b8): active = 1, opted_out = 3
+STATUS_ACTIVE = 1
+STATUS_OPTED_OUT = 3
+
+
+def upgrade() -> None:
+    op.create_index(
+        'idx_contact_sendable', 'contacts', ['user_id'],
+        postgresql_where=sa.text(f"status = {STATUS_ACTIVE} AND opted_in"),
+        postgresql_include=['phone_number', 'preferred_language', 'timezone'],
+        if_not_exists=True,
+    )
+    op.create_index(
+        'idx_contact_opted_out', 'contacts', ['opted_out_at'],
+        postgresql_where=sa.text(f"status = {STATUS_OPTED_OUT}"),
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_contact_opted_out', table_name='contacts', if_exists=True)
+    op.drop_index('idx_contact_sendable', table_name='contacts', if_exists=True)
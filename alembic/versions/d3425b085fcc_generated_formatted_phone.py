@@ -0,0 +1,97 @@
+"""Generate contacts.formatted_phone with normalize_e164() and dedupe on it
+
+Revision ID: d3425b085fcc
+Revises: 41a52db71f25
+Create Date: 2026-10-16 11:05:00.000000
+
+The stored formatted_phone values are replaced by the generated ones.
+Contacts whose numbers normalize to the same E.164 number for one user
+must be merged by hand first; the upgrade refuses to build the unique
+index otherwise. The downgrade keeps the generated values as plain data.
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3425b085fcc'
+down_revision: Union[str, None] = '41a52db71f25'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+NORMALIZE_E164_FUNCTION = """
+    CREATE OR REPLACE FUNCTION normalize_e164(raw text, cc text) RETURNS text
+    LANGUAGE plpgsql IMMUTABLE AS $$
+    DECLARE
+        digits text;
+        dial_code text;
+    BEGIN
+        IF raw IS NULL THEN
+            RETURN NULL;
+        END IF;
+        digits := regexp_replace(raw, '[^0-9]', '', 'g');
+        IF digits = '' THEN
+            RETURN NULL;
+        END IF;
+        -- Already international: +<digits> or 00<digits>
+        IF left(btrim(raw), 1) = '+' THEN
+            RETURN '+' || digits;
+        END IF;
+        IF left(digits, 2) = '00' THEN
+            RETURN '+' || substr(digits, 3);
+        END IF;
+        -- National number: drop trunk zeros and prepend the dial code
+        dial_code := regexp_replace(coalesce(cc, ''), '[^0-9]', '', 'g');
+        IF dial_code = '' THEN
+            RETURN '+' || digits;
+        END IF;
+        RETURN '+' || dial_code || ltrim(digits, '0');
+    END;
+    $$
+"""
+
+
+def _formatted_phone_is_generated() -> bool:
+    if context.is_offline_mode():
+        return False
+    columns = {c["name"]: c for c in sa.inspect(op.get_bind()).get_columns("contacts")}
+    return "computed" in columns.get("formatted_phone", {})
+
+
+def upgrade() -> None:
+    op.execute(NORMALIZE_E164_FUNCTION)
+    if not context.is_offline_mode():
+        duplicates = op.get_bind().execute(sa.text(
+            "SELECT count(*) FROM ("
+            "  SELECT 1 FROM contacts "
+            "  GROUP BY user_id, normalize_e164(phone_number, country_code) HAVING count(*) > 1"
+            ") AS dup"
+        )).scalar()
+        if duplicates:
+            raise RuntimeError(
+                f"{duplicates} (user_id, E.164 number) pairs have duplicate contacts; "
+                "merge them before upgrading"
+            )
+
+    if not _formatted_phone_is_generated():
+        op.drop_column("contacts", "formatted_phone")
+        op.add_column("contacts", sa.Column(
+            "formatted_phone", sa.String(25),
+            sa.Computed("normalize_e164(phone_number, country_code)", persisted=True)
+        ))
+    op.drop_index("idx_contact_user_phone", table_name="contacts", if_exists=True)
+    op.create_index(
+        "idx_contact_user_phone_e164", "contacts", ["user_id", "formatted_phone"],
+        unique=True, if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_contact_user_phone_e164", table_name="contacts")
+    op.execute("ALTER TABLE contacts ALTER COLUMN formatted_phone DROP EXPRESSION")
+    op.execute("DROP FUNCTION normalize_e164(text, text)")
+    op.create_index("idx_contact_user_phone", "contacts", ["user_id", "phone_number"], unique=True)
@@ -0,0 +1,44 @@
+"""ON DELETE actions for foreign keys to contacts
+
+Revision ID: d807dd454df0
+Revises: fe37bf43ee19
+Create Date: 2026-10-16 10:50:00.000000
+
+Deleting a contact removes its list memberships and detaches its
+messages, instead of failing on the foreign keys.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd807dd454df0'
+down_revision: Union[str, None] = 'fe37bf43ee19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (constraint, table, ON DELETE action)
+CONTACT_FKS = [
+    ("contact_list_memberships_contact_id_fkey", "contact_list_memberships", "CASCADE"),
+    ("messages_contact_id_fkey", "messages", "SET NULL"),
+]
+
+
+def _replace_fks(with_action: bool) -> None:
+    for name, table, action in CONTACT_FKS:
+        op.drop_constraint(name, table, type_="foreignkey")
+        op.create_foreign_key(
+            name, table, "contacts", ["contact_id"], ["id"],
+            ondelete=action if with_action else None,
+        )
+
+
+def upgrade() -> None:
+    _replace_fks(with_action=True)
+
+
+def downgrade() -> None:
+    _replace_fks(with_action=False)
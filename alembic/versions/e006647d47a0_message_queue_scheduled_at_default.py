@@ -0,0 +1,26 @@
+"""Server default now() for message_queue.scheduled_at
+
+Revision ID: e006647d47a0
+Revises: 12cf096431bd
+Create Date: 2026-10-16 12:25:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e006647d47a0'
+down_revision: Union[str, None] = '12cf096431bd'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.alter_column("message_queue", "scheduled_at", server_default=sa.text("now()"))
+
+
+def downgrade() -> None:
+    op.alter_column("message_queue", "scheduled_at", server_default=None)
@@ -0,0 +1,63 @@
+"""Pack campaign_analytics.error_codes into parallel arrays
+
+Revision ID: ea5d6c26f1aa
+Revises: a4f965b50652
+Create Date: 2026-10-16 10:10:00.000000
+
+The JSONB error code -> count map becomes error_code_ids SMALLINT[] and
+error_code_counts INTEGER[], sorted by code. Keys that are not numeric
+SMPP error codes are dropped.
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ea5d6c26f1aa'
+down_revision: Union[str, None] = 'a4f965b50652'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _has_column(table: str, column: str) -> bool:
+    if context.is_offline_mode():
+        return True
+    return column in {c["name"] for c in sa.inspect(op.get_bind()).get_columns(table)}
+
+
+def upgrade() -> None:
+    if not _has_column("campaign_analytics", "error_codes"):
+        return
+    op.add_column("campaign_analytics", sa.Column("error_code_ids", postgresql.ARRAY(sa.SmallInteger())))
+    op.add_column("campaign_analytics", sa.Column("error_code_counts", postgresql.ARRAY(sa.Integer())))
+    op.execute(
+        "UPDATE campaign_analytics AS ca "
+        "SET error_code_ids = packed.ids, error_code_counts = packed.counts "
+        "FROM ("
+        "  SELECT id, array_agg(key::smallint ORDER BY key::int) AS ids, "
+        "         array_agg(value::int ORDER BY key::int) AS counts "
+        "  FROM campaign_analytics, jsonb_each_text(error_codes) "
+        "  WHERE jsonb_typeof(error_codes) = 'object' AND key ~ '^[0-9]{1,4}$' "
+        "  GROUP BY id"
+        ") AS packed "
+        "WHERE ca.id = packed.id"
+    )
+    op.drop_column("campaign_analytics", "error_codes")
+
+
+def downgrade() -> None:
+    op.add_column("campaign_analytics", sa.Column("error_codes", postgresql.JSONB()))
+    op.execute(
+        "UPDATE campaign_analytics "
+        "SET error_codes = ("
+        "  SELECT jsonb_object_agg(code::text, count) "
+        "  FROM unnest(error_code_ids, error_code_counts) AS pairs(code, count)"
+        ") "
+        "WHERE error_code_ids IS NOT NULL"
+    )
+    op.drop_column("campaign_analytics", "error_code_counts")
+    op.drop_column("campaign_analytics", "error_code_ids")
@@ -0,0 +1,55 @@
+"""Store user credit and message cost as BIGINT micro-units
+
+Revision ID: f077a9fef265
+Revises: 340a471de0da
+Create Date: 2026-10-16 12:05:00.000000
+
+users.credit_balance and messages.cost (NUMERIC with 4 decimals) become
+credit_balance_micros and cost_micros, counting 1/10,000 of a currency
+unit (app.core.money.MICROS_PER_UNIT), so the conversion is exact.
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f077a9fef265'
+down_revision: Union[str, None] = '340a471de0da'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+MICROS_PER_UNIT = 10_000
+
+# (table, old NUMERIC column, its type, new BIGINT column)
+MONEY_COLUMNS = [
+    ("users", "credit_balance", sa.Numeric(10, 4), "credit_balance_micros"),
+    ("messages", "cost", sa.Numeric(8, 4), "cost_micros"),
+]
+
+
+def _columns(table: str) -> set:
+    if context.is_offline_mode():
+        return {old for t, old, _, _ in MONEY_COLUMNS if t == table}
+    return {c["name"] for c in sa.inspect(op.get_bind()).get_columns(table)}
+
+
+def upgrade() -> None:
+    for table, old, old_type, new in MONEY_COLUMNS:
+        if old not in _columns(table):
+            continue
+        op.add_column(table, sa.Column(new, sa.BigInteger()))
+        op.execute(f"UPDATE {table} SET {new} = round({old} * {MICROS_PER_UNIT})::bigint")
+        op.alter_column(table, new, nullable=False)
+        op.drop_column(table, old)
+
+
+def downgrade() -> None:
+    for table, old, old_type, new in reversed(MONEY_COLUMNS):
+        op.add_column(table, sa.Column(old, old_type))
+        op.execute(f"UPDATE {table} SET {old} = {new}::numeric / {MICROS_PER_UNIT}")
+        op.alter_column(table, old, nullable=False)
+        op.drop_column(table, new)
@@ -0,0 +1,58 @@
+"""Generated contacts.display_name and contacts.delivery_rate
+
+Revision ID: fe37bf43ee19
+Revises: 6d234987ac7d
+Create Date: 2026-10-16 10:45:00.000000
+
+display_name is concat_ws(' ', first_name, last_name), falling back to
+the phone number when empty; concat_ws itself is only STABLE, so the
+expression spells it out.
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'fe37bf43ee19'
+down_revision: Union[str, None] = '6d234987ac7d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+DISPLAY_NAME = (
+    "COALESCE(NULLIF(CASE WHEN first_name IS NULL THEN last_name "
+    "WHEN last_name IS NULL THEN first_name "
+    "ELSE first_name || ' ' || last_name END, ''), phone_number)"
+)
+DELIVERY_RATE = (
+    "CASE WHEN total_messages_sent = 0 THEN 0 "
+    "ELSE total_messages_delivered::float / total_messages_sent * 100 END"
+)
+
+
+def _columns(table: str) -> set:
+    if context.is_offline_mode():
+        return set()
+    return {column["name"] for column in sa.inspect(op.get_bind()).get_columns(table)}
+
+
+def upgrade() -> None:
+    existing = _columns("contacts")
+    if "display_name" not in existing:
+        op.add_column("contacts", sa.Column(
+            "display_name", sa.String(200), sa.Computed(DISPLAY_NAME, persisted=True)
+        ))
+    if "delivery_rate" not in existing:
+        op.add_column("contacts", sa.Column(
+            "delivery_rate", sa.Float(), sa.Computed(DELIVERY_RATE, persisted=True)
+        ))
+    op.create_index("idx_contact_delivery_rate", "contacts", ["delivery_rate"], if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index("idx_contact_delivery_rate", table_name="contacts", if_exists=True)
+    op.drop_column("contacts", "delivery_rate")
+    op.drop_column("contacts", "display_name")
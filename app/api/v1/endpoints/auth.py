@@ -14,7 +14,7 @@ from app.core.security import (
     create_access_token,
     create_refresh_token,
     verify_refresh_token,
-    get_password_hash,
+    hash_password_async,
     verify_password
 )
 from app.models.user import User, UserSession
@@ -27,6 +27,7 @@ from app.schemas.auth import (
     PasswordReset,
     PasswordResetConfirm
 )
+from app.services.auth_cache import user_cache
 from app.services.user_service import UserService
 from app.services.email_service import EmailService
 from sqlalchemy import select
@@ -178,7 +179,7 @@ async def register(
         email=user_data.email,
         username=user_data.username,
         full_name=user_data.full_name,
-        hashed_password=get_password_hash(user_data.password),
+        hashed_password=await hash_password_async(user_data.password),
         phone=user_data.phone,
         company=user_data.company,
         role=user_data.role,
@@ -188,7 +189,6 @@ async def register(
     
     db.add(user)
     await db.commit()
-    await db.refresh(user)
     
     # Send verification email (if email service is configured)
     try:
@@ -289,7 +289,7 @@ async def confirm_password_reset(
         )
     
     # Update password
-    user.hashed_password = get_password_hash(reset_data.new_password)
+    user.hashed_password = await hash_password_async(reset_data.new_password)
     user.password_changed_at = datetime.utcnow()
     
     # Invalidate all sessions
@@ -349,6 +349,8 @@ async def get_current_user_info(
     current_user: User = Depends(get_current_user)
 ):
     """Get current user information"""
+    # Not part of the cached auth snapshot
+    await user_cache.load(current_user, "last_login", "credit_balance_micros")
     return UserResponse(
         id=str(current_user.id),
         email=current_user.email,
@@ -26,17 +26,18 @@ from app.schemas.connector import (
     FilterUpdate,
     FilterResponse,
     ConnectorLogResponse,
+    CONNECTOR_LIST_ADAPTER,
+    CONNECTOR_LOG_LIST_ADAPTER,
     ConnectorStatsResponse
 )
 from app.services.jasmin_service import JasminService
 from app.services.connector_service import ConnectorService
-from app.websocket.manager import ConnectionManager
+from app.websocket.manager import channel_manager, connection_manager
 
 router = APIRouter()
 
 # Initialize services
 jasmin_service = JasminService()
-connection_manager = ConnectionManager()
 
 @router.get("/", response_model=ConnectorListResponse)
 async def list_connectors(
@@ -76,20 +77,15 @@ async def list_connectors(
     # Get real-time status from Jasmin
     connector_status = await jasmin_service.get_connector_status()
     
-    connector_responses = []
     for connector in connectors:
         # Update status from Jasmin if available
         jasmin_status = connector_status.get(connector.cid, {})
         if jasmin_status:
             connector.status = jasmin_status.get("status", connector.status)
-        
-        connector_responses.append(ConnectorResponse.from_orm(connector))
     
     return ConnectorListResponse(
-        connectors=connector_responses,
-        total=total,
-        skip=skip,
-        limit=limit
+        items=CONNECTOR_LIST_ADAPTER.validate_python(connectors, from_attributes=True),
+        total=total
     )
 
 @router.post("/", response_model=ConnectorResponse)
@@ -114,12 +110,11 @@ async def create_connector(
     # Create connector in database
     connector = SMPPConnector(
         user_id=current_user.id,
-        **connector_data.dict()
+        **connector_data.model_dump()
     )
     
     db.add(connector)
     await db.commit()
-    await db.refresh(connector)
     
     # Create connector in Jasmin
     try:
@@ -159,10 +154,10 @@ async def create_connector(
     # Send real-time update
     await connection_manager.broadcast_to_channel("connectors", {
         "type": "connector_created",
-        "connector": ConnectorResponse.from_orm(connector).dict()
+        "connector": ConnectorResponse.model_validate(connector).model_dump()
     })
     
-    return ConnectorResponse.from_orm(connector)
+    return ConnectorResponse.model_validate(connector)
 
 @router.get("/{connector_id}", response_model=ConnectorResponse)
 async def get_connector(
@@ -196,7 +191,7 @@ async def get_connector(
     except Exception:
         pass  # Use database status if Jasmin is unavailable
     
-    return ConnectorResponse.from_orm(connector)
+    return ConnectorResponse.model_validate(connector)
 
 @router.put("/{connector_id}", response_model=ConnectorResponse)
 async def update_connector(
@@ -222,12 +217,11 @@ async def update_connector(
         )
     
     # Update connector in database
-    update_data = connector_data.dict(exclude_unset=True)
+    update_data = connector_data.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(connector, field, value)
     
     await db.commit()
-    await db.refresh(connector)
     
     # Update connector in Jasmin (if needed)
     try:
@@ -245,10 +239,10 @@ async def update_connector(
     # Send real-time update
     await connection_manager.broadcast_to_channel("connectors", {
         "type": "connector_updated",
-        "connector": ConnectorResponse.from_orm(connector).dict()
+        "connector": ConnectorResponse.model_validate(connector).model_dump()
     })
     
-    return ConnectorResponse.from_orm(connector)
+    return ConnectorResponse.model_validate(connector)
 
 @router.delete("/{connector_id}")
 async def delete_connector(
@@ -331,7 +325,7 @@ async def start_connector(
         await db.commit()
         
         # Send real-time update
-        await connection_manager.send_connector_update(
+        await channel_manager.send_connector_update(
             connector.cid,
             "starting",
             {"message": "Connector is starting"}
@@ -381,7 +375,7 @@ async def stop_connector(
         await db.commit()
         
         # Send real-time update
-        await connection_manager.send_connector_update(
+        await channel_manager.send_connector_update(
             connector.cid,
             "stopping",
             {"message": "Connector is stopping"}
@@ -432,7 +426,7 @@ async def get_connector_logs(
     result = await db.execute(query)
     logs = result.scalars().all()
     
-    return [ConnectorLogResponse.from_orm(log) for log in logs]
+    return CONNECTOR_LOG_LIST_ADAPTER.validate_python(logs, from_attributes=True)
 
 @router.get("/{connector_id}/stats", response_model=ConnectorStatsResponse)
 async def get_connector_stats(
@@ -1,4 +1,10 @@
+import uuid
+from urllib.parse import parse_qsl
+
 from fastapi import APIRouter, Request
+from fastapi.responses import PlainTextResponse
+
+from app.services.message_service import parse_jasmin_dlr, status_update_buffer
 
 router = APIRouter()
 
@@ -7,3 +13,17 @@ async def handle_webhook(request: Request):
     payload = await request.json()
     print(f"Received webhook: {payload}")
     return {"status": "received"}
+
+@router.api_route("/jasmin/dlr", methods=["GET", "POST"], response_class=PlainTextResponse)
+async def handle_jasmin_dlr(request: Request, message_id: uuid.UUID):
+    """Jasmin delivery receipt callback (the dlr-url passed to send_sms)
+
+    The update is only buffered here; status_update_buffer writes DLRs in
+    batches. Jasmin keeps retrying until it gets ``ACK/Jasmin`` back.
+    """
+    params = dict(request.query_params)
+    params.pop("message_id", None)
+    if request.method == "POST":
+        params.update(parse_qsl((await request.body()).decode()))
+    status_update_buffer.submit(*parse_jasmin_dlr(message_id, params))
+    return "ACK/Jasmin"
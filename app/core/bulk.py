@@ -0,0 +1,90 @@
+"""
+Bulk loading helpers built on PostgreSQL COPY
+"""
+
+from typing import Any, Callable, Dict, Iterable, Optional, Sequence
+
+from sqlalchemy import Table
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def scalar_defaults(table: Table, exclude: Iterable[str] = ()) -> Dict[str, Any]:
+    """Python-side scalar column defaults, which COPY would otherwise skip"""
+    exclude = set(exclude)
+    return {
+        column.name: column.default.arg
+        for column in table.columns
+        if column.name not in exclude
+        and column.default is not None
+        and column.default.is_scalar
+    }
+
+
+def default_factories(table: Table, exclude: Iterable[str] = ()) -> Dict[str, Callable[[], Any]]:
+    """Zero-argument factories for every Python-side default (scalar or callable)"""
+    exclude = set(exclude)
+    factories = {}
+    for column in table.columns:
+        default = column.default
+        if column.name in exclude or default is None:
+            continue
+        if default.is_scalar:
+            factories[column.name] = lambda value=default.arg: value
+        elif default.is_callable:
+            # SQLAlchemy wraps zero-arg callables as fn(context)
+            factories[column.name] = lambda fn=default.arg: fn(None)
+    return factories
+
+
+async def copy_records(
+    session: AsyncSession,
+    table: Table,
+    columns: Sequence[str],
+    records: Iterable[Sequence[Any]],
+    target: Optional[str] = None,
+) -> int:
+    """COPY ``records`` (binary format) on the session's connection
+
+    Values are passed through the columns' bind processors first, so enums,
+    JSONB and the like are encoded exactly as the ORM would. ``target``
+    overrides the destination table name, e.g. for a staging copy of
+    ``table``.
+    """
+    connection = await session.connection()
+    dialect = connection.dialect
+    processors = [
+        table.c[name].type.dialect_impl(dialect).bind_processor(dialect)
+        for name in columns
+    ]
+    if any(processors):
+        records = (
+            tuple(p(value) if p else value for p, value in zip(processors, record))
+            for record in records
+        )
+
+    raw = await connection.get_raw_connection()
+    status = await raw.driver_connection.copy_records_to_table(
+        target or table.name,
+        records=records,
+        columns=list(columns),
+        schema_name=None if target else table.schema,
+    )
+    # asyncpg returns the command tag, e.g. "COPY 1000"
+    return int(status.split()[-1])
+
+
+async def copy_rows(session: AsyncSession, table: Table, rows: Sequence[Dict[str, Any]]) -> int:
+    """COPY column dicts into ``table``, filling in Python-side defaults
+
+    Every row must carry the same keys; columns they omit get their Python
+    default (e.g. generated ids) or, failing that, the server default.
+    """
+    if not rows:
+        return 0
+    columns = list(rows[0])
+    factories = default_factories(table, exclude=columns)
+    records = (
+        (*(row[name] for name in columns), *(factory() for factory in factories.values()))
+        for row in rows
+    )
+    return await copy_records(session, table, [*columns, *factories], records)
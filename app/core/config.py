@@ -39,6 +39,13 @@ class Settings(BaseSettings):
     # Database
     DATABASE_URL: str = Field(..., env="DATABASE_URL")
     DATABASE_ECHO: bool = Field(default=False, env="DATABASE_ECHO")
+    DATABASE_POOL_SIZE: int = Field(default=20, env="DATABASE_POOL_SIZE")
+    DATABASE_MAX_OVERFLOW: int = Field(default=10, env="DATABASE_MAX_OVERFLOW")
+    DATABASE_POOL_TIMEOUT: int = Field(default=30, env="DATABASE_POOL_TIMEOUT")  # seconds
+    # Per-connection prepared statement caches (asyncpg's and SQLAlchemy's)
+    DATABASE_STATEMENT_CACHE_SIZE: int = Field(default=1024, env="DATABASE_STATEMENT_CACHE_SIZE")
+    # Set when connecting through PgBouncer in transaction pooling mode (< 1.21)
+    DATABASE_PGBOUNCER: bool = Field(default=False, env="DATABASE_PGBOUNCER")
 
     # Redis
     REDIS_URL: str = Field(default="redis://localhost:6379/0", env="REDIS_URL")
@@ -50,6 +57,7 @@ class Settings(BaseSettings):
     JASMIN_USERNAME: str = Field(..., env="JASMIN_USERNAME")
     JASMIN_PASSWORD: str = Field(..., env="JASMIN_PASSWORD")
     JASMIN_TIMEOUT: int = Field(default=30, env="JASMIN_TIMEOUT")
+    JASMIN_JCLI_POOL_SIZE: int = Field(default=4, env="JASMIN_JCLI_POOL_SIZE")
 
     # SMS Configuration
     DEFAULT_SENDER_ID: str = Field(default="SMS", env="DEFAULT_SENDER_ID")
@@ -78,10 +86,19 @@ class Settings(BaseSettings):
     LOG_MAX_SIZE: int = Field(default=10 * 1024 * 1024, env="LOG_MAX_SIZE")  # 10MB
     LOG_BACKUP_COUNT: int = Field(default=5, env="LOG_BACKUP_COUNT")
 
+    # Contacts
+    # Keep writing (and reading) the legacy contacts.tags ARRAY alongside the
+    # contact_tags link table until existing tags have been backfilled
+    CONTACT_TAGS_ARRAY_DUAL_WRITE: bool = Field(default=True, env="CONTACT_TAGS_ARRAY_DUAL_WRITE")
+
     # Analytics
     ANALYTICS_RETENTION_DAYS: int = Field(default=365, env="ANALYTICS_RETENTION_DAYS")
     METRICS_UPDATE_INTERVAL: int = Field(default=1, env="METRICS_UPDATE_INTERVAL")  # seconds
 
+    # Messages
+    # Monthly message/DLR partitions older than this are detached and dropped
+    MESSAGE_RETENTION_MONTHS: int = Field(default=12, env="MESSAGE_RETENTION_MONTHS")
+
     # Webhooks
     WEBHOOK_TIMEOUT: int = Field(default=30, env="WEBHOOK_TIMEOUT")
     WEBHOOK_RETRY_ATTEMPTS: int = Field(default=3, env="WEBHOOK_RETRY_ATTEMPTS")
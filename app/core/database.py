@@ -2,19 +2,51 @@
 Database configuration and session management (SQLAlchemy 1.4 compatible)
 """
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import sessionmaker, registry
 from sqlalchemy import Column, DateTime, func
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator, Dict
 import logging
+import uuid
 from datetime import datetime
 
 from .config import settings
 
 logger = logging.getLogger(__name__)
 
+
+def engine_options() -> Dict[str, Any]:
+    """Pool and driver options shared by every async engine
+
+    asyncpg keeps prepared statements per connection, so repeated queries
+    skip parsing and planning. Behind PgBouncer in transaction mode a
+    statement may land on a different server connection, so both caches are
+    disabled and statements get unique names instead.
+    """
+    if settings.DATABASE_PGBOUNCER:
+        connect_args = {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+        }
+    else:
+        connect_args = {
+            "statement_cache_size": settings.DATABASE_STATEMENT_CACHE_SIZE,
+            "prepared_statement_cache_size": settings.DATABASE_STATEMENT_CACHE_SIZE,
+        }
+    return {
+        "pool_size": settings.DATABASE_POOL_SIZE,
+        "max_overflow": settings.DATABASE_MAX_OVERFLOW,
+        "pool_timeout": settings.DATABASE_POOL_TIMEOUT,
+        "pool_pre_ping": True,
+        # insertmanyvalues batches executemany INSERT ... RETURNING into
+        # multi-row statements; pages match the contact import batch size.
+        "insertmanyvalues_page_size": 1000,
+        "connect_args": connect_args,
+    }
+
+
 # Create async engine
-engine = create_async_engine(settings.DATABASE_URL, pool_pre_ping=True)
+engine = create_async_engine(settings.DATABASE_URL, **engine_options())
 
 # Create async session factory using the older sessionmaker
 SessionLocal = sessionmaker(
@@ -25,8 +57,12 @@ SessionLocal = sessionmaker(
     autoflush=False,
 )
 
-# Define the Base using the declarative_base function
-Base = declarative_base()
+# Explicit registry so mapper configuration can be triggered deliberately
+# (once, at startup) instead of implicitly on the first query.
+# All models share this one registry: string relationship targets such as
+# relationship("User") only resolve within a single registry.
+mapper_registry = registry()
+Base = mapper_registry.generate_base()
 
 # NOTE: The common columns (created_at, updated_at) should be added as a mixin
 # or directly in each model file, as the Mapped/mapped_column syntax is not available.
@@ -48,12 +84,15 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         finally:
             await session.close()
 
+def configure_models():
+    """Import all models and resolve their relationships up front"""
+    from app.models import user, campaign, contact, message, billing, connector
+    mapper_registry.configure()
+
 async def init_db():
     """Initialize database tables"""
+    configure_models()
     async with engine.begin() as conn:
-        # Import all models to ensure they are registered
-        from app.models import user, campaign, contact, message, billing, connector
-
         # Create all tables
         await conn.run_sync(Base.metadata.create_all)
         logger.info("Database tables created successfully")
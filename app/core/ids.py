@@ -0,0 +1,34 @@
+"""
+Primary key generators
+"""
+
+import os
+import time
+import uuid
+from typing import List
+
+
+def uuid7() -> uuid.UUID:
+    """Time-ordered UUID (RFC 9562 version 7)
+
+    The leading 48 bits are the Unix timestamp in milliseconds, so new keys
+    land on the right-most btree leaf instead of a random page.
+    """
+    timestamp_ms = time.time_ns() // 1_000_000
+    rand = int.from_bytes(os.urandom(10), "big")
+
+    value = (timestamp_ms & 0xFFFF_FFFF_FFFF) << 80
+    value |= 0x7 << 76                              # version
+    value |= ((rand >> 62) & 0xFFF) << 64           # rand_a (12 bits)
+    value |= 0b10 << 62                             # RFC 4122 variant
+    value |= rand & 0x3FFF_FFFF_FFFF_FFFF           # rand_b (62 bits)
+    return uuid.UUID(int=value)
+
+
+def uuid4_batch(count: int) -> List[uuid.UUID]:
+    """``count`` random (version 4) UUIDs from a single os.urandom call"""
+    buf = bytearray(os.urandom(16 * count))
+    for offset in range(6, len(buf), 16):
+        buf[offset] = (buf[offset] & 0x0F) | 0x40          # version 4
+        buf[offset + 2] = (buf[offset + 2] & 0x3F) | 0x80  # RFC 4122 variant
+    return [uuid.UUID(bytes=bytes(buf[i:i + 16])) for i in range(0, len(buf), 16)]
@@ -0,0 +1,21 @@
+"""
+Fixed-point money helpers: amounts are stored as integer micro-units
+"""
+
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Union
+
+# 1 currency unit = 10,000 micro-units (the precision of the old Numeric(x, 4) columns)
+MICROS_PER_UNIT = 10_000
+
+_QUANTUM = Decimal(1) / MICROS_PER_UNIT
+
+
+def to_micros(amount: Union[Decimal, float, int, str]) -> int:
+    """Currency amount -> integer micro-units (half-up rounded)"""
+    return int((Decimal(str(amount)) * MICROS_PER_UNIT).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def from_micros(micros: int) -> Decimal:
+    """Integer micro-units -> currency amount"""
+    return (Decimal(micros) / MICROS_PER_UNIT).quantize(_QUANTUM)
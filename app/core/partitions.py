@@ -0,0 +1,233 @@
+"""
+Monthly range partitions for append-only time-series tables
+"""
+
+from datetime import date, datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy import Table, event, text
+from sqlalchemy.engine import Connection
+
+
+def month_bounds(day: date) -> Tuple[date, date]:
+    """First day of ``day``'s month and of the following month"""
+    start = day.replace(day=1)
+    if start.month == 12:
+        return start, start.replace(year=start.year + 1, month=1)
+    return start, start.replace(month=start.month + 1)
+
+
+def monthly_partition_ddl(table_name: str, month_start: date) -> str:
+    """CREATE TABLE statement for the partition holding ``month_start``'s month"""
+    start, end = month_bounds(month_start)
+    return (
+        f"CREATE TABLE IF NOT EXISTS {table_name}_{start:%Y_%m} "
+        f"PARTITION OF {table_name} "
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    )
+
+
+def _partition_key(connection: Connection, table_name: str) -> str:
+    """Partition key expression of ``table_name``, e.g. ``created_at``"""
+    keydef = connection.execute(
+        text("SELECT pg_get_partkeydef(CAST(:table AS regclass))"), {"table": table_name}
+    ).scalar_one()
+    # "RANGE (created_at)"
+    return keydef[keydef.index("(") + 1:keydef.rindex(")")]
+
+
+def _exists(connection: Connection, name: str) -> bool:
+    return connection.execute(text("SELECT to_regclass(:name)"), {"name": name}).scalar() is not None
+
+
+def create_monthly_partition(connection: Connection, table_name: str, month_start: date) -> None:
+    """Create ``month_start``'s partition, taking over matching rows from DEFAULT
+
+    ``CREATE TABLE ... PARTITION OF`` fails while the DEFAULT partition holds
+    rows of the new range. In that case the partition is built standalone,
+    those rows are moved into it and it is then attached.
+    """
+    start, end = month_bounds(month_start)
+    name = f"{table_name}_{start:%Y_%m}"
+    default = f"{table_name}_default"
+    if _exists(connection, name):
+        return
+
+    in_range = None
+    if _exists(connection, default):
+        key = _partition_key(connection, table_name)
+        in_range = f"{key} >= '{start.isoformat()}' AND {key} < '{end.isoformat()}'"
+        if not connection.execute(text(f"SELECT EXISTS (SELECT 1 FROM {default} WHERE {in_range})")).scalar():
+            in_range = None
+    if in_range is None:
+        connection.execute(text(monthly_partition_ddl(table_name, start)))
+        return
+
+    # Generated columns are recomputed on insert and can't be copied
+    columns = ", ".join(connection.execute(text(
+        "SELECT quote_ident(attname) FROM pg_attribute "
+        "WHERE attrelid = CAST(:table AS regclass) AND attnum > 0 "
+        "AND NOT attisdropped AND attgenerated = '' ORDER BY attnum"
+    ), {"table": table_name}).scalars())
+    connection.execute(text(
+        f"CREATE TABLE {name} (LIKE {table_name} INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING GENERATED)"
+    ))
+    connection.execute(text(
+        f"WITH moved AS (DELETE FROM {default} WHERE {in_range} RETURNING {columns}) "
+        f"INSERT INTO {name} ({columns}) SELECT {columns} FROM moved"
+    ))
+    connection.execute(text(
+        f"ALTER TABLE {table_name} ATTACH PARTITION {name} "
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    ))
+
+
+def ensure_monthly_partitions(
+    connection: Connection,
+    table_name: str,
+    months_ahead: int = 2,
+    today: Optional[date] = None
+) -> None:
+    """Create partitions for the current month and ``months_ahead`` following months"""
+    for month in _upcoming_months(months_ahead, today):
+        create_monthly_partition(connection, table_name, month)
+
+
+def _upcoming_months(months_ahead: int, today: Optional[date] = None) -> List[date]:
+    """First day of the current month and of the ``months_ahead`` following ones"""
+    months = [(today or datetime.utcnow().date()).replace(day=1)]
+    for _ in range(months_ahead):
+        months.append(month_bounds(months[-1])[1])
+    return months
+
+
+def expired_monthly_partitions(connection: Connection, table_name: str, before: date) -> List[str]:
+    """Monthly partitions of ``table_name`` that end on or before ``before``
+
+    Only partitions named ``<table>_YYYY_MM`` are considered; the DEFAULT
+    partition never expires.
+    """
+    children = connection.execute(text(
+        "SELECT c.relname FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = CAST(:parent AS regclass)"
+    ), {"parent": table_name}).scalars().all()
+
+    expired = []
+    prefix = f"{table_name}_"
+    for name in children:
+        try:
+            month_start = datetime.strptime(name[len(prefix):], "%Y_%m").date()
+        except ValueError:
+            continue
+        if month_bounds(month_start)[1] <= before:
+            expired.append(name)
+    return sorted(expired)
+
+
+def drop_monthly_partitions_before(connection: Connection, table_name: str, before: date) -> List[str]:
+    """Detach and drop monthly partitions that end on or before ``before``"""
+    dropped = expired_monthly_partitions(connection, table_name, before)
+    for name in dropped:
+        connection.execute(text(f"ALTER TABLE {table_name} DETACH PARTITION {name}"))
+        connection.execute(text(f"DROP TABLE {name}"))
+    return dropped
+
+
+def _rebuild_table(
+    connection: Connection,
+    table_name: str,
+    primary_key: List[str],
+    partition_key: Optional[str] = None
+) -> None:
+    """Recreate ``table_name`` with a new primary key, optionally range-partitioned
+
+    The old table is renamed aside and its rows copied over. Columns,
+    defaults, CHECKs, indexes and outgoing foreign keys are carried over;
+    foreign keys *referencing* the table must be dropped by the caller first.
+    """
+    old = f"{table_name}_old"
+    index_defs = connection.execute(text(
+        "SELECT c.relname, regexp_replace(pg_get_indexdef(i.indexrelid), ' ON ONLY ', ' ON ') "
+        "FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+        "WHERE i.indrelid = CAST(:table AS regclass) AND NOT i.indisprimary"
+    ), {"table": table_name}).all()
+    foreign_keys = connection.execute(text(
+        "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+        "WHERE conrelid = CAST(:table AS regclass) AND contype = 'f'"
+    ), {"table": table_name}).all()
+    pkey = connection.execute(text(
+        "SELECT conname FROM pg_constraint WHERE conrelid = CAST(:table AS regclass) AND contype = 'p'"
+    ), {"table": table_name}).scalar_one()
+    columns = ", ".join(connection.execute(text(
+        "SELECT quote_ident(attname) FROM pg_attribute "
+        "WHERE attrelid = CAST(:table AS regclass) AND attnum > 0 "
+        "AND NOT attisdropped AND attgenerated = '' ORDER BY attnum"
+    ), {"table": table_name}).scalars())
+
+    connection.execute(text(f"ALTER TABLE {table_name} RENAME TO {old}"))
+    connection.execute(text(f"ALTER TABLE {old} RENAME CONSTRAINT {pkey} TO {old}_pkey"))
+    for name, _ in index_defs:
+        connection.execute(text(f"DROP INDEX {name}"))
+
+    partition_by = f" PARTITION BY RANGE ({partition_key})" if partition_key else ""
+    connection.execute(text(
+        f"CREATE TABLE {table_name} (LIKE {old} INCLUDING DEFAULTS INCLUDING CONSTRAINTS "
+        f"INCLUDING GENERATED INCLUDING STORAGE){partition_by}"
+    ))
+    connection.execute(text(
+        f"ALTER TABLE {table_name} ADD CONSTRAINT {table_name}_pkey PRIMARY KEY ({', '.join(primary_key)})"
+    ))
+    if partition_key:
+        # One partition per month already holding rows, plus the usual ones ahead
+        months = {
+            datetime.strptime(month, "%Y-%m-%d").date()
+            for month in connection.execute(text(
+                f"SELECT DISTINCT to_char(date_trunc('month', {partition_key}), 'YYYY-MM-DD') FROM {old}"
+            )).scalars()
+        }
+        for month in sorted(months.union(_upcoming_months(2))):
+            connection.execute(text(monthly_partition_ddl(table_name, month)))
+        connection.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {table_name}_default PARTITION OF {table_name} DEFAULT"
+        ))
+
+    connection.execute(text(f"INSERT INTO {table_name} ({columns}) SELECT {columns} FROM {old}"))
+    for _, ddl in index_defs:
+        connection.execute(text(ddl))
+    for name, definition in foreign_keys:
+        connection.execute(text(f"ALTER TABLE {table_name} ADD CONSTRAINT {name} {definition}"))
+    connection.execute(text(f"DROP TABLE {old}"))
+
+
+def partition_existing_table(connection: Connection, table_name: str, partition_key: str) -> None:
+    """Turn a plain ``table_name`` into a monthly range-partitioned one
+
+    The primary key becomes ``(id, partition_key)``, since PostgreSQL needs
+    the partition key in every unique index. Existing rows land in one
+    partition per month. Does nothing if the table is already partitioned.
+    """
+    if connection.execute(text(
+        "SELECT relkind = 'p' FROM pg_class WHERE oid = CAST(:table AS regclass)"
+    ), {"table": table_name}).scalar():
+        return
+    _rebuild_table(connection, table_name, ["id", partition_key], partition_key)
+
+
+def unpartition_table(connection: Connection, table_name: str) -> None:
+    """Inverse of ``partition_existing_table``: a plain table keyed by ``id``"""
+    _rebuild_table(connection, table_name, ["id"])
+
+
+def register_monthly_partitions(table: Table, months_ahead: int = 2) -> None:
+    """Create the initial partitions (plus a DEFAULT catch-all) right after ``table``"""
+
+    @event.listens_for(table, "after_create")
+    def _create_partitions(target, connection, **kw):
+        # The table is brand new, so there is no DEFAULT partition to drain yet
+        for month in _upcoming_months(months_ahead):
+            connection.execute(text(monthly_partition_ddl(target.name, month)))
+        # Rows outside the pre-created range land here instead of failing
+        connection.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {target.name}_default PARTITION OF {target.name} DEFAULT"
+        ))
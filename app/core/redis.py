@@ -0,0 +1,19 @@
+"""
+Shared asyncio Redis client
+"""
+
+from typing import Optional
+
+import redis.asyncio as aioredis
+
+from app.core.config import settings
+
+_redis: Optional[aioredis.Redis] = None
+
+
+def get_redis() -> aioredis.Redis:
+    """Return the process-wide Redis client, created on first use"""
+    global _redis
+    if _redis is None:
+        _redis = aioredis.from_url(settings.REDIS_URL, decode_responses=True)
+    return _redis
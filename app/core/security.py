@@ -7,12 +7,16 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app.core.database import SessionLocal
 from app.models.user import User
+from app.services.auth_cache import user_cache
 
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
+from concurrent.futures import ThreadPoolExecutor
 from passlib.context import CryptContext
 from jose import JWTError, jwt
 from fastapi import HTTPException, status
+import asyncio
+import os
 import secrets
 import logging
 
@@ -20,8 +24,19 @@ from .config import settings
 
 logger = logging.getLogger(__name__)
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing: new hashes use argon2id; existing bcrypt hashes still
+# verify and are flagged for rehash
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    deprecated="auto",
+    argon2__type="ID",
+    argon2__time_cost=2,
+    argon2__memory_cost=19 * 1024,
+    argon2__parallelism=1,
+)
+# Hashing is CPU-bound by design; argon2-cffi and bcrypt release the GIL, so
+# a thread pool keeps the event loop free without process start-up costs
+_password_pool = ThreadPoolExecutor(max_workers=os.cpu_count() or 4, thread_name_prefix="pwd-hash")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -32,6 +47,22 @@ def get_password_hash(password: str) -> str:
     """Generate password hash"""
     return pwd_context.hash(password)
 
+async def hash_password_async(password: str) -> str:
+    """Hash a password off the event loop"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_password_pool, pwd_context.hash, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verify a password off the event loop
+
+    Returns ``(valid, new_hash)``; ``new_hash`` is set when the stored hash
+    uses a deprecated scheme (bcrypt) and should be replaced.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _password_pool, pwd_context.verify_and_update, plain_password, hashed_password
+    )
+
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     """Create JWT access token"""
     to_encode = data.copy()
@@ -126,8 +157,7 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession
     except JWTError:
         raise credentials_exception
 
-    result = await db.execute(select(User).where(User.username == username))
-    user = result.scalar_one_or_none()
+    user = await user_cache.get(db, username)
 
     if user is None:
         raise credentials_exception
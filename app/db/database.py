@@ -4,6 +4,7 @@ Database configuration and session management
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import declarative_base
 from app.core.config import settings
+from app.core.database import engine_options
 import logging
 
 logger = logging.getLogger(__name__)
@@ -13,8 +14,8 @@ engine = create_async_engine(
     settings.DATABASE_URL,
     echo=settings.DATABASE_ECHO,
     future=True,
-    pool_pre_ping=True,
     pool_recycle=300,
+    **engine_options()
 )
 
 # Create async session factory
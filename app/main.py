@@ -4,6 +4,7 @@ Enterprise SMS Management Platform with Jasmin Gateway Integration
 """
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
 import os
@@ -14,6 +15,8 @@ from app.core.config_simple import settings
 from app.api.v1.api import api_router
 from app.db.database import engine
 from app.db.base import Base
+from app.core.database import configure_models
+from app.services.message_service import status_update_buffer
 
 # Configure logging
 logging.basicConfig(
@@ -28,6 +31,9 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting Jasmin SMS Dashboard...")
     
+    # Configure ORM mappers before the first request pays for it
+    configure_models()
+    
     # Create database tables
     try:
         async with engine.begin() as conn:
@@ -36,10 +42,14 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"Error creating database tables: {e}")
     
+    # Batch DLR/status callbacks into periodic bulk UPDATEs
+    status_update_buffer.start()
+    
     yield
     
     # Shutdown
     logger.info("Shutting down Jasmin SMS Dashboard...")
+    await status_update_buffer.stop()
 
 # Create the FastAPI app instance
 app = FastAPI(
@@ -48,6 +58,7 @@ app = FastAPI(
     version=settings.VERSION,
     docs_url="/api/docs",
     redoc_url="/api/redoc",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -9,7 +9,8 @@ from .campaign import (
 )
 from .contact import (
     Contact, ContactList, ContactListMembership, ContactSegment, 
-    ContactImport, ContactActivity, ContactStatus, ContactSource
+    ContactImport, ContactImportError, ContactActivity, ContactTag, ContactSegmentMembership,
+    ContactStatus, ContactSource
 )
 from .billing import (
     BillingPlan, UserSubscription, BillingTransaction, CreditPackage,
@@ -17,13 +18,13 @@ from .billing import (
     TransactionType, TransactionStatus, PaymentMethod as PaymentMethodEnum
 )
 from .message import (
-    Message, DeliveryReport, ClickEvent, MessageQueue, 
+    Message, MessageDetails, DeliveryReport, ClickEvent, MessageQueue, 
     MessageTemplate as MessageTemplateModel, Webhook, WebhookDelivery,
-    MessageStatus, MessageType, MessageDirection
+    MessageStatus, MessageType, MessageDirection, QueueStatus
 )
 from .connector import (
     SMPPConnector, Route, Filter, ConnectorLog,
-    ConnectorStatus, RouteType, FilterType
+    ConnectorStatus, RouteType, FilterType, LogLevel, ConnectorEventType, MessageView
 )
 
 __all__ = [
@@ -36,7 +37,8 @@ __all__ = [
     
     # Contact models
     "Contact", "ContactList", "ContactListMembership", "ContactSegment", 
-    "ContactImport", "ContactActivity", "ContactStatus", "ContactSource",
+    "ContactImport", "ContactImportError", "ContactActivity", "ContactTag", "ContactSegmentMembership",
+    "ContactStatus", "ContactSource",
     
     # Billing models
     "BillingPlan", "UserSubscription", "BillingTransaction", "CreditPackage",
@@ -44,11 +46,11 @@ __all__ = [
     "TransactionType", "TransactionStatus", "PaymentMethodEnum",
     
     # Message models
-    "Message", "DeliveryReport", "ClickEvent", "MessageQueue", 
+    "Message", "MessageDetails", "DeliveryReport", "ClickEvent", "MessageQueue", 
     "MessageTemplateModel", "Webhook", "WebhookDelivery",
-    "MessageStatus", "MessageType", "MessageDirection",
+    "MessageStatus", "MessageType", "MessageDirection", "QueueStatus",
     
     # Connector models
     "SMPPConnector", "Route", "Filter", "ConnectorLog",
-    "ConnectorStatus", "RouteType", "FilterType",
+    "ConnectorStatus", "RouteType", "FilterType", "LogLevel", "ConnectorEventType", "MessageView",
 ]
@@ -2,15 +2,20 @@
 Campaign models for SMS marketing campaigns
 """
 
-from sqlalchemy import String, Boolean, Text, Enum, Numeric, DateTime, ForeignKey, Integer
+from sqlalchemy import String, Boolean, Text, Numeric, DateTime, ForeignKey, Integer, SmallInteger, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.dialects.postgresql import UUID, JSONB, ARRAY
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterable
 import uuid
 import enum
 from datetime import datetime
 
+from app.core.bulk import copy_records, scalar_defaults
 from app.core.database import Base
+from app.core.ids import uuid7
+from app.models.types import SmallEnum, enum_check, enum_code
+from app.models.message import MessageStatus
 
 class CampaignStatus(str, enum.Enum):
     """Campaign status enumeration"""
@@ -60,17 +65,20 @@ class Campaign(Base):
     
     # Campaign configuration
     campaign_type: Mapped[CampaignType] = mapped_column(
-        Enum(CampaignType),
+        SmallEnum(CampaignType),
+        enum_check("campaign_type", CampaignType, "ck_campaign_type"),
         default=CampaignType.IMMEDIATE,
         nullable=False
     )
     status: Mapped[CampaignStatus] = mapped_column(
-        Enum(CampaignStatus),
+        SmallEnum(CampaignStatus),
+        enum_check("status", CampaignStatus, "ck_campaign_status"),
         default=CampaignStatus.DRAFT,
         nullable=False
     )
     priority: Mapped[MessagePriority] = mapped_column(
-        Enum(MessagePriority),
+        SmallEnum(MessagePriority),
+        enum_check("priority", MessagePriority, "ck_campaign_priority"),
         default=MessagePriority.NORMAL,
         nullable=False
     )
@@ -157,6 +165,19 @@ class Campaign(Base):
         cascade="all, delete-orphan"
     )
     
+    # Indexes
+    __table_args__ = (
+        # Partial indexes matching the beat scheduler's lookups exactly
+        Index(
+            'idx_campaign_scheduled', 'scheduled_at',
+            postgresql_where=text(f"status = {enum_code(CampaignStatus.SCHEDULED)}")
+        ),
+        Index(
+            'idx_campaign_recurring', 'next_run_at',
+            postgresql_where=text(f"is_recurring AND status = {enum_code(CampaignStatus.SCHEDULED)}")
+        ),
+    )
+    
     def __repr__(self):
         return f"<Campaign(id={self.id}, name={self.name}, status={self.status})>"
     
@@ -200,7 +221,7 @@ class CampaignContact(Base):
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         primary_key=True,
-        default=uuid.uuid4
+        default=uuid7
     )
     
     campaign_id: Mapped[uuid.UUID] = mapped_column(
@@ -214,16 +235,18 @@ class CampaignContact(Base):
         nullable=False
     )
     
-    # Personalization data
+    # Personalization data (no longer written by campaign start: the rendered
+    # body lives in the MessageQueue entry and contact fields in the contact)
     personalized_message: Mapped[Optional[str]] = mapped_column(Text)
     personalization_data: Mapped[Optional[dict]] = mapped_column(JSONB)
     
     # Delivery tracking
-    message_id: Mapped[Optional[uuid.UUID]] = mapped_column(
-        UUID(as_uuid=True),
-        ForeignKey("messages.id")
+    # No FK: messages is partitioned, so it can't be referenced by id alone
+    message_id: Mapped[Optional[uuid.UUID]] = mapped_column(UUID(as_uuid=True))
+    delivery_status: Mapped[Optional[MessageStatus]] = mapped_column(
+        SmallEnum(MessageStatus),
+        enum_check("delivery_status", MessageStatus, "ck_campaign_contact_delivery_status")
     )
-    delivery_status: Mapped[Optional[str]] = mapped_column(String(20))
     delivered_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
     
     # Engagement tracking
@@ -235,10 +258,31 @@ class CampaignContact(Base):
     # Relationships
     campaign: Mapped["Campaign"] = relationship("Campaign", back_populates="campaign_contacts")
     contact: Mapped["Contact"] = relationship("Contact")
-    message: Mapped[Optional["Message"]] = relationship("Message")
+    message: Mapped[Optional["Message"]] = relationship(
+        "Message",
+        primaryjoin="foreign(CampaignContact.message_id) == Message.id"
+    )
     
     def __repr__(self):
         return f"<CampaignContact(campaign_id={self.campaign_id}, contact_id={self.contact_id})>"
+    
+    @classmethod
+    async def bulk_create(
+        cls,
+        session: AsyncSession,
+        campaign_id: uuid.UUID,
+        contact_ids: Iterable[uuid.UUID]
+    ) -> int:
+        """Insert campaign contacts with a single binary COPY, bypassing the ORM"""
+        key_columns = ("id", "campaign_id", "contact_id")
+        defaults = scalar_defaults(cls.__table__, exclude=key_columns)
+        extra = tuple(defaults.values())
+        
+        records = (
+            (uuid7(), campaign_id, contact_id, *extra)
+            for contact_id in contact_ids
+        )
+        return await copy_records(session, cls.__table__, key_columns + tuple(defaults), records)
 
 
 class CampaignSchedule(Base):
@@ -294,7 +338,7 @@ class CampaignAnalytics(Base):
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         primary_key=True,
-        default=uuid.uuid4
+        default=uuid7
     )
     
     campaign_id: Mapped[uuid.UUID] = mapped_column(
@@ -326,10 +370,36 @@ class CampaignAnalytics(Base):
     throughput: Mapped[float] = mapped_column(Numeric(8, 2), default=0.0, nullable=False)  # messages per minute
     
     # Error tracking
-    error_codes: Mapped[Optional[dict]] = mapped_column(JSONB)  # error_code -> count
+    # error_code -> count, packed as parallel arrays (much narrower than JSONB)
+    error_code_ids: Mapped[Optional[List[int]]] = mapped_column(ARRAY(SmallInteger))
+    error_code_counts: Mapped[Optional[List[int]]] = mapped_column(ARRAY(Integer))
     
     # Relationships
     campaign: Mapped["Campaign"] = relationship("Campaign")
     
+    # Indexes
+    __table_args__ = (
+        Index(
+            'idx_campaign_analytics_date_brin', 'date',
+            postgresql_using='brin', postgresql_with={'pages_per_range': 128}
+        ),
+        # Covering index so dashboard rollups are index-only scans
+        Index(
+            'idx_ca_rollup', 'campaign_id', 'date',
+            postgresql_include=['messages_sent', 'messages_delivered', 'messages_failed', 'cost']
+        ),
+    )
+    
     def __repr__(self):
         return f"<CampaignAnalytics(campaign_id={self.campaign_id}, date={self.date})>"
+    
+    @property
+    def error_codes(self) -> Dict[int, int]:
+        """Error code -> count mapping"""
+        return dict(zip(self.error_code_ids or (), self.error_code_counts or ()))
+    
+    @error_codes.setter
+    def error_codes(self, value: Optional[Dict[Any, int]]):
+        items = sorted((int(code), int(count)) for code, count in (value or {}).items())
+        self.error_code_ids = [code for code, _ in items]
+        self.error_code_counts = [count for _, count in items]
@@ -2,15 +2,21 @@
 Connector models for SMPP connectors and routing
 """
 
-from sqlalchemy import String, Boolean, Text, Enum, DateTime, ForeignKey, Integer, Index
+from sqlalchemy import String, Boolean, Text, DateTime, ForeignKey, Integer, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID, JSONB
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Union
+from dataclasses import dataclass
+from functools import lru_cache
+from operator import attrgetter
 import uuid
 import enum
+import re
 from datetime import datetime
 
 from app.core.database import Base
+from app.core.ids import uuid7
+from app.models.types import SmallEnum, enum_check
 
 class ConnectorStatus(str, enum.Enum):
     """SMPP Connector status"""
@@ -51,6 +57,53 @@ class FilterType(str, enum.Enum):
     USER = "user"
     GROUP = "group"
 
+class LogLevel(str, enum.Enum):
+    """Connector log level"""
+    DEBUG = "DEBUG"
+    INFO = "INFO"
+    WARN = "WARN"
+    ERROR = "ERROR"
+
+class ConnectorEventType(str, enum.Enum):
+    """Connector log event type"""
+    START = "start"
+    STOP = "stop"
+    BIND = "bind"
+    UNBIND = "unbind"
+    SUBMIT = "submit"
+    DELIVER = "deliver"
+    DLR = "dlr"
+    STATUS_CHANGE = "status_change"
+    CONFIG_CHANGE = "config_change"
+    ERROR = "error"
+
+@dataclass(slots=True, frozen=True)
+class MessageView:
+    """Message attributes inspected by filters, one slot per FilterType"""
+    destination: str = ""
+    source: str = ""
+    short_code: str = ""
+    content: str = ""
+    tag: str = ""
+    user: str = ""
+    group: str = ""
+
+_FILTER_ATTRS = {
+    FilterType.DESTINATION: attrgetter("destination"),
+    FilterType.SOURCE: attrgetter("source"),
+    FilterType.SHORT_CODE: attrgetter("short_code"),
+    FilterType.CONTENT: attrgetter("content"),
+    FilterType.TAG: attrgetter("tag"),
+    FilterType.USER: attrgetter("user"),
+    FilterType.GROUP: attrgetter("group"),
+}
+
+@lru_cache(maxsize=1024)
+def _compile_filter(value: str, is_regex: bool, case_sensitive: bool) -> "re.Pattern[str]":
+    """Compile a filter value once; plain values become escaped substring patterns"""
+    pattern = value if is_regex else re.escape(value)
+    return re.compile(pattern, 0 if case_sensitive else re.IGNORECASE)
+
 class SMPPConnector(Base):
     """SMPP Connector configuration"""
     __tablename__ = "smpp_connectors"
@@ -75,7 +128,8 @@ class SMPPConnector(Base):
     
     # Connector type and configuration
     connector_type: Mapped[ConnectorType] = mapped_column(
-        Enum(ConnectorType),
+        SmallEnum(ConnectorType),
+        enum_check("connector_type", ConnectorType, "ck_connector_type"),
         default=ConnectorType.SMPP_CLIENT,
         nullable=False
     )
@@ -90,7 +144,8 @@ class SMPPConnector(Base):
     
     # Bind settings
     bind_type: Mapped[BindType] = mapped_column(
-        Enum(BindType),
+        SmallEnum(BindType),
+        enum_check("bind_type", BindType, "ck_connector_bind_type"),
         default=BindType.TRANSCEIVER,
         nullable=False
     )
@@ -123,7 +178,8 @@ class SMPPConnector(Base):
     
     # Status and monitoring
     status: Mapped[ConnectorStatus] = mapped_column(
-        Enum(ConnectorStatus),
+        SmallEnum(ConnectorStatus),
+        enum_check("status", ConnectorStatus, "ck_connector_status"),
         default=ConnectorStatus.STOPPED,
         nullable=False,
         index=True
@@ -165,6 +221,11 @@ class SMPPConnector(Base):
         cascade="all, delete-orphan"
     )
     
+    # Indexes
+    __table_args__ = (
+        Index('idx_connector_enabled_status', 'status', postgresql_where=text('is_enabled')),
+    )
+    
     def __repr__(self):
         return f"<SMPPConnector(id={self.id}, cid={self.cid}, status={self.status})>"
     
@@ -194,7 +255,8 @@ class Route(Base):
     # Route identification
     order: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
     type: Mapped[RouteType] = mapped_column(
-        Enum(RouteType),
+        SmallEnum(RouteType),
+        enum_check("type", RouteType, "ck_route_type"),
         default=RouteType.DEFAULT,
         nullable=False
     )
@@ -253,6 +315,7 @@ class Route(Base):
     __table_args__ = (
         Index('idx_route_order_active', 'order', 'is_active'),
         Index('idx_route_user_order', 'user_id', 'order'),
+        Index('idx_route_order_active_partial', 'order', postgresql_where=text('is_active')),
     )
     
     def __repr__(self):
@@ -279,7 +342,8 @@ class Filter(Base):
     # Filter identification
     fid: Mapped[str] = mapped_column(String(50), unique=True, nullable=False, index=True)
     type: Mapped[FilterType] = mapped_column(
-        Enum(FilterType),
+        SmallEnum(FilterType),
+        enum_check("type", FilterType, "ck_filter_type"),
         nullable=False
     )
     
@@ -313,27 +377,23 @@ class Filter(Base):
     # Relationships
     user: Mapped["User"] = relationship("User")
     
+    # Indexes
+    __table_args__ = (
+        Index('idx_filter_user_type_active', 'user_id', 'type', postgresql_where=text('is_active')),
+    )
+    
     def __repr__(self):
         return f"<Filter(id={self.id}, fid={self.fid}, type={self.type})>"
     
-    def matches(self, message_data: Dict[str, Any]) -> bool:
+    def matches(self, message: Union["MessageView", Dict[str, Any]]) -> bool:
         """Check if filter matches message data"""
-        import re
-        
-        # Get the value to check from message data
-        check_value = message_data.get(self.parameter, "")
-        
-        if self.is_regex:
-            # Use regex matching
-            flags = 0 if self.is_case_sensitive else re.IGNORECASE
-            match = re.search(self.value, str(check_value), flags)
-            result = match is not None
+        if isinstance(message, MessageView):
+            check_value = _FILTER_ATTRS[self.type](message)
         else:
-            # Use string matching
-            if self.is_case_sensitive:
-                result = self.value in str(check_value)
-            else:
-                result = self.value.lower() in str(check_value).lower()
+            # Legacy dict protocol, keyed by the filter parameter
+            check_value = str(message.get(self.parameter, ""))
+        
+        result = _compile_filter(self.value, self.is_regex, self.is_case_sensitive).search(check_value) is not None
         
         # Apply negation if needed
         return not result if self.negate else result
@@ -345,7 +405,7 @@ class ConnectorLog(Base):
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         primary_key=True,
-        default=uuid.uuid4
+        default=uuid7
     )
     
     connector_id: Mapped[uuid.UUID] = mapped_column(
@@ -355,11 +415,21 @@ class ConnectorLog(Base):
     )
     
     # Log details
-    level: Mapped[str] = mapped_column(String(10), nullable=False, index=True)  # DEBUG, INFO, WARN, ERROR
+    level: Mapped[LogLevel] = mapped_column(
+        SmallEnum(LogLevel),
+        enum_check("level", LogLevel, "ck_connector_log_level"),
+        nullable=False,
+        index=True
+    )
     message: Mapped[str] = mapped_column(Text, nullable=False)
     
     # Event type
-    event_type: Mapped[str] = mapped_column(String(50), nullable=False, index=True)
+    event_type: Mapped[ConnectorEventType] = mapped_column(
+        SmallEnum(ConnectorEventType),
+        enum_check("event_type", ConnectorEventType, "ck_connector_log_event_type"),
+        nullable=False,
+        index=True
+    )
     
     # Additional data
     data: Mapped[Optional[dict]] = mapped_column(JSONB)
@@ -368,8 +438,7 @@ class ConnectorLog(Base):
     timestamp: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         default=datetime.utcnow,
-        nullable=False,
-        index=True
+        nullable=False
     )
     
     # Relationships
@@ -378,6 +447,10 @@ class ConnectorLog(Base):
     # Indexes
     __table_args__ = (
         Index('idx_connector_log_connector_time', 'connector_id', 'timestamp'),
+        Index(
+            'idx_connector_log_ts_brin', 'timestamp',
+            postgresql_using='brin', postgresql_with={'pages_per_range': 128}
+        ),
         Index('idx_connector_log_level_time', 'level', 'timestamp'),
         Index('idx_connector_log_event_time', 'event_type', 'timestamp'),
     )
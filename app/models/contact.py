@@ -2,15 +2,26 @@
 Contact models for contact management and segmentation
 """
 
-from sqlalchemy import String, Boolean, Text, Enum, DateTime, ForeignKey, Integer, Index
-from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy.dialects.postgresql import UUID, JSONB, ARRAY
-from typing import Optional, List, Dict, Any
+from sqlalchemy import DDL, event, bindparam, delete, literal, String, Boolean, Text, DateTime, ForeignKey, Integer, BigInteger, Float, Index, Computed, text, cast, select, update, func, any_, and_, or_, true, values, column
+from sqlalchemy.orm import Mapped, mapped_column, relationship, selectinload
+from sqlalchemy.ext.mutable import MutableList
+from sqlalchemy.dialects.postgresql import UUID, JSONB, ARRAY, insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import ColumnElement, Select
+from typing import Optional, List, Dict, Any, Set, Iterable, Sequence
 import uuid
 import enum
+import json
+import operator
+from functools import lru_cache
 from datetime import datetime
 
+from app.core.bulk import copy_records, default_factories
+from app.core.config import settings
+from app.core.partitions import register_monthly_partitions
 from app.core.database import Base
+from app.core.ids import uuid7
+from app.models.types import SmallEnum, enum_check, enum_code
 
 class ContactStatus(str, enum.Enum):
     """Contact status enumeration"""
@@ -29,14 +40,84 @@ class ContactSource(str, enum.Enum):
     FORM = "form"
     INTEGRATION = "integration"
 
+# Hot custom_fields paths that get a dedicated expression index.
+# Maps field name -> index kind:
+#   "int"  BTREE on ((custom_fields->>'field')::int), partial on the key existing,
+#          for range filters such as lead_score > 50 (values must be integers)
+#   "gin"  jsonb_path_ops GIN on the nested object (custom_fields->'field')
+# Deployments extend this with their own tenant fields; the indexes are
+# generated into Contact.__table_args__ (and so into create_all/autogenerate).
+CUSTOM_FIELD_INDEXES: Dict[str, str] = {
+    "lead_score": "int",
+    "preferences": "gin",
+}
+
+def _custom_field_indexes() -> tuple:
+    """Build expression indexes for CUSTOM_FIELD_INDEXES"""
+    indexes = []
+    for name, kind in CUSTOM_FIELD_INDEXES.items():
+        if kind == "int":
+            indexes.append(Index(
+                f'idx_contact_cf_{name}',
+                text(f"((custom_fields->>'{name}')::int)"),
+                postgresql_where=text(f"custom_fields ? '{name}'")
+            ))
+        elif kind == "gin":
+            indexes.append(Index(
+                f'idx_contact_cf_{name}_gin',
+                text(f"(custom_fields->'{name}') jsonb_path_ops"),
+                postgresql_using='gin'
+            ))
+        else:
+            raise ValueError(f"Unknown custom field index kind '{kind}' for '{name}'")
+    return tuple(indexes)
+
+# E.164 normalizer backing the generated contacts.formatted_phone column.
+# IMMUTABLE (pure regex work) so PostgreSQL accepts it in a generated column.
+NORMALIZE_E164_DDL = DDL("""
+    CREATE OR REPLACE FUNCTION normalize_e164(raw text, cc text) RETURNS text
+    LANGUAGE plpgsql IMMUTABLE AS $$
+    DECLARE
+        digits text;
+        dial_code text;
+    BEGIN
+        IF raw IS NULL THEN
+            RETURN NULL;
+        END IF;
+        digits := regexp_replace(raw, '[^0-9]', '', 'g');
+        IF digits = '' THEN
+            RETURN NULL;
+        END IF;
+        -- Already international: +<digits> or 00<digits>
+        IF left(btrim(raw), 1) = '+' THEN
+            RETURN '+' || digits;
+        END IF;
+        IF left(digits, 2) = '00' THEN
+            RETURN '+' || substr(digits, 3);
+        END IF;
+        -- National number: drop trunk zeros and prepend the dial code
+        dial_code := regexp_replace(coalesce(cc, ''), '[^0-9]', '', 'g');
+        IF dial_code = '' THEN
+            RETURN '+' || digits;
+        END IF;
+        RETURN '+' || dial_code || ltrim(digits, '0');
+    END;
+    $$
+""")
+
 class Contact(Base):
-    """Contact model for managing SMS recipients"""
+    """Contact model for managing SMS recipients
+    
+    ``contact_lists`` and ``messages`` are ``lazy="raise"``: listing code must
+    opt in to loading them (e.g. ``Contact.with_lists(query)`` or an explicit
+    ``selectinload``) instead of silently issuing one query per contact.
+    """
     __tablename__ = "contacts"
     
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         primary_key=True,
-        default=uuid.uuid4
+        default=uuid7
     )
     
     # Ownership
@@ -49,12 +130,14 @@ class Contact(Base):
     # Basic contact information
     phone_number: Mapped[str] = mapped_column(String(20), nullable=False, index=True)
     country_code: Mapped[Optional[str]] = mapped_column(String(5))
-    formatted_phone: Mapped[Optional[str]] = mapped_column(String(25))  # E.164 format
+    formatted_phone: Mapped[Optional[str]] = mapped_column(
+        String(25),
+        Computed("normalize_e164(phone_number, country_code)", persisted=True)
+    )  # E.164 format
     
     # Personal information
     first_name: Mapped[Optional[str]] = mapped_column(String(100))
     last_name: Mapped[Optional[str]] = mapped_column(String(100))
-    full_name: Mapped[Optional[str]] = mapped_column(String(200))
     email: Mapped[Optional[str]] = mapped_column(String(255), index=True)
     
     # Additional information
@@ -72,13 +155,15 @@ class Contact(Base):
     
     # Contact status and preferences
     status: Mapped[ContactStatus] = mapped_column(
-        Enum(ContactStatus),
+        SmallEnum(ContactStatus),
+        enum_check("status", ContactStatus, "ck_contact_status"),
         default=ContactStatus.ACTIVE,
         nullable=False,
         index=True
     )
     source: Mapped[ContactSource] = mapped_column(
-        Enum(ContactSource),
+        SmallEnum(ContactSource),
+        enum_check("source", ContactSource, "ck_contact_source"),
         default=ContactSource.MANUAL,
         nullable=False
     )
@@ -95,10 +180,13 @@ class Contact(Base):
     do_not_disturb_end: Mapped[Optional[str]] = mapped_column(String(5))    # HH:MM
     
     # Custom fields (flexible schema)
-    custom_fields: Mapped[Optional[dict]] = mapped_column(JSONB, default=dict)
+    custom_fields: Mapped[Optional[dict]] = mapped_column(JSONB, server_default=text("'{}'::jsonb"))
     
     # Tags and categorization
-    tags: Mapped[List[str]] = mapped_column(ARRAY(String), default=list, index=True)
+    tags: Mapped[List[str]] = mapped_column(
+        MutableList.as_mutable(ARRAY(String)),
+        server_default=text("'{}'")
+    )
     
     # Engagement tracking
     last_message_sent: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
@@ -106,10 +194,10 @@ class Contact(Base):
     last_clicked: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
     
     # Statistics
-    total_messages_sent: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
-    total_messages_delivered: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
-    total_messages_failed: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
-    total_clicks: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    total_messages_sent: Mapped[int] = mapped_column(BigInteger, server_default=text("0"), nullable=False)
+    total_messages_delivered: Mapped[int] = mapped_column(BigInteger, server_default=text("0"), nullable=False)
+    total_messages_failed: Mapped[int] = mapped_column(BigInteger, server_default=text("0"), nullable=False)
+    total_clicks: Mapped[int] = mapped_column(BigInteger, server_default=text("0"), nullable=False)
     
     # Validation and quality
     phone_validated: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
@@ -117,72 +205,367 @@ class Contact(Base):
     email_validated: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     email_validation_date: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
     
+    # Derived values computed by PostgreSQL on write (GENERATED ... STORED)
+    computed_display_name: Mapped[Optional[str]] = mapped_column(
+        "display_name",
+        String(200),
+        # concat_ws(' ', first_name, last_name) spelled out: concat_ws is only
+        # STABLE, which PostgreSQL rejects in a generation expression
+        Computed(
+            "COALESCE(NULLIF(CASE WHEN first_name IS NULL THEN last_name "
+            "WHEN last_name IS NULL THEN first_name "
+            "ELSE first_name || ' ' || last_name END, ''), phone_number)",
+            persisted=True
+        )
+    )
+    computed_delivery_rate: Mapped[Optional[float]] = mapped_column(
+        "delivery_rate",
+        Float,
+        Computed(
+            "CASE WHEN total_messages_sent = 0 THEN 0 "
+            "ELSE total_messages_delivered::float / total_messages_sent * 100 END",
+            persisted=True
+        )
+    )
+    
     # Import tracking
     import_batch_id: Mapped[Optional[uuid.UUID]] = mapped_column(UUID(as_uuid=True))
-    import_row_number: Mapped[Optional[int]] = mapped_column(Integer)
     
     # Metadata
     notes: Mapped[Optional[str]] = mapped_column(Text)
-    contact_metadata: Mapped[Optional[dict]] = mapped_column(JSONB, default=dict)
+    contact_metadata: Mapped[Optional[dict]] = mapped_column(JSONB, server_default=text("'{}'::jsonb"))
     
     # Relationships
     user: Mapped["User"] = relationship("User")
     contact_lists: Mapped[List["ContactListMembership"]] = relationship(
         "ContactListMembership",
         back_populates="contact",
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        lazy="raise",
+        passive_deletes=True
     )
     messages: Mapped[List["Message"]] = relationship(
         "Message",
-        back_populates="contact"
+        back_populates="contact",
+        lazy="raise",
+        passive_deletes=True
+    )
+    tag_links: Mapped[Set["ContactTag"]] = relationship(
+        "ContactTag",
+        back_populates="contact",
+        collection_class=set,
+        cascade="all, delete-orphan",
+        passive_deletes=True
     )
     
     # Indexes for performance
     __table_args__ = (
-        Index('idx_contact_user_phone', 'user_id', 'phone_number'),
+        Index('idx_contact_user_phone_e164', 'user_id', 'formatted_phone', unique=True),
         Index('idx_contact_status_user', 'status', 'user_id'),
-        Index('idx_contact_tags', 'tags', postgresql_using='gin'),
-        Index('idx_contact_custom_fields', 'custom_fields', postgresql_using='gin'),
+        Index('idx_contact_delivery_rate', 'delivery_rate'),
+        Index('idx_contact_import_batch', 'import_batch_id', postgresql_where=text("import_batch_id IS NOT NULL")),
+        # Stale-contact clean-up scans by last send time
+        Index('idx_contact_last_sent_brin', 'last_message_sent', postgresql_using='brin'),
+        # Send-time segmentation: index-only scan over sendable contacts
+        Index(
+            'idx_contact_sendable', 'user_id',
+            postgresql_where=text(f"status = {enum_code(ContactStatus.ACTIVE)} AND opted_in"),
+            postgresql_include=['phone_number', 'preferred_language', 'timezone']
+        ),
+        Index(
+            'idx_contact_opted_out', 'opted_out_at',
+            postgresql_where=text(f"status = {enum_code(ContactStatus.OPTED_OUT)}")
+        ),
+        Index('idx_contact_tags', 'tags', postgresql_using='gin', postgresql_ops={'tags': 'array_ops'}),
+        Index(
+            'idx_contact_custom_fields', 'custom_fields',
+            postgresql_using='gin', postgresql_ops={'custom_fields': 'jsonb_path_ops'}
+        ),
+        *_custom_field_indexes(),
     )
     
     def __repr__(self):
         return f"<Contact(id={self.id}, phone={self.phone_number}, status={self.status})>"
     
+    @property
+    def full_name(self) -> Optional[str]:
+        """First and last name joined (not stored)"""
+        if self.first_name and self.last_name:
+            return f"{self.first_name} {self.last_name}"
+        return self.first_name or self.last_name
+    
     @property
     def display_name(self) -> str:
         """Get display name for contact"""
-        if self.full_name:
-            return self.full_name
-        elif self.first_name and self.last_name:
-            return f"{self.first_name} {self.last_name}"
-        elif self.first_name:
-            return self.first_name
-        else:
-            return self.phone_number
+        if self.computed_display_name is not None:
+            return self.computed_display_name
+        # Not flushed yet: compute in Python
+        names = [name for name in (self.first_name, self.last_name) if name is not None]
+        return " ".join(names) or self.phone_number
     
     @property
     def delivery_rate(self) -> float:
         """Calculate delivery rate percentage"""
-        if self.total_messages_sent == 0:
+        if self.computed_delivery_rate is not None:
+            return self.computed_delivery_rate
+        if not self.total_messages_sent:
             return 0.0
-        return (self.total_messages_delivered / self.total_messages_sent) * 100
+        return ((self.total_messages_delivered or 0) / self.total_messages_sent) * 100
     
     @property
     def engagement_score(self) -> float:
         """Calculate engagement score based on clicks and deliveries"""
-        if self.total_messages_delivered == 0:
+        if not self.total_messages_delivered:
             return 0.0
-        return (self.total_clicks / self.total_messages_delivered) * 100
+        return ((self.total_clicks or 0) / self.total_messages_delivered) * 100
+    
+    @property
+    def tag_names(self) -> Set[str]:
+        """Tag names from the contact_tags link table"""
+        return {link.tag for link in self.tag_links}
     
     def add_tag(self, tag: str):
-        """Add tag to contact"""
-        if tag not in self.tags:
-            self.tags = self.tags + [tag]
+        """Add tag to contact (tag_links must be loaded)"""
+        if tag not in self.tag_names:
+            self.tag_links.add(ContactTag(tag=tag))
+        if settings.CONTACT_TAGS_ARRAY_DUAL_WRITE:
+            if self.tags is None:
+                self.tags = []
+            if tag not in self.tags:
+                self.tags.append(tag)
     
     def remove_tag(self, tag: str):
-        """Remove tag from contact"""
-        if tag in self.tags:
-            self.tags = [t for t in self.tags if t != tag]
+        """Remove tag from contact (tag_links must be loaded)"""
+        for link in [link for link in self.tag_links if link.tag == tag]:
+            self.tag_links.discard(link)
+        if settings.CONTACT_TAGS_ARRAY_DUAL_WRITE and self.tags:
+            try:
+                self.tags.remove(tag)
+            except ValueError:
+                pass
+    
+    @classmethod
+    async def add_tags_bulk(cls, session: AsyncSession, contact_ids: List[uuid.UUID], tag: str):
+        """Tag many contacts in one round trip per table
+        
+        The ids travel as a single array parameter (INSERT ... SELECT
+        unnest(:ids)), so any number of contacts stays clear of the 32767
+        bind-parameter limit.
+        """
+        if not contact_ids:
+            return
+        ids = bindparam("contact_ids", list(contact_ids), type_=ARRAY(UUID(as_uuid=True)))
+        await session.execute(
+            pg_insert(ContactTag)
+            .from_select(["contact_id", "tag"], select(func.unnest(ids), literal(tag, String)))
+            .on_conflict_do_nothing()
+        )
+        if settings.CONTACT_TAGS_ARRAY_DUAL_WRITE:
+            await session.execute(
+                update(cls)
+                .where(cls.id == any_(contact_ids))
+                .where(~cls.tags.contains([tag]))
+                .values(tags=func.array_append(cls.tags, tag))
+                .execution_options(synchronize_session=False)
+            )
+    
+    @classmethod
+    def has_tags(cls, tags: Iterable[str]):
+        """WHERE clause matching contacts carrying all of ``tags``"""
+        tags = list(dict.fromkeys(tags))
+        if settings.CONTACT_TAGS_ARRAY_DUAL_WRITE:
+            return cls.tags.contains(tags)
+        tagged = (
+            select(ContactTag.contact_id)
+            .where(ContactTag.tag.in_(tags))
+            .group_by(ContactTag.contact_id)
+            .having(func.count() == len(tags))
+        )
+        return cls.id.in_(tagged)
+    
+    _COUNTER_COLUMNS = {
+        "sent": "total_messages_sent",
+        "delivered": "total_messages_delivered",
+        "failed": "total_messages_failed",
+        "clicked": "total_clicks",
+    }
+    
+    @classmethod
+    async def increment_counters(
+        cls,
+        session: AsyncSession,
+        contact_id: uuid.UUID,
+        sent: int = 0,
+        delivered: int = 0,
+        failed: int = 0,
+        clicked: int = 0
+    ) -> None:
+        """Atomically bump message counters with a single UPDATE (no read-modify-write)"""
+        deltas = {"sent": sent, "delivered": delivered, "failed": failed, "clicked": clicked}
+        changes = {
+            cls._COUNTER_COLUMNS[name]: getattr(cls, cls._COUNTER_COLUMNS[name]) + delta
+            for name, delta in deltas.items()
+            if delta
+        }
+        if changes:
+            await session.execute(update(cls).where(cls.id == contact_id).values(**changes))
+    
+    @classmethod
+    async def increment_counters_bulk(
+        cls,
+        session: AsyncSession,
+        deltas: Dict[uuid.UUID, Dict[str, int]]
+    ) -> None:
+        """Apply per-contact counter deltas (keyed like ``increment_counters``) in one statement
+        
+        Emits ``UPDATE contacts ... FROM (VALUES ...) AS v`` so e.g. a batch of
+        delivery receipts costs one round trip instead of one per message.
+        """
+        if not deltas:
+            return
+        names = [name for name in cls._COUNTER_COLUMNS if any(d.get(name) for d in deltas.values())]
+        if not names:
+            return
+        
+        batch = values(
+            column("id", UUID(as_uuid=True)),
+            *(column(name, BigInteger) for name in names),
+            name="counter_deltas"
+        ).data([
+            (contact_id, *(delta.get(name, 0) for name in names))
+            for contact_id, delta in deltas.items()
+        ])
+        await session.execute(
+            update(cls)
+            .where(cls.id == batch.c.id)
+            .values(**{
+                cls._COUNTER_COLUMNS[name]: getattr(cls, cls._COUNTER_COLUMNS[name]) + batch.c[name]
+                for name in names
+            })
+        )
+        # Counter-based segment rules may now match differently
+        await ContactSegment.sync_contacts(session, list(deltas))
+    
+    @classmethod
+    async def bulk_import(
+        cls,
+        session: AsyncSession,
+        rows: Iterable[Dict[str, Any]],
+        contact_list_id: Optional[uuid.UUID] = None,
+        added_by: Optional[uuid.UUID] = None,
+        contact_import_id: Optional[uuid.UUID] = None,
+        batch_size: int = 1000
+    ) -> int:
+        """Stream contacts into the database in batches, skipping (user_id, formatted_phone) duplicates
+        
+        ``rows`` may be any iterable (e.g. a CSV reader); only one batch is
+        held in memory at a time. Each batch is an executemany of one cached
+        single-row statement, which SQLAlchemy's "insertmanyvalues" rewrites
+        into multi-row INSERT ... RETURNING pages (see
+        ``insertmanyvalues_page_size`` on the engine). List memberships and
+        "imported" activities are written for the inserted contacts in the
+        same batches. When ``contact_import_id`` is given, its counters and
+        rejected rows are recorded after every batch. Returns the number of contacts
+        inserted.
+        """
+        inserted = 0
+        insert_contacts = (
+            pg_insert(cls)
+            .on_conflict_do_nothing(index_elements=['user_id', 'formatted_phone'])
+            .returning(cls.id)
+        )
+        
+        async def write_batch(batch: List[Dict[str, Any]], errors: List[Dict[str, Any]]) -> int:
+            contact_ids = list(await session.scalars(insert_contacts, batch)) if batch else []
+            
+            if contact_ids and contact_list_id is not None:
+                await session.execute(
+                    pg_insert(ContactListMembership),
+                    [
+                        {"contact_id": contact_id, "contact_list_id": contact_list_id, "added_by": added_by}
+                        for contact_id in contact_ids
+                    ]
+                )
+            if contact_ids:
+                await session.execute(
+                    pg_insert(ContactActivity),
+                    [
+                        {"contact_id": contact_id, "activity_type": "imported", "source": "import"}
+                        for contact_id in contact_ids
+                    ]
+                )
+                await ContactSegment.sync_contacts(session, contact_ids)
+            if contact_import_id is not None:
+                await ContactImport.record_batch(
+                    session, contact_import_id,
+                    processed=len(batch) + len(errors),
+                    successful=len(contact_ids),
+                    duplicates=len(batch) - len(contact_ids),
+                    errors=errors
+                )
+            return len(contact_ids)
+        
+        batch: List[Dict[str, Any]] = []
+        errors: List[Dict[str, Any]] = []
+        # Statements are Core inserts, so the identity map stays empty; just
+        # keep caller-side pending objects from being flushed on every batch
+        with session.no_autoflush:
+            for row_number, row in enumerate(rows, start=1):
+                if row.get('phone_number'):
+                    batch.append(row)
+                else:
+                    errors.append({
+                        "row_number": row_number,
+                        "error_text": "missing phone_number",
+                        "raw_row": json.loads(json.dumps(row, default=str))
+                    })
+                
+                if len(batch) + len(errors) >= batch_size:
+                    inserted += await write_batch(batch, errors)
+                    batch, errors = [], []
+            
+            if batch or errors:
+                inserted += await write_batch(batch, errors)
+        
+        return inserted
+    
+    @classmethod
+    async def copy_import(
+        cls,
+        session: AsyncSession,
+        columns: Sequence[str],
+        rows: Iterable[Sequence[Any]]
+    ) -> List[uuid.UUID]:
+        """Load large imports via COPY into a temp staging table, then dedupe into contacts
+        
+        ``rows`` are tuples ordered like ``columns``; Python-side defaults
+        (id, counters, flags...) are filled in for the remaining columns.
+        Returns the ids of the contacts actually inserted.
+        """
+        table = cls.__table__
+        factories = default_factories(table, exclude=columns)
+        all_columns = list(columns) + list(factories)
+        records = (
+            (*row, *(factory() for factory in factories.values()))
+            for row in rows
+        )
+        
+        await session.execute(text(
+            "CREATE TEMP TABLE contacts_stage (LIKE contacts INCLUDING DEFAULTS) ON COMMIT DROP"
+        ))
+        await copy_records(session, table, all_columns, records, target="contacts_stage")
+        
+        column_list = ", ".join(f'"{name}"' for name in all_columns)
+        result = await session.execute(text(
+            f"INSERT INTO contacts ({column_list}) "
+            f"SELECT {column_list} FROM contacts_stage "
+            "ON CONFLICT (user_id, formatted_phone) DO NOTHING "
+            "RETURNING id"
+        ))
+        inserted = list(result.scalars())
+        await session.execute(text("DROP TABLE contacts_stage"))
+        await ContactSegment.sync_contacts(session, inserted)
+        return inserted
     
     def set_custom_field(self, field_name: str, value: Any):
         """Set custom field value"""
@@ -190,12 +573,48 @@ class Contact(Base):
             self.custom_fields = {}
         self.custom_fields[field_name] = value
     
+    @classmethod
+    def with_lists(cls, query):
+        """Batch-load list memberships (and their lists) for a contact query"""
+        return query.options(
+            selectinload(cls.contact_lists).joinedload(ContactListMembership.contact_list)
+        )
+    
+    @classmethod
+    def custom_field_int(cls, field_name: str):
+        """SQL expression matching the "int" custom field indexes"""
+        return cast(cls.custom_fields[field_name].astext, Integer)
+    
     def get_custom_field(self, field_name: str, default: Any = None) -> Any:
         """Get custom field value"""
         if self.custom_fields is None:
             return default
         return self.custom_fields.get(field_name, default)
 
+event.listen(Contact.__table__, "before_create", NORMALIZE_E164_DDL)
+
+class ContactTag(Base):
+    """Normalized contact tags, one row per (contact, tag)"""
+    __tablename__ = "contact_tags"
+    
+    contact_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("contacts.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    tag: Mapped[str] = mapped_column(String(64), primary_key=True)
+    
+    # Relationships
+    contact: Mapped["Contact"] = relationship("Contact", back_populates="tag_links")
+    
+    # Indexes
+    __table_args__ = (
+        Index('idx_contact_tags_tag_contact', 'tag', 'contact_id'),
+    )
+    
+    def __repr__(self):
+        return f"<ContactTag(contact_id={self.contact_id}, tag={self.tag})>"
+
 class ContactList(Base):
     """Contact lists for organizing contacts"""
     __tablename__ = "contact_lists"
@@ -203,7 +622,7 @@ class ContactList(Base):
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         primary_key=True,
-        default=uuid.uuid4
+        default=uuid7
     )
     
     # Ownership
@@ -231,7 +650,7 @@ class ContactList(Base):
     
     # Metadata
     tags: Mapped[List[str]] = mapped_column(ARRAY(String), default=list)
-    contact_metadata: Mapped[Optional[dict]] = mapped_column(JSONB, default=dict)
+    contact_metadata: Mapped[Optional[dict]] = mapped_column(JSONB, server_default=text("'{}'::jsonb"))
     
     # Relationships
     user: Mapped["User"] = relationship("User")
@@ -251,12 +670,12 @@ class ContactListMembership(Base):
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         primary_key=True,
-        default=uuid.uuid4
+        default=uuid7
     )
     
     contact_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
-        ForeignKey("contacts.id"),
+        ForeignKey("contacts.id", ondelete="CASCADE"),
         nullable=False
     )
     contact_list_id: Mapped[uuid.UUID] = mapped_column(
@@ -299,7 +718,7 @@ class ContactSegment(Base):
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         primary_key=True,
-        default=uuid.uuid4
+        default=uuid7
     )
     
     # Ownership
@@ -327,13 +746,208 @@ class ContactSegment(Base):
     
     # Metadata
     tags: Mapped[List[str]] = mapped_column(ARRAY(String), default=list)
-    contactsegment_metadata: Mapped[Optional[dict]] = mapped_column(JSONB, default=dict)
+    contactsegment_metadata: Mapped[Optional[dict]] = mapped_column(JSONB, server_default=text("'{}'::jsonb"))
     
     # Relationships
     user: Mapped["User"] = relationship("User")
     
+    # Indexes
+    __table_args__ = (
+        Index('idx_contact_segment_rules', 'rules', postgresql_using='gin', postgresql_ops={'rules': 'jsonb_path_ops'}),
+    )
+    
     def __repr__(self):
         return f"<ContactSegment(id={self.id}, name={self.name}, size={self.estimated_size})>"
+    
+    def compile(self) -> Select:
+        """SELECT of the ids of contacts matching this segment's rules"""
+        return select(Contact.id).where(
+            Contact.user_id == self.user_id,
+            compile_segment_rules(self.rules)
+        )
+    
+    async def refresh_membership(self, session: AsyncSession) -> None:
+        """Re-evaluate the rules and sync contact_segment_memberships to them
+        
+        One DELETE for contacts that left and one INSERT ... SELECT for those
+        that joined; the membership triggers adjust estimated_size by the
+        difference. Nothing is committed here.
+        """
+        members = self.compile()
+        await session.execute(
+            delete(ContactSegmentMembership).where(
+                ContactSegmentMembership.segment_id == self.id,
+                ContactSegmentMembership.contact_id.not_in(members)
+            )
+        )
+        await session.execute(
+            pg_insert(ContactSegmentMembership)
+            .from_select(
+                ["contact_id", "segment_id"],
+                members.add_columns(literal(self.id, UUID(as_uuid=True)))
+            )
+            .on_conflict_do_nothing()
+        )
+        self.last_calculated = datetime.utcnow()
+        await session.refresh(self, ["estimated_size"])
+
+    @classmethod
+    async def sync_contacts(cls, session: AsyncSession, contact_ids: Sequence[uuid.UUID]) -> None:
+        """Re-evaluate the owners' auto-updating segments for ``contact_ids`` only
+
+        Keeps memberships current after bulk writes (imports, counter
+        updates) at a cost proportional to the batch; refresh_membership()
+        stays the periodic fallback for every other kind of edit. Segments
+        whose rules don't compile are left to that refresh, which reports
+        them.
+        """
+        if not contact_ids:
+            return
+        ids = bindparam("contact_ids", list(contact_ids), type_=ARRAY(UUID(as_uuid=True)))
+        segments = (await session.execute(
+            select(cls.id, cls.user_id, cls.rules).where(
+                cls.is_active == True,
+                cls.auto_update == True,
+                cls.user_id.in_(select(Contact.user_id).where(Contact.id == any_(ids)))
+            )
+        )).all()
+        for segment_id, user_id, rules in segments:
+            try:
+                matching = compile_segment_rules(rules)
+            except ValueError:
+                continue
+            members = select(Contact.id).where(
+                Contact.id == any_(ids),
+                Contact.user_id == user_id,
+                matching
+            )
+            await session.execute(
+                delete(ContactSegmentMembership).where(
+                    ContactSegmentMembership.segment_id == segment_id,
+                    ContactSegmentMembership.contact_id == any_(ids),
+                    ContactSegmentMembership.contact_id.not_in(members)
+                )
+            )
+            await session.execute(
+                pg_insert(ContactSegmentMembership)
+                .from_select(
+                    ["contact_id", "segment_id"],
+                    members.add_columns(literal(segment_id, UUID(as_uuid=True)))
+                )
+                .on_conflict_do_nothing()
+            )
+
+_RULE_OPERATORS = {
+    "equals": operator.eq,
+    "not_equals": operator.ne,
+    "gt": operator.gt,
+    "gte": operator.ge,
+    "lt": operator.lt,
+    "lte": operator.le,
+    "in": lambda column, value: column.in_(value),
+}
+
+def _compile_rule(rules: Dict[str, Any]) -> ColumnElement:
+    """Translate a rules document into a WHERE clause over Contact"""
+    clauses = []
+    for field, condition in rules.items():
+        if field in ("and", "or"):
+            parts = [_compile_rule(rule) for rule in condition]
+            clauses.append(and_(*parts) if field == "and" else or_(*parts))
+        elif field == "tags" and "contains" in condition:
+            clauses.append(Contact.has_tags(condition["contains"]))
+        elif field == "custom_fields" and "contains" in condition:
+            clauses.append(Contact.custom_fields.contains(condition["contains"]))
+        elif field in Contact.__mapper__.column_attrs:
+            column = getattr(Contact, field)
+            for op, value in condition.items():
+                if op not in _RULE_OPERATORS:
+                    raise ValueError(f"Unsupported operator '{op}' for '{field}'")
+                clauses.append(_RULE_OPERATORS[op](column, value))
+        else:
+            raise ValueError(f"Unsupported segment rule field '{field}'")
+    return and_(true(), *clauses)
+
+@lru_cache(maxsize=512)
+def _compile_rules_cached(canonical_rules: str) -> ColumnElement:
+    return _compile_rule(json.loads(canonical_rules))
+
+def compile_segment_rules(rules: Optional[Dict[str, Any]]) -> ColumnElement:
+    """WHERE clause for a rules document, memoized on its canonical JSON
+    
+    Literal values end up as bound parameters, so SQLAlchemy's compiled cache
+    and asyncpg's per-connection prepared statement cache are reused across
+    segments that only differ in values.
+    """
+    canonical = json.dumps(rules or {}, sort_keys=True, separators=(",", ":"), default=str)
+    return _compile_rules_cached(canonical)
+
+class ContactSegmentMembership(Base):
+    """Materialized segment membership; contact_segments.estimated_size follows it via trigger"""
+    __tablename__ = "contact_segment_memberships"
+    
+    segment_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("contact_segments.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    contact_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("contacts.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    
+    # Indexes
+    __table_args__ = (
+        Index('idx_segment_membership_contact', 'contact_id'),
+    )
+    
+    def __repr__(self):
+        return f"<ContactSegmentMembership(segment_id={self.segment_id}, contact_id={self.contact_id})>"
+
+# Keep estimated_size in step with membership changes (O(delta) instead of a
+# full recount); statement-level, so a bulk refresh updates the segment row
+# once per segment rather than once per member
+event.listen(
+    ContactSegmentMembership.__table__,
+    "after_create",
+    DDL("""
+        CREATE OR REPLACE FUNCTION contact_segment_size_trg() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                UPDATE contact_segments s SET estimated_size = s.estimated_size + d.n
+                FROM (SELECT segment_id, count(*) AS n FROM new_rows GROUP BY segment_id) d
+                WHERE s.id = d.segment_id;
+            ELSE
+                UPDATE contact_segments s SET estimated_size = s.estimated_size - d.n
+                FROM (SELECT segment_id, count(*) AS n FROM old_rows GROUP BY segment_id) d
+                WHERE s.id = d.segment_id;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+)
+event.listen(
+    ContactSegmentMembership.__table__,
+    "after_create",
+    DDL("""
+        CREATE TRIGGER contact_segment_size_insert
+        AFTER INSERT ON contact_segment_memberships
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION contact_segment_size_trg()
+    """)
+)
+event.listen(
+    ContactSegmentMembership.__table__,
+    "after_create",
+    DDL("""
+        CREATE TRIGGER contact_segment_size_delete
+        AFTER DELETE ON contact_segment_memberships
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION contact_segment_size_trg()
+    """)
+)
 
 class ContactImport(Base):
     """Contact import batch tracking"""
@@ -342,7 +956,7 @@ class ContactImport(Base):
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         primary_key=True,
-        default=uuid.uuid4
+        default=uuid7
     )
     
     # Ownership
@@ -373,9 +987,6 @@ class ContactImport(Base):
     import_settings: Mapped[Optional[dict]] = mapped_column(JSONB)
     field_mapping: Mapped[Optional[dict]] = mapped_column(JSONB)
     
-    # Error tracking
-    errors: Mapped[Optional[List[dict]]] = mapped_column(JSONB)
-    
     # Target list
     target_list_id: Mapped[Optional[uuid.UUID]] = mapped_column(
         UUID(as_uuid=True),
@@ -385,6 +996,51 @@ class ContactImport(Base):
     # Relationships
     user: Mapped["User"] = relationship("User")
     target_list: Mapped[Optional["ContactList"]] = relationship("ContactList")
+    errors: Mapped[List["ContactImportError"]] = relationship(
+        "ContactImportError",
+        back_populates="contact_import",
+        lazy="raise",
+        passive_deletes=True
+    )
+    
+    # Indexes
+    __table_args__ = (
+        Index(
+            'idx_contact_import_settings', 'import_settings',
+            postgresql_using='gin', postgresql_ops={'import_settings': 'jsonb_path_ops'}
+        ),
+    )
+    
+    @classmethod
+    async def record_batch(
+        cls,
+        session: AsyncSession,
+        import_id: uuid.UUID,
+        processed: int,
+        successful: int,
+        duplicates: int,
+        errors: Sequence[Dict[str, Any]] = ()
+    ) -> None:
+        """Add one batch's counts to an import and store its per-row errors
+        
+        ``errors`` items carry ``row_number``, ``error_text`` and optionally
+        ``raw_row``.
+        """
+        await session.execute(
+            update(cls)
+            .where(cls.id == import_id)
+            .values(
+                processed_rows=cls.processed_rows + processed,
+                successful_imports=cls.successful_imports + successful,
+                duplicate_contacts=cls.duplicate_contacts + duplicates,
+                failed_imports=cls.failed_imports + len(errors)
+            )
+        )
+        if errors:
+            await session.execute(
+                pg_insert(ContactImportError),
+                [{"import_id": import_id, **error} for error in errors]
+            )
     
     def __repr__(self):
         return f"<ContactImport(id={self.id}, filename={self.filename}, status={self.status})>"
@@ -403,6 +1059,36 @@ class ContactImport(Base):
             return 0.0
         return (self.successful_imports / self.processed_rows) * 100
 
+class ContactImportError(Base):
+    """Rejected row of a contact import"""
+    __tablename__ = "contact_import_errors"
+    
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid7
+    )
+    import_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("contact_imports.id", ondelete="CASCADE"),
+        nullable=False
+    )
+    row_number: Mapped[Optional[int]] = mapped_column(Integer)
+    error_text: Mapped[str] = mapped_column(Text, nullable=False)
+    raw_row: Mapped[Optional[dict]] = mapped_column(JSONB)
+    
+    # Relationships
+    contact_import: Mapped["ContactImport"] = relationship("ContactImport", back_populates="errors")
+    
+    # Indexes
+    __table_args__ = (
+        Index('idx_contact_import_error_import_row', 'import_id', 'row_number'),
+    )
+    
+    def __repr__(self):
+        return f"<ContactImportError(import_id={self.import_id}, row={self.row_number})>"
+
+
 class ContactActivity(Base):
     """Contact activity tracking"""
     __tablename__ = "contact_activities"
@@ -410,7 +1096,7 @@ class ContactActivity(Base):
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         primary_key=True,
-        default=uuid.uuid4
+        default=uuid7
     )
     
     contact_id: Mapped[uuid.UUID] = mapped_column(
@@ -427,7 +1113,7 @@ class ContactActivity(Base):
     occurred_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         default=datetime.utcnow,
-        nullable=False
+        primary_key=True
     )
     
     # Source tracking
@@ -436,11 +1122,19 @@ class ContactActivity(Base):
     # Relationships
     contact: Mapped["Contact"] = relationship("Contact")
     
-    # Index for performance
+    # Index for performance (created per partition automatically)
+    # Range-partitioned by month; the partition key must be part of the PK
     __table_args__ = (
         Index('idx_contact_activity_contact_date', 'contact_id', 'occurred_at'),
         Index('idx_contact_activity_type_date', 'activity_type', 'occurred_at'),
+        Index(
+            'idx_contact_activity_occurred_brin', 'occurred_at',
+            postgresql_using='brin', postgresql_with={'pages_per_range': 32}
+        ),
+        {'postgresql_partition_by': 'RANGE (occurred_at)'},
     )
     
     def __repr__(self):
         return f"<ContactActivity(contact_id={self.contact_id}, type={self.activity_type})>"
+
+register_monthly_partitions(ContactActivity.__table__)
@@ -2,17 +2,32 @@
 Message models for SMS delivery and tracking
 """
 
-from sqlalchemy import String, Boolean, Text, Enum, Numeric, DateTime, ForeignKey, Integer, Index
+from sqlalchemy import CHAR, String, Boolean, Text, BigInteger, DateTime, ForeignKey, Integer, SmallInteger, Index, Computed, text
+from sqlalchemy.sql import ColumnElement
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID, JSONB
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterable, Tuple
+from functools import lru_cache
 import uuid
 import enum
+import re
 from datetime import datetime
 from decimal import Decimal
 from sqlalchemy import Column, DateTime, func
 
 from app.core.database import Base
+from app.core.money import from_micros, to_micros
+from app.core.partitions import register_monthly_partitions
+from app.models.types import SmallEnum, enum_check, enum_code
+
+_TEMPLATE_RE = re.compile(r"\{([a-zA-Z_][a-zA-Z0-9_]*)\}")
+
+
+@lru_cache(maxsize=1024)
+def _split_template(content: str) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """Split template content once into literal chunks and placeholder names"""
+    pieces = _TEMPLATE_RE.split(content)
+    return tuple(pieces[0::2]), tuple(pieces[1::2])
 
 class MessageStatus(str, enum.Enum):
     """Message delivery status"""
@@ -37,17 +52,31 @@ class MessageDirection(str, enum.Enum):
     OUTBOUND = "outbound"  # MT (Mobile Terminated)
     INBOUND = "inbound"    # MO (Mobile Originated)
 
+class QueueStatus(str, enum.Enum):
+    """Message queue entry status"""
+    PENDING = "pending"
+    PROCESSING = "processing"
+    PAUSED = "paused"
+    CANCELLED = "cancelled"
+    SENT = "sent"
+    FAILED = "failed"
+
 class Message(Base):
     """SMS Message model"""
     __tablename__ = "messages"
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    # Fetch server-generated values (created_at/updated_at, metadata default)
+    # via RETURNING on INSERT and UPDATE, so callers never need refresh()
+    __mapper_args__ = {"eager_defaults": True}
     
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         primary_key=True,
         default=uuid.uuid4
     )
+    # Range-partitioned by month on created_at, which must therefore be part of the PK
+    # (declared after id so the PK index still serves lookups by id)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), primary_key=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
     
     # Message ownership
     user_id: Mapped[uuid.UUID] = mapped_column(
@@ -65,17 +94,19 @@ class Message(Base):
     # Contact association
     contact_id: Mapped[Optional[uuid.UUID]] = mapped_column(
         UUID(as_uuid=True),
-        ForeignKey("contacts.id")
+        ForeignKey("contacts.id", ondelete="SET NULL")
     )
     
     # Message details
     message_type: Mapped[MessageType] = mapped_column(
-        Enum(MessageType),
+        SmallEnum(MessageType),
+        enum_check("message_type", MessageType, "ck_message_type"),
         default=MessageType.SMS,
         nullable=False
     )
     direction: Mapped[MessageDirection] = mapped_column(
-        Enum(MessageDirection),
+        SmallEnum(MessageDirection),
+        enum_check("direction", MessageDirection, "ck_message_direction"),
         default=MessageDirection.OUTBOUND,
         nullable=False
     )
@@ -83,11 +114,17 @@ class Message(Base):
     # Phone numbers
     from_number: Mapped[str] = mapped_column(String(20), nullable=False, index=True)
     to_number: Mapped[str] = mapped_column(String(20), nullable=False, index=True)
+    country_code: Mapped[Optional[str]] = mapped_column(CHAR(2), index=True)  # ISO 3166-1 alpha-2 of to_number
     
     # Message content
     content: Mapped[str] = mapped_column(Text, nullable=False)
     content_length: Mapped[int] = mapped_column(Integer, nullable=False)
     encoding: Mapped[str] = mapped_column(String(20), default="UTF-8", nullable=False)
+    template_id: Mapped[Optional[uuid.UUID]] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("message_templates.id", ondelete="SET NULL"),
+        index=True
+    )
     
     # Message parts (for long messages)
     parts_count: Mapped[int] = mapped_column(Integer, default=1, nullable=False)
@@ -96,7 +133,8 @@ class Message(Base):
     
     # Delivery tracking
     status: Mapped[MessageStatus] = mapped_column(
-        Enum(MessageStatus),
+        SmallEnum(MessageStatus),
+        enum_check("status", MessageStatus, "ck_message_status"),
         default=MessageStatus.PENDING,
         nullable=False,
         index=True
@@ -117,14 +155,13 @@ class Message(Base):
     dlr_status: Mapped[Optional[str]] = mapped_column(String(20))
     dlr_received_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
     dlr_error_code: Mapped[Optional[str]] = mapped_column(String(10))
-    dlr_error_message: Mapped[Optional[str]] = mapped_column(String(255))
     
     # Cost and billing
-    cost: Mapped[Decimal] = mapped_column(Numeric(8, 4), default=0.0, nullable=False)
+    cost_micros: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)  # see app.core.money
     currency: Mapped[str] = mapped_column(String(3), default="USD", nullable=False)
     
     # Priority and routing
-    priority: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    priority: Mapped[int] = mapped_column(SmallInteger, default=0, nullable=False)
     validity_period: Mapped[Optional[int]] = mapped_column(Integer)  # seconds
     
     # Retry logic
@@ -132,16 +169,19 @@ class Message(Base):
     max_retries: Mapped[int] = mapped_column(Integer, default=3, nullable=False)
     next_retry_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
     
-    # Error tracking
+    # Error tracking (free-text messages live in MessageDetails)
     error_code: Mapped[Optional[str]] = mapped_column(String(20))
-    error_message: Mapped[Optional[str]] = mapped_column(String(500))
     
-    # Metadata and tracking
-    message_metadata: Mapped[Optional[dict]] = mapped_column(JSONB, default=dict)
+    # Metadata and tracking (sparse keys only; filterable fields get their own columns)
+    message_metadata: Mapped[Optional[dict]] = mapped_column(JSONB, server_default=text("'{}'::jsonb"))
     tags: Mapped[Optional[List[str]]] = mapped_column(JSONB)
     
     # Click tracking (for URLs in messages)
-    contains_url: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    # Derived by PostgreSQL on write (GENERATED ... STORED), not scanned in Python
+    contains_url: Mapped[bool] = mapped_column(
+        Boolean,
+        Computed("content ~* 'https?://[^\\s]+'", persisted=True)
+    )
     click_tracked: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     clicks_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
     
@@ -149,13 +189,24 @@ class Message(Base):
     user: Mapped["User"] = relationship("User")
     campaign: Mapped[Optional["Campaign"]] = relationship("Campaign", back_populates="messages")
     contact: Mapped[Optional["Contact"]] = relationship("Contact", back_populates="messages")
+    # Partitioned tables can't be FK targets on id alone, so these joins are ORM-only
+    details: Mapped[Optional["MessageDetails"]] = relationship(
+        "MessageDetails",
+        primaryjoin="Message.id == foreign(MessageDetails.message_id)",
+        back_populates="message",
+        uselist=False,
+        lazy="raise",
+        passive_deletes=True
+    )
     delivery_reports: Mapped[List["DeliveryReport"]] = relationship(
         "DeliveryReport",
+        primaryjoin="Message.id == foreign(DeliveryReport.message_id)",
         back_populates="message",
         cascade="all, delete-orphan"
     )
     click_events: Mapped[List["ClickEvent"]] = relationship(
         "ClickEvent",
+        primaryjoin="Message.id == foreign(ClickEvent.message_id)",
         back_populates="message",
         cascade="all, delete-orphan"
     )
@@ -164,14 +215,43 @@ class Message(Base):
     __table_args__ = (
         Index('idx_message_user_status', 'user_id', 'status'),
         Index('idx_message_campaign_status', 'campaign_id', 'status'),
-        Index('idx_message_created_status', 'created_at', 'status'),
+        # created_at only grows, so a BRIN summary replaces the btree for range scans
+        Index('brin_msg_created', 'created_at', postgresql_using='brin', postgresql_with={'pages_per_range': 32}),
         Index('idx_message_gateway_id', 'gateway_message_id'),
         Index('idx_message_scheduled', 'scheduled_at', 'status'),
+        # Dispatcher's "next to send" scan; stays small since most rows are final
+        Index(
+            'idx_message_dispatch', text('priority DESC'), 'scheduled_at',
+            postgresql_where=text(
+                f"status IN ({enum_code(MessageStatus.PENDING)}, {enum_code(MessageStatus.QUEUED)})"
+            )
+        ),
+        # Dashboard filters use @> containment (see has_tags/metadata_contains)
+        Index(
+            'idx_message_metadata_gin', 'message_metadata',
+            postgresql_using='gin', postgresql_ops={'message_metadata': 'jsonb_path_ops'}
+        ),
+        Index('idx_message_tags_gin', 'tags', postgresql_using='gin', postgresql_ops={'tags': 'jsonb_path_ops'}),
+        # High-cardinality single-key lookup that stays on ->>
+        Index('idx_message_campaign_ref', text("(message_metadata ->> 'campaign_ref')")),
+        # Messages carrying links are a small slice; click reports scan them by time
+        Index('idx_message_url', 'created_at', postgresql_where=text('contains_url')),
+        {'postgresql_partition_by': 'RANGE (created_at)'},
     )
     
     def __repr__(self):
         return f"<Message(id={self.id}, to={self.to_number}, status={self.status})>"
     
+    @classmethod
+    def has_tags(cls, tags: Iterable[str]) -> ColumnElement[bool]:
+        """Filter for messages tagged with all of ``tags``"""
+        return cls.tags.contains(list(tags))
+    
+    @classmethod
+    def metadata_contains(cls, **fields: Any) -> ColumnElement[bool]:
+        """Filter on metadata key/values with @> instead of ->> equality"""
+        return cls.message_metadata.contains(fields)
+    
     @property
     def is_delivered(self) -> bool:
         """Check if message was successfully delivered"""
@@ -189,11 +269,45 @@ class Message(Base):
             return int((self.delivered_at - self.sent_at).total_seconds())
         return None
     
+    @property
+    def cost(self) -> Decimal:
+        """Message cost in currency units"""
+        return from_micros(self.cost_micros or 0)
+    
+    @cost.setter
+    def cost(self, amount) -> None:
+        self.cost_micros = to_micros(amount)
+    
     @property
     def is_multipart(self) -> bool:
         """Check if message is multipart"""
         return self.parts_count > 1
 
+register_monthly_partitions(Message.__table__)
+
+
+class MessageDetails(Base):
+    """Rarely-read free text for a message, kept off the hot messages table"""
+    __tablename__ = "message_details"
+    
+    # No FK: rows for dropped message partitions are purged by the retention task
+    message_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        primary_key=True
+    )
+    error_message: Mapped[Optional[str]] = mapped_column(Text)
+    dlr_error_message: Mapped[Optional[str]] = mapped_column(Text)
+    
+    # Relationships
+    message: Mapped["Message"] = relationship(
+        "Message",
+        primaryjoin="foreign(MessageDetails.message_id) == Message.id",
+        back_populates="details"
+    )
+    
+    def __repr__(self):
+        return f"<MessageDetails(message_id={self.message_id})>"
+
 class DeliveryReport(Base):
     """Delivery reports (DLR) from SMS gateway"""
     __tablename__ = "delivery_reports"
@@ -206,7 +320,6 @@ class DeliveryReport(Base):
     
     message_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
-        ForeignKey("messages.id"),
         nullable=False
     )
     
@@ -222,21 +335,35 @@ class DeliveryReport(Base):
     # Timestamps
     submit_date: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
     done_date: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    # Range-partitioned by month on received_at, which must therefore be part of the PK
     received_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         default=datetime.utcnow,
-        nullable=False
+        primary_key=True
     )
     
     # Raw DLR data
     raw_dlr: Mapped[Optional[dict]] = mapped_column(JSONB)
     
     # Relationships
-    message: Mapped["Message"] = relationship("Message", back_populates="delivery_reports")
+    message: Mapped["Message"] = relationship(
+        "Message",
+        primaryjoin="foreign(DeliveryReport.message_id) == Message.id",
+        back_populates="delivery_reports"
+    )
+    
+    # Indexes
+    __table_args__ = (
+        Index('brin_dlr_received', 'received_at', postgresql_using='brin', postgresql_with={'pages_per_range': 32}),
+        Index('idx_dlr_message', 'message_id'),
+        {'postgresql_partition_by': 'RANGE (received_at)'},
+    )
     
     def __repr__(self):
         return f"<DeliveryReport(id={self.id}, message_id={self.message_id}, status={self.dlr_status})>"
 
+register_monthly_partitions(DeliveryReport.__table__)
+
 class ClickEvent(Base):
     """Click tracking for URLs in messages"""
     __tablename__ = "click_events"
@@ -249,7 +376,6 @@ class ClickEvent(Base):
     
     message_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
-        ForeignKey("messages.id"),
         nullable=False
     )
     
@@ -273,7 +399,11 @@ class ClickEvent(Base):
     )
     
     # Relationships
-    message: Mapped["Message"] = relationship("Message", back_populates="click_events")
+    message: Mapped["Message"] = relationship(
+        "Message",
+        primaryjoin="foreign(ClickEvent.message_id) == Message.id",
+        back_populates="click_events"
+    )
     
     def __repr__(self):
         return f"<ClickEvent(id={self.id}, message_id={self.message_id}, clicked_at={self.clicked_at})>"
@@ -290,18 +420,26 @@ class MessageQueue(Base):
     
     # Queue information
     queue_name: Mapped[str] = mapped_column(String(50), nullable=False, index=True)
-    priority: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    priority: Mapped[int] = mapped_column(SmallInteger, default=0, nullable=False)
     
     # Message data
     message_data: Mapped[dict] = mapped_column(JSONB, nullable=False)
     
     # Processing status
-    status: Mapped[str] = mapped_column(String(20), default="pending", nullable=False, index=True)
+    status: Mapped[QueueStatus] = mapped_column(
+        SmallEnum(QueueStatus),
+        enum_check("status", QueueStatus, "ck_queue_status"),
+        default=QueueStatus.PENDING,
+        nullable=False,
+        index=True
+    )
     attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
     max_attempts: Mapped[int] = mapped_column(Integer, default=3, nullable=False)
     
     # Timestamps
-    scheduled_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    scheduled_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
     processed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
     next_attempt_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
     
@@ -316,9 +454,14 @@ class MessageQueue(Base):
     
     # Indexes
     __table_args__ = (
-        Index('idx_queue_status_priority', 'status', 'priority'),
+        Index(
+            'idx_queue_pending', text('priority DESC'), 'scheduled_at',
+            postgresql_where=text(f"status = {enum_code(QueueStatus.PENDING)}")
+        ),
         Index('idx_queue_scheduled', 'scheduled_at', 'status'),
         Index('idx_queue_next_attempt', 'next_attempt_at', 'status'),
+        # Campaign pause/resume/cancel and completion checks
+        Index('idx_queue_campaign_status', 'campaign_id', 'status'),
     )
     
     def __repr__(self):
@@ -369,11 +512,15 @@ class MessageTemplate(Base):
     
     def render(self, variables: Dict[str, Any]) -> str:
         """Render template with provided variables"""
-        content = self.content
-        for var_name, var_value in variables.items():
-            placeholder = f"{{{var_name}}}"
-            content = content.replace(placeholder, str(var_value))
-        return content
+        literals, names = _split_template(self.content)
+        if not names:
+            return self.content
+        # Unknown placeholders are left as-is
+        parts = [literals[0]]
+        for name, literal in zip(names, literals[1:]):
+            parts.append(str(variables[name]) if name in variables else f"{{{name}}}")
+            parts.append(literal)
+        return "".join(parts)
 
 class Webhook(Base):
     """Webhook configurations for message events"""
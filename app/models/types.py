@@ -0,0 +1,44 @@
+"""
+Shared column types for database models
+"""
+
+from sqlalchemy import CheckConstraint, SmallInteger
+from sqlalchemy.types import TypeDecorator
+
+
+def enum_code(member) -> int:
+    """SMALLINT code stored for ``member``: its 1-based declaration position"""
+    return list(type(member)).index(member) + 1
+
+
+class SmallEnum(TypeDecorator):
+    """SMALLINT column holding a 1-based code per member of ``enum_cls``
+
+    Two bytes per row instead of a 4-byte ENUM OID or a VARCHAR label, and no
+    ALTER TYPE when a member is added. Codes follow declaration order, so new
+    members must be appended. Binds accept members or their values; reads
+    return the member.
+    """
+
+    impl = SmallInteger
+    cache_ok = True
+
+    def __init__(self, enum_cls, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.enum_cls = enum_cls
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return enum_code(self.enum_cls(value))
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return list(self.enum_cls)[value - 1]
+
+
+def enum_check(column: str, enum_cls, name: str) -> CheckConstraint:
+    """Named CHECK keeping a SmallEnum column within its enum's codes"""
+    return CheckConstraint(f"{column} BETWEEN 1 AND {len(enum_cls)}", name=name)
+
@@ -2,15 +2,19 @@
 User models for authentication and role-based access control
 """
 
-from sqlalchemy import String, Boolean, Text, Enum, Numeric, DateTime, ForeignKey
+from sqlalchemy import String, Boolean, Text, BigInteger, DateTime, ForeignKey, Index, func, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from typing import Optional, List
 import uuid
 import enum
 from datetime import datetime
+from decimal import Decimal
 
 from app.core.database import Base
+from app.core.money import from_micros, to_micros
+from app.models.types import SmallEnum, enum_check
 
 class UserRole(str, enum.Enum):
     """User roles with hierarchical permissions"""
@@ -45,12 +49,14 @@ class User(Base):
     
     # Role and permissions
     role: Mapped[UserRole] = mapped_column(
-        Enum(UserRole),
+        SmallEnum(UserRole),
+        enum_check("role", UserRole, "ck_user_role"),
         default=UserRole.CLIENT,
         nullable=False
     )
     status: Mapped[UserStatus] = mapped_column(
-        Enum(UserStatus),
+        SmallEnum(UserStatus),
+        enum_check("status", UserStatus, "ck_user_status"),
         default=UserStatus.PENDING,
         nullable=False
     )
@@ -72,7 +78,7 @@ class User(Base):
         ForeignKey("users.id"),
         nullable=True
     )
-    credit_balance: Mapped[float] = mapped_column(Numeric(10, 4), default=0.0, nullable=False)
+    credit_balance_micros: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)  # see app.core.money
     monthly_sms_limit: Mapped[Optional[int]] = mapped_column(default=None)
     api_rate_limit: Mapped[int] = mapped_column(default=1000, nullable=False)  # per hour
     
@@ -131,16 +137,36 @@ class User(Base):
         """Check if user can create sub-users"""
         return self.role in [UserRole.SUPER_ADMIN, UserRole.ADMIN]
     
-    def has_sufficient_credit(self, amount: float) -> bool:
+    @property
+    def credit_balance(self) -> Decimal:
+        """Credit balance in currency units"""
+        return from_micros(self.credit_balance_micros or 0)
+    
+    @credit_balance.setter
+    def credit_balance(self, amount) -> None:
+        self.credit_balance_micros = to_micros(amount)
+    
+    def has_sufficient_credit(self, amount) -> bool:
         """Check if user has sufficient credit"""
-        return self.credit_balance >= amount
-    
-    def deduct_credit(self, amount: float) -> bool:
-        """Deduct credit from user balance"""
-        if self.has_sufficient_credit(amount):
-            self.credit_balance -= amount
-            return True
-        return False
+        return (self.credit_balance_micros or 0) >= to_micros(amount)
+    
+    @classmethod
+    async def deduct_credit(cls, session: AsyncSession, user_id: uuid.UUID, amount) -> Optional[Decimal]:
+        """Atomically deduct credit; returns the new balance, or None if funds are insufficient
+        
+        A single conditional UPDATE ... RETURNING: no SELECT, no Python-side
+        check and no lost update between concurrent senders.
+        """
+        micros = to_micros(amount)
+        result = await session.execute(
+            update(cls)
+            .where(cls.id == user_id, cls.credit_balance_micros >= micros)
+            .values(credit_balance_micros=cls.credit_balance_micros - micros)
+            .returning(cls.credit_balance_micros)
+            .execution_options(synchronize_session=False)
+        )
+        balance = result.scalar_one_or_none()
+        return None if balance is None else from_micros(balance)
 
 class ApiKey(Base):
     """API keys for programmatic access"""
@@ -236,8 +262,19 @@ class AuditLog(Base):
     ip_address: Mapped[Optional[str]] = mapped_column(String(45))
     user_agent: Mapped[Optional[str]] = mapped_column(Text)
     
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False
+    )
+    
     # Relationships
     user: Mapped[Optional["User"]] = relationship("User")
     
+    # Indexes
+    __table_args__ = (
+        Index('brin_audit_created', 'created_at', postgresql_using='brin', postgresql_with={'pages_per_range': 32}),
+    )
+    
     def __repr__(self):
         return f"<AuditLog(id={self.id}, action={self.action}, user_id={self.user_id})>"
\ No newline at end of file
@@ -1,7 +1,13 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, ConfigDict, EmailStr
 from typing import Optional
 import uuid
 
+# Incoming payloads: drop unknown keys instead of storing them on the model.
+# Models carrying passwords keep whitespace as typed.
+REQUEST_CONFIG = ConfigDict(extra='ignore', str_strip_whitespace=True)
+CREDENTIALS_CONFIG = ConfigDict(extra='ignore')
+RESPONSE_CONFIG = ConfigDict(from_attributes=True)
+
 # Schema for the JWT token response
 class Token(BaseModel):
     access_token: str
@@ -9,21 +15,29 @@ class Token(BaseModel):
 
 # Schema for the data embedded within the JWT token
 class TokenData(BaseModel):
+    model_config = REQUEST_CONFIG
+
     username: Optional[str] = None
 
 # Schema for creating a new user (registration)
 class UserCreate(BaseModel):
+    model_config = CREDENTIALS_CONFIG
+
     email: EmailStr
     username: str
     password: str
 
 # Schema for user login
 class UserLogin(BaseModel):
+    model_config = CREDENTIALS_CONFIG
+
     username: str
     password: str
 
 # Schema for receiving a refresh token
 class TokenRefresh(BaseModel):
+    model_config = REQUEST_CONFIG
+
     refresh_token: str
 
 # Schema for registering a new user (can be an alias for UserCreate)
@@ -31,20 +45,23 @@ UserRegister = UserCreate
 
 # Schema for returning user data in API responses
 class UserResponse(BaseModel):
+    model_config = RESPONSE_CONFIG
+
     id: uuid.UUID
     email: EmailStr
     username: str
     is_active: bool
 
-    class Config:
-        from_attributes = True # For Pydantic v2
-
 
 # Schema for the password reset request
 class PasswordReset(BaseModel):
+    model_config = CREDENTIALS_CONFIG
+
     token: str
     new_password: str
 
 # Schema for confirming a password reset request (usually by email)
 class PasswordResetConfirm(BaseModel):
+    model_config = REQUEST_CONFIG
+
     email: EmailStr
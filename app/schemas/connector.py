@@ -1,11 +1,16 @@
 import uuid
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, TypeAdapter
 from typing import Optional, Dict, Any
 from typing import List
 from datetime import datetime
 
+REQUEST_CONFIG = ConfigDict(extra='ignore', str_strip_whitespace=True)
+RESPONSE_CONFIG = ConfigDict(from_attributes=True)
+
 # Base schema with common fields for a connector
 class ConnectorBase(BaseModel):
+    model_config = REQUEST_CONFIG
+
     name: str
     connector_type: str
     config: Dict[str, Any]
@@ -17,24 +22,29 @@ class ConnectorCreate(ConnectorBase):
 
 # Schema for updating an existing connector
 class ConnectorUpdate(BaseModel):
+    model_config = REQUEST_CONFIG
+
     name: Optional[str] = None
     config: Optional[Dict[str, Any]] = None
     is_active: Optional[bool] = None
 
 # Schema for returning a connector in API responses
 class ConnectorResponse(ConnectorBase):
-    id: uuid.UUID
+    model_config = RESPONSE_CONFIG
 
-    class Config:
-        from_attributes = True
+    id: uuid.UUID
 
 # Schema for returning a list of connectors
 class ConnectorListResponse(BaseModel):
+    model_config = RESPONSE_CONFIG
+
     items: List[ConnectorResponse]
     total: int
 
 # Schema for creating a new route
 class RouteCreate(BaseModel):
+    model_config = REQUEST_CONFIG
+
     route_type: str
     connector_id: uuid.UUID
     order: int
@@ -42,46 +52,55 @@ class RouteCreate(BaseModel):
 
 # Schema for updating an existing route
 class RouteUpdate(BaseModel):
+    model_config = REQUEST_CONFIG
+
     order: Optional[int] = None
     filters: Optional[Dict[str, Any]] = None
 
 # Schema for returning route data
 class RouteResponse(RouteCreate):
-    id: uuid.UUID
+    model_config = RESPONSE_CONFIG
 
-    class Config:
-        from_attributes = True
+    id: uuid.UUID
 
 # Schema for creating a new filter
 class FilterCreate(BaseModel):
+    model_config = REQUEST_CONFIG
+
     filter_type: str
     connector_id: uuid.UUID
     config: Dict[str, Any]
 
 # Schema for updating an existing filter
 class FilterUpdate(BaseModel):
+    model_config = REQUEST_CONFIG
+
     config: Optional[Dict[str, Any]] = None
 
 # Schema for returning filter data
 class FilterResponse(FilterCreate):
-    id: uuid.UUID
+    model_config = RESPONSE_CONFIG
 
-    class Config:
-        from_attributes = True
+    id: uuid.UUID
 
 # Schema for returning connector log data
 class ConnectorLogResponse(BaseModel):
+    model_config = RESPONSE_CONFIG
+
     id: uuid.UUID
     timestamp: datetime
     level: str
     message: str
 
-    class Config:
-        from_attributes = True
-
 # Schema for returning connector statistics
 class ConnectorStatsResponse(BaseModel):
+    model_config = RESPONSE_CONFIG
+
     messages_sent: int
     messages_received: int
     uptime_seconds: float
     throughput_mps: float
+
+# List validators built once at import instead of per request
+CONNECTOR_LIST_ADAPTER: TypeAdapter[List[ConnectorResponse]] = TypeAdapter(List[ConnectorResponse])
+CONNECTOR_LOG_LIST_ADAPTER: TypeAdapter[List[ConnectorLogResponse]] = TypeAdapter(List[ConnectorLogResponse])
@@ -0,0 +1,192 @@
+"""
+Two-tier (in-process LRU + Redis) read-through cache for auth lookups
+"""
+
+import asyncio
+import enum
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, Generic, Iterable, Optional, Set, Tuple, Type, TypeVar
+
+import orjson
+from sqlalchemy import event, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_object_session
+from sqlalchemy.orm import Session, make_transient_to_detached, object_session
+
+from app.models.user import ApiKey, User
+from app.core.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+ModelT = TypeVar("ModelT")
+
+
+def _decoder(column) -> Optional[Callable[[Any], Any]]:
+    """Turn a JSON-decoded value back into the column's Python type"""
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return None
+    if python_type is uuid.UUID:
+        return uuid.UUID
+    if python_type is datetime:
+        return datetime.fromisoformat
+    if isinstance(python_type, type) and issubclass(python_type, enum.Enum):
+        return python_type
+    return None
+
+
+class ModelCache(Generic[ModelT]):
+    """Cache rows of ``model`` looked up by a unique ``key`` column
+
+    Only the whitelisted ``fields`` are stored, as orjson snapshots: first in
+    a small per-process LRU, then in Redis, both with a ``ttl``. A hit is
+    re-attached to the caller's session with ``merge(load=False)``, so it
+    behaves like a loaded instance without a SELECT. Columns outside
+    ``fields`` stay unloaded, and touching one would lazy-load outside the
+    event loop (MissingGreenlet); fetch them first with :meth:`load`.
+
+    ORM updates/deletes of a cached row are collected per session during
+    flush and invalidated once that session commits (dropped on rollback),
+    so a reader can't re-cache the old row between flush and commit.
+    """
+
+    def __init__(self, model: Type[ModelT], key: str, fields: Iterable[str],
+                 ttl: int = 60, maxsize: int = 4096):
+        self.model = model
+        self.key = key
+        self.fields = tuple(dict.fromkeys(("id", key, *fields)))
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.prefix = f"auth_cache:{model.__tablename__}"
+        self._local: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._tasks: Set[asyncio.Task] = set()
+        self._pending_key = f"{self.prefix}:invalidate"
+        self._decoders: Dict[str, Callable[[Any], Any]] = {}
+        for name in self.fields:
+            decoder = _decoder(model.__table__.columns[name])
+            if decoder is not None:
+                self._decoders[name] = decoder
+
+        event.listen(model, "after_update", self._on_change)
+        event.listen(model, "after_delete", self._on_change)
+        event.listen(Session, "after_commit", self._on_commit)
+        event.listen(Session, "after_rollback", self._on_rollback)
+
+    def _redis_key(self, value: str) -> str:
+        return f"{self.prefix}:{value}"
+
+    async def get(self, db: AsyncSession, value: str) -> Optional[ModelT]:
+        """Return the row whose key column equals ``value`` (None if missing)"""
+        payload = self._get_local(value)
+        if payload is None:
+            try:
+                payload = await get_redis().get(self._redis_key(value))
+            except Exception as e:
+                logger.warning(f"Auth cache unavailable: {e}")
+            if payload is not None:
+                self._put_local(value, payload)
+
+        if payload is None:
+            result = await db.execute(select(self.model).where(getattr(self.model, self.key) == value))
+            instance = result.scalar_one_or_none()
+            if instance is not None:
+                await self._store(value, instance)
+            return instance
+
+        return await self._attach(db, payload)
+
+    async def invalidate(self, value: str) -> None:
+        self._local.pop(value, None)
+        try:
+            await get_redis().delete(self._redis_key(value))
+        except Exception as e:
+            logger.warning(f"Auth cache invalidation failed for {value}: {e}")
+
+    async def load(self, instance: ModelT, *names: str) -> ModelT:
+        """Fetch the given columns of ``instance`` if they aren't loaded yet"""
+        unloaded = [name for name in names if name in inspect(instance).unloaded]
+        if unloaded:
+            await async_object_session(instance).refresh(instance, attribute_names=unloaded)
+        return instance
+
+    def _get_local(self, value: str) -> Optional[bytes]:
+        entry = self._local.get(value)
+        if entry is None:
+            return None
+        expires_at, payload = entry
+        if expires_at < time.monotonic():
+            del self._local[value]
+            return None
+        self._local.move_to_end(value)
+        return payload
+
+    def _put_local(self, value: str, payload: bytes) -> None:
+        self._local[value] = (time.monotonic() + self.ttl, payload)
+        self._local.move_to_end(value)
+        while len(self._local) > self.maxsize:
+            self._local.popitem(last=False)
+
+    async def _store(self, value: str, instance: ModelT) -> None:
+        # default=str covers asyncpg's own UUID type, which orjson rejects
+        payload = orjson.dumps({name: getattr(instance, name) for name in self.fields}, default=str)
+        self._put_local(value, payload)
+        try:
+            await get_redis().set(self._redis_key(value), payload, ex=self.ttl)
+        except Exception as e:
+            logger.warning(f"Auth cache unavailable: {e}")
+
+    async def _attach(self, db: AsyncSession, payload: bytes) -> ModelT:
+        data = orjson.loads(payload)
+        for name, decoder in self._decoders.items():
+            if data.get(name) is not None:
+                data[name] = decoder(data[name])
+        instance = self.model(**data)
+        make_transient_to_detached(instance)
+        return await db.merge(instance, load=False)
+
+    def _on_change(self, mapper, connection, target) -> None:
+        # Also drop the previous key when the key column itself changed
+        history = inspect(target).attrs[self.key].history
+        values = {getattr(target, self.key), *history.deleted}
+        session = object_session(target)
+        if session is None:
+            self._invalidate_now(values)
+            return
+        session.info.setdefault(self._pending_key, set()).update(values)
+
+    def _on_commit(self, session: Session) -> None:
+        values = session.info.pop(self._pending_key, None)
+        if values:
+            self._invalidate_now(values)
+
+    def _on_rollback(self, session: Session) -> None:
+        session.info.pop(self._pending_key, None)
+
+    def _invalidate_now(self, values: Set[str]) -> None:
+        for value in values:
+            self._local.pop(value, None)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        for value in values:
+            # Hold a reference until done; the loop only keeps weak ones
+            task = loop.create_task(self.invalidate(value))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+# Never cache credentials (hashed_password) or columns written by bulk UPDATEs
+# that skip the mapper events (credit_balance_micros via User.deduct_credit)
+user_cache: ModelCache[User] = ModelCache(User, "username", fields=(
+    "email", "full_name", "role", "status", "is_active", "is_verified", "is_superuser",
+    "phone", "company", "timezone", "language", "parent_user_id",
+    "monthly_sms_limit", "api_rate_limit", "locked_until",
+))
+api_key_cache: ModelCache[ApiKey] = ModelCache(ApiKey, "key_hash", fields=(
+    "user_id", "name", "key_prefix", "is_active", "expires_at",
+    "permissions", "rate_limit", "allowed_ips",
+))
@@ -3,6 +3,11 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Password reset email
+_RESET_SUBJECT = "Password Reset Request"
+_RESET_LINK_TMPL = "{base_url}/reset-password?token={token}"
+_RESET_BODY_TMPL = "Please use the following link to reset your password: {link}"
+
 class EmailService:
     def __init__(self):
         self.config = settings
@@ -12,16 +17,16 @@ class EmailService:
     async def send_password_reset_email(self, email_to: str, token: str):
         # This is a placeholder. In a real application, you would use
         # a library like aiosmtplib to send an actual email.
-        reset_link = f"{settings.BASE_URL}/reset-password?token={token}"
+        reset_link = _RESET_LINK_TMPL.format(base_url=settings.BASE_URL, token=token)
 
-        subject = "Password Reset Request"
-        body = f"Please use the following link to reset your password: {reset_link}"
+        subject = _RESET_SUBJECT
+        body = _RESET_BODY_TMPL.format(link=reset_link)
 
-        logger.info(f"--- FAKE EMAIL ---")
-        logger.info(f"To: {email_to}")
-        logger.info(f"Subject: {subject}")
-        logger.info(f"Body: {body}")
-        logger.info(f"--------------------")
+        logger.info("--- FAKE EMAIL ---")
+        logger.info("To: %s", email_to)
+        logger.info("Subject: %s", subject)
+        logger.info("Body: %s", body)
+        logger.info("--------------------")
 
         # This simulates a successful email send for now
         return True
@@ -4,11 +4,13 @@ Direct integration with Jasmin jcli (Telnet interface) for real-time management
 """
 
 import asyncio
-import telnetlib
 import json
 import re
 import logging
-from typing import Dict, List, Optional, Any, Tuple
+import time
+from typing import AsyncIterator, Callable, Dict, List, Optional, Any, Tuple
+from contextlib import asynccontextmanager
+from urllib.parse import quote_plus, urlencode
 from datetime import datetime, timedelta
 import aiohttp
 from dataclasses import dataclass
@@ -18,6 +20,49 @@ from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# StreamReader buffer limit; readuntil() fails on responses larger than this
+JCLI_READ_LIMIT = 2 ** 20
+
+# send_sms posts a pre-encoded body
+_FORM_HEADERS = {"Content-Type": "application/x-www-form-urlencoded"}
+
+# Telnet option negotiation (IAC ...) that telnetlib used to strip for us
+_TELNET_IAC_RE = re.compile(rb"\xff(?:\xfa.*?\xff\xf0|[\xfb-\xfe].|[\xf0-\xf9]|\xff)", re.S)
+
+
+# jcli/HTTP API response parsing
+_CONN_RE = re.compile(r'(\w+)\s+(\w+)\s+(\w+)\s+(.+)')
+_MSGID_RE = re.compile(r'Message ID:\s*(\w+)')
+# "key: value" lines, split at the first colon; the value is stripped and,
+# when numeric, captured as f(loat) or i(nt) so parsing needs no branching
+_STATS_RE = re.compile(
+    r'^(?P<k>[^:\n]*):[^\S\n]*'
+    r'(?P<v>(?P<f>[-+]?(?:\d+\.\d*|\.\d+)(?:[eE][-+]?\d+)?)|(?P<i>[-+]?\d+)|[^\n]*?)'
+    r'[^\S\n]*$',
+    re.M
+)
+# Non-comment, non-blank lines
+_ROUTE_LINE_RE = re.compile(r'^(?!#)[^\S\n]*(\S[^\n]*)$', re.M)
+
+
+def _strip_telnet_negotiation(data: bytes) -> bytes:
+    """Drop telnet command sequences, keeping escaped 0xff data bytes"""
+    return _TELNET_IAC_RE.sub(lambda m: b"\xff" if m.group() == b"\xff\xff" else b"", data)
+
+
+def _to_int(value: str, default: int = 0) -> int:
+    try:
+        return int(value)
+    except ValueError:
+        return default
+
+
+def _to_float(value: str, default: float = 0.0) -> float:
+    try:
+        return float(value)
+    except ValueError:
+        return default
+
 class ConnectorStatus(str, Enum):
     """SMPP Connector status"""
     STARTED = "started"
@@ -26,6 +71,8 @@ class ConnectorStatus(str, Enum):
     UNBOUND = "unbound"
     ERROR = "error"
 
+_CONNECTOR_STATUS_VALUES = frozenset(member.value for member in ConnectorStatus)
+
 @dataclass
 class ConnectorInfo:
     """SMPP Connector information"""
@@ -61,6 +108,84 @@ class FilterInfo:
     value: str
     description: str
 
+class JcliSession:
+    """One authenticated jcli (Telnet) session"""
+    
+    def __init__(self, host: str, port: int, username: str, password: str, timeout: float):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.timeout = timeout
+        
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self.is_connected = False
+    
+    async def connect(self) -> bool:
+        """Open the connection and log in"""
+        try:
+            self._reader, self._writer = await asyncio.wait_for(
+                asyncio.open_connection(self.host, self.port, limit=JCLI_READ_LIMIT),
+                self.timeout
+            )
+            
+            # Login
+            await self._read_until(b"Authentication required.\n")
+            await self._write_line(self.username)
+            await self._read_until(b"Password:")
+            await self._write_line(self.password)
+            
+            # Check if login successful
+            response = await self._read_until(b"jcli : ", timeout=5)
+            
+            if b"Welcome to Jasmin" in response:
+                self.is_connected = True
+                logger.info("Successfully connected to Jasmin Telnet interface")
+                return True
+            else:
+                logger.error("Failed to authenticate with Jasmin")
+                return False
+                
+        except Exception as e:
+            logger.error(f"Failed to connect to Jasmin Telnet: {e}")
+            self.is_connected = False
+            return False
+    
+    async def close(self) -> None:
+        if self._writer:
+            try:
+                self._writer.close()
+                await self._writer.wait_closed()
+            except Exception:
+                pass
+            self._reader = self._writer = None
+        self.is_connected = False
+    
+    def abort(self) -> None:
+        """Drop the connection without waiting, so it is safe while being cancelled"""
+        if self._writer:
+            self._writer.close()
+            self._reader = self._writer = None
+        self.is_connected = False
+    
+    async def execute(self, command: str) -> str:
+        """Send one command and return its output up to the next prompt"""
+        if not self.is_connected:
+            raise ConnectionError("jcli session is not connected")
+        await self._write_line(command)
+        response = await self._read_until(b"jcli : ")
+        return response.decode('utf-8').strip()
+    
+    async def _read_until(self, marker: bytes, timeout: Optional[float] = None) -> bytes:
+        """Read up to and including ``marker``, without telnet negotiation bytes"""
+        data = await asyncio.wait_for(self._reader.readuntil(marker), timeout or self.timeout)
+        return _strip_telnet_negotiation(data)
+    
+    async def _write_line(self, line: str) -> None:
+        self._writer.write(f"{line}\n".encode())
+        await self._writer.drain()
+
 class JasminService:
     """Service for interacting with Jasmin SMS Gateway via Telnet (jcli)"""
     
@@ -72,15 +197,27 @@ class JasminService:
         self.password = settings.JASMIN_PASSWORD
         self.timeout = settings.JASMIN_TIMEOUT
         
-        self.telnet_connection = None
-        self.is_connected = False
+        # Fixed set of jcli sessions; a command runs on whichever one is idle,
+        # so concurrent callers never interleave on the same connection.
+        # Sessions connect lazily on first use (or all at once in initialize()).
+        self.pool_size = settings.JASMIN_JCLI_POOL_SIZE
+        self._sessions: List[JcliSession] = []
+        self._pool: "asyncio.Queue[JcliSession]" = asyncio.Queue(maxsize=self.pool_size)
+        # One keep-alive HTTP client for the Jasmin HTTP API (created on first use)
+        self._http: Optional[aiohttp.ClientSession] = None
+        # send_sms form fields that never change, encoded once
+        self._send_url = f"http://{self.host}:{self.http_port}/send"
+        self._credentials_qs = urlencode({'username': self.username, 'password': self.password})
         self.last_health_check = None
         
-        # Cache for frequently accessed data
-        self.connectors_cache = {}
-        self.routes_cache = {}
-        self.filters_cache = {}
+        # Cache for frequently accessed data: {key: (monotonic expiry, data)}
+        self._cache: Dict[str, Tuple[float, Any]] = {}
+        self._inflight: Dict[str, asyncio.Task] = {}
         self.cache_ttl = 30  # seconds
+    
+    @property
+    def is_connected(self) -> bool:
+        return any(session.is_connected for session in self._sessions)
         
     async def initialize(self):
         """Initialize Jasmin service"""
@@ -93,105 +230,76 @@ class JasminService:
     
     async def cleanup(self):
         """Cleanup resources"""
-        if self.telnet_connection:
-            try:
-                self.telnet_connection.close()
-            except:
-                pass
-        self.is_connected = False
+        for session in self._sessions:
+            await session.close()
+        if self._http is not None:
+            await self._http.close()
+            self._http = None
         logger.info("Jasmin service cleaned up")
     
+    def _http_session(self) -> aiohttp.ClientSession:
+        if self._http is None or self._http.closed:
+            self._http = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=64, keepalive_timeout=75),
+                timeout=aiohttp.ClientTimeout(total=30)
+            )
+        return self._http
+    
+    def _ensure_pool(self) -> None:
+        if not self._sessions:
+            self._sessions = [
+                JcliSession(self.host, self.telnet_port, self.username, self.password, self.timeout)
+                for _ in range(self.pool_size)
+            ]
+            for session in self._sessions:
+                self._pool.put_nowait(session)
+    
     async def connect_telnet(self) -> bool:
-        """Connect to Jasmin Telnet interface"""
+        """Log in every pooled jcli session that isn't connected yet"""
+        self._ensure_pool()
+        await asyncio.gather(*(
+            session.connect() for session in self._sessions if not session.is_connected
+        ))
+        return self.is_connected
+    
+    @asynccontextmanager
+    async def _acquire(self) -> AsyncIterator[JcliSession]:
+        """Borrow an idle session, (re)connecting it if needed"""
+        self._ensure_pool()
+        session = await self._pool.get()
         try:
-            # Use asyncio to run telnet operations in thread pool
-            loop = asyncio.get_event_loop()
-            
-            # Connect to telnet
-            self.telnet_connection = await loop.run_in_executor(
-                None,
-                lambda: telnetlib.Telnet(self.host, self.telnet_port, self.timeout)
-            )
-            
-            # Login
-            await loop.run_in_executor(
-                None,
-                lambda: self.telnet_connection.read_until(b"Authentication required.\n")
-            )
-            
-            await loop.run_in_executor(
-                None,
-                lambda: self.telnet_connection.write(f"{self.username}\n".encode())
-            )
-            
-            await loop.run_in_executor(
-                None,
-                lambda: self.telnet_connection.read_until(b"Password:")
-            )
-            
-            await loop.run_in_executor(
-                None,
-                lambda: self.telnet_connection.write(f"{self.password}\n".encode())
-            )
-            
-            # Check if login successful
-            response = await loop.run_in_executor(
-                None,
-                lambda: self.telnet_connection.read_until(b"jcli : ", timeout=5)
-            )
-            
-            if b"Welcome to Jasmin" in response:
-                self.is_connected = True
-                logger.info("Successfully connected to Jasmin Telnet interface")
-                return True
-            else:
-                logger.error("Failed to authenticate with Jasmin")
-                return False
-                
-        except Exception as e:
-            logger.error(f"Failed to connect to Jasmin Telnet: {e}")
-            self.is_connected = False
-            return False
+            if not session.is_connected:
+                await session.connect()
+            yield session
+        finally:
+            self._pool.put_nowait(session)
     
     async def execute_command(self, command: str) -> str:
         """Execute command via Telnet and return response"""
-        if not self.is_connected:
-            await self.connect_telnet()
-        
-        try:
-            loop = asyncio.get_event_loop()
-            
-            # Send command
-            await loop.run_in_executor(
-                None,
-                lambda: self.telnet_connection.write(f"{command}\n".encode())
-            )
-            
-            # Read response
-            response = await loop.run_in_executor(
-                None,
-                lambda: self.telnet_connection.read_until(b"jcli : ", timeout=self.timeout)
-            )
-            
-            return response.decode('utf-8').strip()
-            
-        except Exception as e:
-            logger.error(f"Failed to execute command '{command}': {e}")
-            self.is_connected = False
-            raise
+        async with self._acquire() as session:
+            clean = False
+            try:
+                response = await session.execute(command)
+                clean = True
+                return response
+            except Exception as e:
+                logger.error(f"Failed to execute command '{command}': {e}")
+                raise
+            finally:
+                if not clean:
+                    # Failed or cancelled mid-command: the stream may hold a
+                    # partial response, so reconnect on next use
+                    session.abort()
     
     async def health_check(self) -> Dict[str, Any]:
         """Check Jasmin service health"""
         try:
+            # HTTP API probe and stats (jcli) are independent; run them together
+            http_status, stats = await asyncio.gather(self._check_http_api(), self.get_system_stats())
+            
             # Check Telnet connection
             telnet_status = "healthy" if self.is_connected else "disconnected"
             
-            # Check HTTP API
-            http_status = await self._check_http_api()
-            
-            # Get system stats
-            stats = await self.get_system_stats()
-            
             self.last_health_check = datetime.utcnow()
             
             return {
@@ -213,15 +321,14 @@ class JasminService:
     async def _check_http_api(self) -> str:
         """Check HTTP API availability"""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"http://{self.host}:{self.http_port}/status",
-                    timeout=aiohttp.ClientTimeout(total=5)
-                ) as response:
-                    if response.status == 200:
-                        return "healthy"
-                    else:
-                        return f"error_{response.status}"
+            async with self._http_session().get(
+                f"http://{self.host}:{self.http_port}/status",
+                timeout=aiohttp.ClientTimeout(total=5)
+            ) as response:
+                if response.status == 200:
+                    return "healthy"
+                else:
+                    return f"error_{response.status}"
         except Exception as e:
             logger.warning(f"HTTP API check failed: {e}")
             return "unavailable"
@@ -238,43 +345,22 @@ class JasminService:
     def _parse_stats_response(self, response: str) -> Dict[str, Any]:
         """Parse stats command response"""
         stats = {}
-        lines = response.split('\n')
         
-        for line in lines:
-            if ':' in line:
-                key, value = line.split(':', 1)
-                key = key.strip()
-                value = value.strip()
-                
-                # Try to convert to number
-                try:
-                    if '.' in value:
-                        stats[key] = float(value)
-                    else:
-                        stats[key] = int(value)
-                except ValueError:
-                    stats[key] = value
+        for match in _STATS_RE.finditer(response):
+            key = match['k'].strip()
+            if match['f'] is not None:
+                stats[key] = float(match['f'])
+            elif match['i'] is not None:
+                stats[key] = int(match['i'])
+            else:
+                stats[key] = match['v']
         
         return stats
     
     async def get_connectors(self, force_refresh: bool = False) -> List[ConnectorInfo]:
         """Get all SMPP connectors"""
-        cache_key = "connectors"
-        
-        if not force_refresh and self._is_cache_valid(cache_key):
-            return self.connectors_cache[cache_key]["data"]
-        
         try:
-            response = await self.execute_command("smppccm -l")
-            connectors = self._parse_connectors_response(response)
-            
-            # Update cache
-            self.connectors_cache[cache_key] = {
-                "data": connectors,
-                "timestamp": datetime.utcnow()
-            }
-            
-            return connectors
+            return await self._cached_command("smppccm -l", self._parse_connectors_response, force_refresh)
             
         except Exception as e:
             logger.error(f"Failed to get connectors: {e}")
@@ -290,7 +376,7 @@ class JasminService:
                 continue
             
             # Parse connector line (format may vary)
-            match = re.match(r'(\w+)\s+(\w+)\s+(\w+)\s+(.+)', line.strip())
+            match = _CONN_RE.match(line.strip())
             if match:
                 cid, status, session_state, details = match.groups()
                 
@@ -299,12 +385,13 @@ class JasminService:
                 host_port = detail_parts[0] if detail_parts else "unknown:0"
                 host, port = host_port.split(':') if ':' in host_port else (host_port, "0")
                 
+                status = status.lower()
                 connector = ConnectorInfo(
                     cid=cid,
-                    status=ConnectorStatus(status.lower()) if status.lower() in ConnectorStatus.__members__.values() else ConnectorStatus.ERROR,
+                    status=ConnectorStatus(status) if status in _CONNECTOR_STATUS_VALUES else ConnectorStatus.ERROR,
                     session_state=session_state,
                     host=host,
-                    port=int(port) if port.isdigit() else 0,
+                    port=_to_int(port),
                     username=detail_parts[1] if len(detail_parts) > 1 else "unknown",
                     bind_type="transceiver",  # Default
                     throughput=0,
@@ -342,12 +429,9 @@ class JasminService:
     def _parse_connector_status(self, response: str, cid: str) -> Dict[str, Any]:
         """Parse individual connector status response"""
         status = {"cid": cid}
-        lines = response.split('\n')
         
-        for line in lines:
-            if ':' in line:
-                key, value = line.split(':', 1)
-                status[key.strip().lower().replace(' ', '_')] = value.strip()
+        for match in _STATS_RE.finditer(response):
+            status[match['k'].strip().lower().replace(' ', '_')] = match['v']
         
         return status
     
@@ -355,6 +439,7 @@ class JasminService:
         """Start SMPP connector"""
         try:
             response = await self.execute_command(f"smppccm -1 {cid}")
+            self.invalidate("smppccm")
             return "Successfully started" in response
         except Exception as e:
             logger.error(f"Failed to start connector {cid}: {e}")
@@ -364,6 +449,7 @@ class JasminService:
         """Stop SMPP connector"""
         try:
             response = await self.execute_command(f"smppccm -0 {cid}")
+            self.invalidate("smppccm")
             return "Successfully stopped" in response
         except Exception as e:
             logger.error(f"Failed to stop connector {cid}: {e}")
@@ -380,6 +466,7 @@ class JasminService:
                 cmd += f" --{key} {value}"
             
             response = await self.execute_command(cmd)
+            self.invalidate("smppccm")
             return "Successfully added" in response
             
         except Exception as e:
@@ -388,22 +475,8 @@ class JasminService:
     
     async def get_routes(self, force_refresh: bool = False) -> List[RouteInfo]:
         """Get routing configuration"""
-        cache_key = "routes"
-        
-        if not force_refresh and self._is_cache_valid(cache_key):
-            return self.routes_cache[cache_key]["data"]
-        
         try:
-            response = await self.execute_command("mtrouter -l")
-            routes = self._parse_routes_response(response)
-            
-            # Update cache
-            self.routes_cache[cache_key] = {
-                "data": routes,
-                "timestamp": datetime.utcnow()
-            }
-            
-            return routes
+            return await self._cached_command("mtrouter -l", self._parse_routes_response, force_refresh)
             
         except Exception as e:
             logger.error(f"Failed to get routes: {e}")
@@ -412,20 +485,16 @@ class JasminService:
     def _parse_routes_response(self, response: str) -> List[RouteInfo]:
         """Parse routes list response"""
         routes = []
-        lines = response.split('\n')
         
-        for line in lines:
-            if line.startswith('#') or not line.strip():
-                continue
-            
+        for match in _ROUTE_LINE_RE.finditer(response):
             # Parse route line
-            parts = line.strip().split()
+            parts = match.group(1).split()
             if len(parts) >= 4:
                 route = RouteInfo(
-                    order=int(parts[0]) if parts[0].isdigit() else 0,
+                    order=_to_int(parts[0]),
                     type=parts[1],
                     connector_id=parts[2],
-                    rate=float(parts[3]) if parts[3].replace('.', '').isdigit() else 0.0,
+                    rate=_to_float(parts[3]),
                     filters=parts[4:] if len(parts) > 4 else [],
                     description=" ".join(parts[4:]) if len(parts) > 4 else ""
                 )
@@ -437,8 +506,8 @@ class JasminService:
         """Get real-time metrics for dashboard"""
         try:
             # Get various metrics
-            stats = await self.get_system_stats()
-            connectors = await self.get_connectors()
+            # Two jcli commands, each on its own pooled session
+            stats, connectors = await asyncio.gather(self.get_system_stats(), self.get_connectors())
             
             # Calculate aggregated metrics
             total_connectors = len(connectors)
@@ -475,39 +544,78 @@ class JasminService:
                 "error": str(e)
             }
     
-    def _is_cache_valid(self, cache_key: str) -> bool:
-        """Check if cache is still valid"""
-        if cache_key not in self.connectors_cache:
-            return False
+    def _cache_get(self, key: str) -> Optional[Any]:
+        """Cached result for a jcli command, or None if missing/expired"""
+        entry = self._cache.get(key)
+        return entry[1] if entry and entry[0] > time.monotonic() else None
+    
+    def _cache_put(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        self._cache[key] = (time.monotonic() + (ttl or self.cache_ttl), value)
+    
+    def invalidate(self, prefix: str = "") -> None:
+        """Drop cached results of jcli commands starting with ``prefix`` (all by default)"""
+        for key in [key for key in self._cache if key.startswith(prefix)]:
+            del self._cache[key]
+        # Results of fetches already in flight may predate the write; don't cache them
+        for key in [key for key in self._inflight if key.startswith(prefix)]:
+            del self._inflight[key]
+    
+    async def _cached_command(self, command: str, parse: Callable[[str], Any], force_refresh: bool = False) -> Any:
+        """Run a read-only jcli command through the cache
         
-        cache_time = self.connectors_cache[cache_key]["timestamp"]
-        return (datetime.utcnow() - cache_time).seconds < self.cache_ttl
+        Concurrent misses for the same command share one in-flight fetch
+        instead of each sending it to Jasmin.
+        """
+        if not force_refresh:
+            cached = self._cache_get(command)
+            if cached is not None:
+                return cached
+        
+        task = self._inflight.get(command)
+        if task is None:
+            task = asyncio.create_task(self._fetch_command(command, parse))
+            self._inflight[command] = task
+            task.add_done_callback(
+                lambda done: self._inflight.pop(command) if self._inflight.get(command) is done else None
+            )
+        # shield: one caller being cancelled mustn't cancel the fetch for the others
+        return await asyncio.shield(task)
     
-    async def send_sms(self, source: str, destination: str, content: str) -> Dict[str, Any]:
-        """Send SMS via HTTP API"""
+    async def _fetch_command(self, command: str, parse: Callable[[str], Any]) -> Any:
+        result = parse(await self.execute_command(command))
+        if self._inflight.get(command) is asyncio.current_task():
+            self._cache_put(command, result)
+        return result
+    
+    async def send_sms(
+        self, source: str, destination: str, content: str, dlr_url: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Send SMS via HTTP API
+        
+        With ``dlr_url`` Jasmin POSTs submit and delivery receipts there
+        (see the /webhooks/jasmin/dlr endpoint).
+        """
         try:
-            async with aiohttp.ClientSession() as session:
-                data = {
-                    'username': self.username,
-                    'password': self.password,
-                    'to': destination,
-                    'from': source,
-                    'content': content
-                }
+            body = (
+                f"{self._credentials_qs}&to={quote_plus(destination)}"
+                f"&from={quote_plus(source)}&content={quote_plus(content)}"
+            )
+            if dlr_url:
+                body += f"&dlr=yes&dlr-level=3&dlr-method=POST&dlr-url={quote_plus(dlr_url)}"
+            
+            async with self._http_session().post(
+                self._send_url,
+                data=body.encode(),
+                headers=_FORM_HEADERS
+            ) as response:
+                result = await response.text()
                 
-                async with session.post(
-                    f"http://{self.host}:{self.http_port}/send",
-                    data=data,
-                    timeout=aiohttp.ClientTimeout(total=30)
-                ) as response:
-                    result = await response.text()
-                    
-                    return {
-                        "success": response.status == 200,
-                        "status_code": response.status,
-                        "response": result,
-                        "message_id": self._extract_message_id(result) if response.status == 200 else None
-                    }
+                return {
+                    "success": response.status == 200,
+                    "status_code": response.status,
+                    "response": result,
+                    "message_id": self._extract_message_id(result) if response.status == 200 else None
+                }
                     
         except Exception as e:
             logger.error(f"Failed to send SMS: {e}")
@@ -520,5 +628,5 @@ class JasminService:
         """Extract message ID from response"""
         # Parse response to extract message ID
         # Format may vary depending on Jasmin version
-        match = re.search(r'Message ID:\s*(\w+)', response)
+        match = _MSGID_RE.search(response)
         return match.group(1) if match else None
\ No newline at end of file
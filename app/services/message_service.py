@@ -0,0 +1,329 @@
+"""
+Message persistence helpers for high-volume status and DLR updates
+"""
+
+import asyncio
+import logging
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from sqlalchemy import cast, column, func, insert, update, values
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.bulk import copy_rows
+from app.core.database import SessionLocal
+from app.core.ids import uuid4_batch
+from app.models.message import DeliveryReport, Message, MessageDetails, MessageQueue, MessageStatus
+
+logger = logging.getLogger(__name__)
+
+# Columns a status/DLR update may set; anything omitted keeps its current value
+STATUS_FIELDS = (
+    "status",
+    "sent_at",
+    "delivered_at",
+    "failed_at",
+    "gateway_message_id",
+    "dlr_status",
+    "dlr_received_at",
+    "dlr_error_code",
+    "error_code",
+)
+# Free-text fields stored in the message_details sidecar table
+DETAIL_FIELDS = (
+    "error_message",
+    "dlr_error_message",
+)
+
+
+def coalesce_status_updates(updates: Iterable[Dict[str, Any]]) -> Dict[uuid.UUID, Dict[str, Any]]:
+    """Merge updates per message id; later values win"""
+    merged: Dict[uuid.UUID, Dict[str, Any]] = {}
+    for item in updates:
+        message_id = item["id"]
+        if not isinstance(message_id, uuid.UUID):
+            message_id = uuid.UUID(str(message_id))
+        fields = merged.setdefault(message_id, {})
+        fields.update(
+            (key, value) for key, value in item.items()
+            if key in STATUS_FIELDS or key in DETAIL_FIELDS
+        )
+    return merged
+
+
+# Jasmin DLR message_status -> Message.status; level 1 reports carry ESME_* codes
+_DLR_STATUSES = {
+    "ESME_ROK": MessageStatus.SENT,
+    "ACCEPTD": MessageStatus.SENT,
+    "ENROUTE": MessageStatus.SENT,
+    "DELIVRD": MessageStatus.DELIVERED,
+    "EXPIRED": MessageStatus.EXPIRED,
+    "DELETED": MessageStatus.FAILED,
+    "UNDELIV": MessageStatus.FAILED,
+    "REJECTD": MessageStatus.REJECTED,
+    "UNKNOWN": MessageStatus.UNKNOWN,
+}
+
+
+def _dlr_date(value: Optional[str]) -> Optional[datetime]:
+    """Parse a DLR submit/done date (YYMMDDhhmm); None if absent or malformed"""
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, "%y%m%d%H%M")
+    except ValueError:
+        return None
+
+
+def parse_jasmin_dlr(
+    message_id: uuid.UUID,
+    params: Mapping[str, str]
+) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+    """Turn one Jasmin DLR callback into a status update and a DeliveryReport row
+
+    ``params`` are the callback fields (id, message_status, level, err, ...).
+    Level 1 reports (SMSC submit acknowledgements) only update the message;
+    level 2/3 reports are also stored as a DeliveryReport.
+    """
+    now = datetime.utcnow()
+    dlr_status = params.get("message_status", "")
+    err = (params.get("err") or "")[:10] or None
+    status = _DLR_STATUSES.get(dlr_status)
+    if status is None:
+        status = MessageStatus.FAILED if dlr_status.startswith("ESME_") else MessageStatus.UNKNOWN
+
+    update_data: Dict[str, Any] = {"id": message_id, "status": status}
+    if params.get("id"):
+        update_data["gateway_message_id"] = params["id"]
+    if status == MessageStatus.SENT:
+        update_data["sent_at"] = now
+    elif status == MessageStatus.DELIVERED:
+        update_data["delivered_at"] = _dlr_date(params.get("donedate")) or now
+    elif status in (MessageStatus.FAILED, MessageStatus.REJECTED, MessageStatus.EXPIRED):
+        update_data["failed_at"] = now
+        update_data["error_code"] = err or dlr_status[:20]
+
+    if params.get("level") == "1":
+        return update_data, None
+
+    update_data.update(
+        dlr_status=dlr_status[:20],
+        dlr_received_at=now,
+        dlr_error_code=err,
+    )
+    report = {
+        "message_id": message_id,
+        "dlr_status": dlr_status[:20],
+        "dlr_error": err,
+        "dlr_text": (params.get("text") or "")[:255] or None,
+        "gateway_message_id": params.get("id", ""),
+        "connector_id": params.get("connector"),
+        "submit_date": _dlr_date(params.get("subdate")),
+        "done_date": _dlr_date(params.get("donedate")),
+        "received_at": now,
+        "raw_dlr": dict(params),
+    }
+    return update_data, report
+
+
+class MessageService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def enqueue(
+        self,
+        queue_name: str,
+        items: Iterable[Dict[str, Any]],
+        priority: int = 0,
+        campaign_id: Optional[uuid.UUID] = None,
+        scheduled_at: Optional[datetime] = None,
+        use_copy: bool = False
+    ) -> int:
+        """Add ``message_data`` payloads to a queue in one executemany INSERT
+
+        With ``use_copy`` the rows are streamed with binary COPY instead.
+        Without ``scheduled_at`` entries get the column's now() default.
+        """
+        items = list(items)
+        rows = [
+            {
+                "id": entry_id,
+                "queue_name": queue_name,
+                "priority": priority,
+                "message_data": message_data,
+                "campaign_id": campaign_id,
+            }
+            for entry_id, message_data in zip(uuid4_batch(len(items)), items)
+        ]
+        if scheduled_at is not None:
+            for row in rows:
+                row["scheduled_at"] = scheduled_at
+        if not rows:
+            return 0
+        if use_copy:
+            return await copy_rows(self.db, MessageQueue.__table__, rows)
+        await self.db.execute(insert(MessageQueue), rows)
+        return len(rows)
+
+    async def record_delivery_reports(self, rows: List[Dict[str, Any]]) -> int:
+        """Store a batch of raw DLRs (DeliveryReport column dicts)"""
+        if rows:
+            await self.db.execute(
+                insert(DeliveryReport),
+                [{"id": report_id, **row} for report_id, row in zip(uuid4_batch(len(rows)), rows)]
+            )
+        return len(rows)
+
+    async def bulk_apply_status(self, updates: Iterable[Dict[str, Any]]) -> int:
+        """Apply a batch of status/DLR updates with one UPDATE ... FROM (VALUES ...)
+
+        Each update is a dict with the message ``id`` plus any of
+        ``STATUS_FIELDS``/``DETAIL_FIELDS``; the latter are upserted into
+        ``message_details`` with one more statement. Returns the number of
+        distinct messages targeted.
+        """
+        merged = coalesce_status_updates(updates)
+        if not merged:
+            return 0
+
+        fields = [name for name in STATUS_FIELDS if any(name in item for item in merged.values())]
+        if fields:
+            table = Message.__table__
+            batch = values(
+                column("id", table.c.id.type),
+                *(column(name, table.c[name].type) for name in fields),
+                name="status_updates"
+            ).data([
+                (message_id, *(item.get(name) for name in fields))
+                for message_id, item in merged.items()
+            ])
+            # NULL cells render untyped, so cast each one back to its column type
+            # and fall back to the stored value when the update omitted a field
+            await self.db.execute(
+                update(Message)
+                .where(Message.id == cast(batch.c.id, table.c.id.type))
+                .values(**{
+                    name: func.coalesce(cast(batch.c[name], table.c[name].type), getattr(Message, name))
+                    for name in fields
+                })
+            )
+
+        details = [
+            {"message_id": message_id, **{name: item.get(name) for name in DETAIL_FIELDS}}
+            for message_id, item in merged.items()
+            if any(name in item for name in DETAIL_FIELDS)
+        ]
+        if details:
+            stmt = pg_insert(MessageDetails)
+            await self.db.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[MessageDetails.message_id],
+                    set_={
+                        name: func.coalesce(stmt.excluded[name], getattr(MessageDetails, name))
+                        for name in DETAIL_FIELDS
+                    }
+                ),
+                details
+            )
+        return len(merged)
+
+
+class StatusUpdateBuffer:
+    """Collect DLR/status callbacks and write them in batches
+
+    Callers ``submit`` updates without touching the database; a background
+    task flushes them every ``interval`` seconds or as soon as ``max_batch``
+    updates are waiting. A batch whose write fails is retried with
+    exponential backoff, up to ``max_attempts`` times.
+    """
+
+    def __init__(self, max_batch: int = 1000, interval: float = 1.0,
+                 max_attempts: int = 5, retry_delay: float = 0.5):
+        self.max_batch = max_batch
+        self.interval = interval
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self._queue: "asyncio.Queue[Tuple[Dict[str, Any], Optional[Dict[str, Any]]]]" = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+
+    def submit(self, update_data: Dict[str, Any], report: Optional[Dict[str, Any]] = None) -> None:
+        """Queue one status update (a dict with ``id`` plus ``STATUS_FIELDS``)
+
+        ``report`` is an optional DeliveryReport row written in the same batch.
+        """
+        self._queue.put_nowait((update_data, report))
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background task and write whatever is still queued"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        while not self._queue.empty():
+            await self._flush(self._drain([]))
+
+    def _drain(self, batch: List[Tuple]) -> List[Tuple]:
+        """Top ``batch`` up with whatever is already queued"""
+        while len(batch) < self.max_batch and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        return batch
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            first = await self._queue.get()
+            deadline = loop.time() + self.interval
+            batch = self._drain([first])
+            try:
+                while len(batch) < self.max_batch:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                    except asyncio.TimeoutError:
+                        break
+                    self._drain(batch)
+                await self._flush(batch)
+            except asyncio.CancelledError:
+                # Hand the unwritten batch back so stop() can flush it
+                for item in batch:
+                    self._queue.put_nowait(item)
+                raise
+
+    async def _flush(self, batch: List[Tuple]) -> None:
+        if not batch:
+            return
+        updates = [update_data for update_data, _ in batch]
+        reports = [report for _, report in batch if report is not None]
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                async with SessionLocal() as session:
+                    service = MessageService(session)
+                    count = await service.bulk_apply_status(updates)
+                    await service.record_delivery_reports(reports)
+                    await session.commit()
+                logger.debug(f"Applied {count} message status updates and {len(reports)} DLRs")
+                return
+            except Exception as e:
+                if attempt == self.max_attempts:
+                    logger.error(
+                        f"Dropping {len(batch)} message status updates after {attempt} attempts: {e}; "
+                        f"message ids: {sorted({str(update_data['id']) for update_data in updates})}"
+                    )
+                    return
+                delay = self.retry_delay * 2 ** (attempt - 1)
+                logger.warning(f"Error applying {len(batch)} message status updates, retrying in {delay}s: {e}")
+                await asyncio.sleep(delay)
+
+
+status_update_buffer = StatusUpdateBuffer()
@@ -5,10 +5,16 @@ Metrics service for real-time dashboard metrics
 import asyncio
 import logging
 import random
-from datetime import datetime, timedelta
-from typing import Dict, Any, Optional
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from types import MappingProxyType
+from typing import Deque, Dict, Any, List, Mapping, Optional
 import json
 
+import numpy as np
+import orjson
+
 logger = logging.getLogger(__name__)
 
 class MetricsService:
@@ -17,7 +23,15 @@ class MetricsService:
     def __init__(self):
         self.is_running = False
         self._metrics_cache: Dict[str, Any] = {}
+        # Read-only view rebuilt once per update and handed to every reader
+        self._snapshot: Mapping[str, Any] = MappingProxyType({})
+        # The same snapshot pre-encoded for HTTP/WebSocket responses
+        self._json_blob: bytes = b"{}"
         self._update_task: Optional[asyncio.Task] = None
+        # Last 24 hourly chart buckets; only the current hour changes per tick
+        self._hourly: Deque[Dict[str, Any]] = deque(maxlen=24)
+        self._hourly_current: Optional[datetime] = None
+        self._rng = np.random.default_rng()
         logger.info("MetricsService initialized")
     
     async def start(self):
@@ -42,15 +56,27 @@ class MetricsService:
     
     async def _update_metrics_loop(self):
         """Background task to update metrics"""
+        # Ticks follow a monotonic schedule so collection time doesn't add drift
+        interval = 30  # Update every 30 seconds
+        next_tick = time.monotonic()
         while self.is_running:
             try:
                 await self._collect_metrics()
-                await asyncio.sleep(30)  # Update every 30 seconds
+                next_tick += interval
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 logger.error(f"Error updating metrics: {e}")
-                await asyncio.sleep(60)  # Wait longer on error
+                next_tick += 2 * interval  # Wait longer on error
+            
+            now = time.monotonic()
+            if next_tick < now:
+                # Overran: skip the missed ticks rather than running them back to back
+                next_tick += ((now - next_tick) // interval + 1) * interval
+            try:
+                await asyncio.sleep(next_tick - now)
+            except asyncio.CancelledError:
+                break
     
     async def _collect_metrics(self):
         """Collect current metrics"""
@@ -58,7 +84,8 @@ class MetricsService:
             # Simulate real metrics collection
             # In production, this would query the database and external services
             
-            now = datetime.utcnow()
+            now = datetime.now(timezone.utc)
+            now_iso = now.isoformat()
             
             # Dashboard metrics
             self._metrics_cache.update({
@@ -69,7 +96,7 @@ class MetricsService:
                     "active_campaigns": random.randint(5, 25),
                     "active_connectors": random.randint(2, 8),
                     "credit_balance": round(random.uniform(1000.0, 10000.0), 2),
-                    "last_updated": now.isoformat()
+                    "last_updated": now_iso
                 },
                 
                 # Real-time stats
@@ -78,7 +105,7 @@ class MetricsService:
                     "active_sessions": random.randint(5, 50),
                     "queue_size": random.randint(0, 500),
                     "error_rate": round(random.uniform(0.1, 5.0), 2),
-                    "last_updated": now.isoformat()
+                    "last_updated": now_iso
                 },
                 
                 # Campaign metrics
@@ -87,7 +114,7 @@ class MetricsService:
                     "active_campaigns": random.randint(5, 25),
                     "completed_today": random.randint(2, 10),
                     "success_rate": round(random.uniform(80.0, 95.0), 2),
-                    "last_updated": now.isoformat()
+                    "last_updated": now_iso
                 },
                 
                 # Connector metrics
@@ -96,7 +123,7 @@ class MetricsService:
                     "active_connectors": random.randint(2, 8),
                     "connected_connectors": random.randint(1, 6),
                     "avg_response_time": random.randint(50, 300),
-                    "last_updated": now.isoformat()
+                    "last_updated": now_iso
                 },
                 
                 # System metrics
@@ -105,28 +132,47 @@ class MetricsService:
                     "memory_usage": round(random.uniform(30.0, 90.0), 1),
                     "disk_usage": round(random.uniform(20.0, 70.0), 1),
                     "uptime_hours": random.randint(1, 720),
-                    "last_updated": now.isoformat()
+                    "last_updated": now_iso
                 }
             })
             
-            # Generate hourly data for charts
-            hourly_data = []
-            for i in range(24):
-                hour_time = now - timedelta(hours=23-i)
-                hourly_data.append({
-                    "hour": hour_time.strftime("%H:00"),
-                    "messages": random.randint(50, 500),
-                    "delivered": random.randint(40, 480),
-                    "failed": random.randint(0, 20)
-                })
-            
-            self._metrics_cache["hourly_stats"] = hourly_data
+            self._update_hourly(now)
+            self._metrics_cache["hourly_stats"] = list(self._hourly)
+            self._snapshot = MappingProxyType(dict(self._metrics_cache))
+            self._json_blob = orjson.dumps(self._metrics_cache, option=orjson.OPT_NON_STR_KEYS)
             
             logger.debug("Metrics updated successfully")
             
         except Exception as e:
             logger.error(f"Error collecting metrics: {e}")
     
+    def _update_hourly(self, now: datetime):
+        """Refresh the current hour's chart bucket, appending any hours that rolled over"""
+        current = now.replace(minute=0, second=0, microsecond=0)
+        if self._hourly_current is None:
+            new_hours = 24
+        else:
+            new_hours = min(int((current - self._hourly_current).total_seconds() // 3600), 24)
+        
+        if new_hours <= 0:
+            self._hourly[-1] = self._hourly_buckets([current])[0]
+        else:
+            self._hourly.extend(self._hourly_buckets([
+                current - timedelta(hours=i) for i in range(new_hours - 1, -1, -1)
+            ]))
+        self._hourly_current = current
+    
+    def _hourly_buckets(self, hours: List[datetime]) -> List[Dict[str, Any]]:
+        """Chart data for the hours starting at ``hours``, sampled in one draw per series"""
+        size = len(hours)
+        messages = self._rng.integers(50, 500, size=size, endpoint=True).tolist()
+        delivered = self._rng.integers(40, 480, size=size, endpoint=True).tolist()
+        failed = self._rng.integers(0, 20, size=size, endpoint=True).tolist()
+        return [
+            {"hour": hour_time.strftime("%H:00"), "messages": m, "delivered": d, "failed": f}
+            for hour_time, m, d, f in zip(hours, messages, delivered, failed)
+        ]
+    
     def get_dashboard_metrics(self) -> Dict[str, Any]:
         """Get dashboard metrics"""
         return self._metrics_cache.get("dashboard", {})
@@ -151,9 +197,13 @@ class MetricsService:
         """Get hourly statistics"""
         return self._metrics_cache.get("hourly_stats", [])
     
-    def get_all_metrics(self) -> Dict[str, Any]:
-        """Get all cached metrics"""
-        return self._metrics_cache.copy()
+    def get_all_metrics(self) -> Mapping[str, Any]:
+        """Get all cached metrics (read-only; replaced, never mutated, on update)"""
+        return self._snapshot
+    
+    def get_all_metrics_json(self) -> bytes:
+        """All cached metrics as JSON, encoded once per update"""
+        return self._json_blob
     
     async def record_message_sent(self, campaign_id: str, connector_id: str):
         """Record a message sent event"""
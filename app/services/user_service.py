@@ -1,4 +1,6 @@
+from sqlalchemy import or_, select
 from sqlalchemy.orm import Session
+from app.core.security import verify_password_async
 from app.models.user import User
 from app.schemas.auth import UserCreate
 
@@ -13,3 +15,24 @@ class UserService:
     async def create_user(self, user_in: UserCreate) -> User:
         # Logic to create a new user will go here
         pass
+
+    async def authenticate_user(self, username: str, password: str) -> User | None:
+        """Check credentials (username or email); hashing runs off the event loop"""
+        # One user's email can equal another's username: prefer the username match
+        result = await self.db.execute(
+            select(User)
+            .where(or_(User.username == username, User.email == username))
+            .order_by((User.username == username).desc())
+            .limit(1)
+        )
+        user = result.scalars().first()
+        if user is None:
+            return None
+
+        valid, new_hash = await verify_password_async(password, user.hashed_password)
+        if not valid:
+            return None
+        if new_hash:
+            # Transparently upgrade legacy bcrypt hashes to argon2
+            user.hashed_password = new_hash
+        return user
@@ -3,6 +3,7 @@ Celery tasks for background processing
 """
 
 from celery import Celery
+from kombu import Queue
 from app.core.config import settings
 
 # Create Celery app
@@ -30,8 +31,23 @@ celery_app.conf.update(
     task_track_started=True,
     task_time_limit=30 * 60,  # 30 minutes
     task_soft_time_limit=25 * 60,  # 25 minutes
+    # Tasks here are long and I/O-bound: reserve one at a time so short
+    # control tasks aren't stuck behind a campaign in a worker's prefetch
     worker_prefetch_multiplier=1,
     worker_max_tasks_per_child=1000,
+    # Acknowledge after completion so a lost worker's task is redelivered
+    task_acks_late=True,
+    task_reject_on_worker_lost=True,
+    worker_cancel_long_running_tasks_on_connection_loss=True,
+    # Campaign pause/resume/cancel get their own queue; workers consume every
+    # queue below unless started with -Q, e.g. a dedicated "-Q control" worker
+    task_default_queue="celery",
+    task_queues=(Queue("celery"), Queue("control")),
+    task_routes={
+        "app.tasks.campaign_tasks.pause_campaign": {"queue": "control"},
+        "app.tasks.campaign_tasks.resume_campaign": {"queue": "control"},
+        "app.tasks.campaign_tasks.cancel_campaign": {"queue": "control"},
+    },
 )
 
 # Periodic tasks configuration
@@ -72,6 +88,21 @@ celery_app.conf.beat_schedule = {
         'schedule': 86400.0,  # Daily
     },
     
+    'create-partitions': {
+        'task': 'app.tasks.maintenance_tasks.create_partitions',
+        'schedule': 86400.0,  # Daily
+    },
+
+    'drop-expired-partitions': {
+        'task': 'app.tasks.maintenance_tasks.drop_expired_partitions',
+        'schedule': 86400.0,  # Daily
+    },
+
+    'refresh-contact-segments': {
+        'task': 'app.tasks.maintenance_tasks.refresh_contact_segments',
+        'schedule': 3600.0,  # Every hour
+    },
+    
     # WebSocket connection cleanup
     'cleanup-websocket-connections': {
         'task': 'app.tasks.maintenance_tasks.cleanup_websocket_connections',
@@ -3,63 +3,126 @@ Celery tasks for campaign processing
 """
 
 import asyncio
+import re
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple
 from celery import current_task
-from sqlalchemy import select, update
+from dateutil.relativedelta import relativedelta
+from sqlalchemy import Row, func, insert, select, true, update
 from sqlalchemy.ext.asyncio import AsyncSession
 import uuid
 import logging
 
 from app.tasks import celery_app
-from app.core.database import AsyncSessionLocal
+from app.tasks.event_loop import run_async
+from app.core.database import SessionLocal
+from app.core.bulk import copy_rows
+from app.core.money import from_micros
 from app.models.campaign import Campaign, CampaignStatus, CampaignContact
-from app.models.contact import Contact
-from app.models.message import Message, MessageStatus, MessageQueue
+from app.models.contact import Contact, ContactListMembership, ContactStatus, compile_segment_rules
+from app.models.message import ClickEvent, Message, MessageStatus, MessageQueue, QueueStatus
 from app.models.user import User
 from app.services.jasmin_service import JasminService
-from app.websocket.manager import ConnectionManager
+from app.services.message_service import MessageService
+from app.websocket.manager import channel_manager
 from app.services.billing_service import BillingService
 
 logger = logging.getLogger(__name__)
 
+# Campaign batches at least this large are queued with COPY instead of INSERT
+COPY_MIN_BATCH = 1000
+# Scheduled campaigns started at the same time, each with its own DB connection
+CAMPAIGN_START_CONCURRENCY = 8
+# Contacts fetched and queued per round trip when starting a campaign
+CONTACT_BATCH_SIZE = 10000
+
+# The only contact columns personalization reads; selected as plain rows
+# instead of full Contact instances
+CONTACT_COLUMNS = (
+    Contact.id,
+    Contact.phone_number,
+    Contact.first_name,
+    Contact.last_name,
+    Contact.company,
+    Contact.custom_fields,
+    Contact.computed_display_name.label("display_name"),
+)
+
 @celery_app.task(bind=True)
 def process_scheduled_campaigns(self):
     """Process campaigns scheduled to start"""
-    return asyncio.run(_process_scheduled_campaigns_async(self))
+    return run_async(_process_scheduled_campaigns_async(self))
 
 async def _process_scheduled_campaigns_async(task):
-    """Async implementation of scheduled campaign processing"""
-    async with AsyncSessionLocal() as db:
-        try:
-            # Get campaigns scheduled to start
-            now = datetime.utcnow()
+    """Async implementation of scheduled campaign processing
+    
+    Campaigns are started concurrently, each in its own session (sessions
+    are not safe to share between tasks), at most
+    CAMPAIGN_START_CONCURRENCY at a time. One failing campaign does not
+    abort the others.
+    """
+    try:
+        # Get campaigns scheduled to start
+        now = datetime.utcnow()
+        async with SessionLocal() as db:
             result = await db.execute(
-                select(Campaign)
+                select(Campaign.id)
                 .where(Campaign.status == CampaignStatus.SCHEDULED)
                 .where(Campaign.scheduled_at <= now)
             )
-            campaigns = result.scalars().all()
-            
-            processed_count = 0
-            for campaign in campaigns:
-                try:
-                    await _start_campaign(db, campaign)
-                    processed_count += 1
-                    logger.info(f"Started campaign {campaign.id}")
-                    
-                except Exception as e:
-                    logger.error(f"Failed to start campaign {campaign.id}: {e}")
-                    campaign.status = CampaignStatus.FAILED
-                    await db.commit()
-            
-            await db.commit()
-            return f"Processed {processed_count} scheduled campaigns"
-            
-        except Exception as e:
-            logger.error(f"Error processing scheduled campaigns: {e}")
-            await db.rollback()
-            raise
+            campaign_ids = result.scalars().all()
+        
+        semaphore = asyncio.Semaphore(CAMPAIGN_START_CONCURRENCY)
+        outcomes = await asyncio.gather(
+            *(_start_scheduled_campaign(semaphore, campaign_id) for campaign_id in campaign_ids),
+            return_exceptions=True
+        )
+        
+        processed_count = 0
+        failed_ids = []
+        for campaign_id, outcome in zip(campaign_ids, outcomes):
+            if isinstance(outcome, BaseException):
+                logger.error(f"Failed to start campaign {campaign_id}: {outcome}")
+                failed_ids.append(campaign_id)
+            elif outcome:
+                processed_count += 1
+                logger.info(f"Started campaign {campaign_id}")
+        
+        if failed_ids:
+            # Batches queued by a failed campaign were rolled back with its session
+            async with SessionLocal() as db:
+                await db.execute(
+                    update(Campaign)
+                    .where(Campaign.id.in_(failed_ids))
+                    .values(status=CampaignStatus.FAILED)
+                )
+                await db.commit()
+        
+        return f"Processed {processed_count} scheduled campaigns"
+        
+    except Exception as e:
+        logger.error(f"Error processing scheduled campaigns: {e}")
+        raise
+
+async def _start_scheduled_campaign(semaphore: asyncio.Semaphore, campaign_id: uuid.UUID) -> bool:
+    """Start one scheduled campaign in its own session
+    
+    Returns False if the campaign was already picked up elsewhere.
+    """
+    async with semaphore:
+        async with SessionLocal() as db:
+            result = await db.execute(
+                select(Campaign)
+                .where(Campaign.id == campaign_id)
+                .where(Campaign.status == CampaignStatus.SCHEDULED)
+                .with_for_update(skip_locked=True)
+            )
+            campaign = result.scalar_one_or_none()
+            if campaign is None:
+                return False
+            await _start_campaign(db, campaign)
+            return True
 
 async def _start_campaign(db: AsyncSession, campaign: Campaign):
     """Start a campaign by creating message queue entries"""
@@ -70,7 +133,7 @@ async def _start_campaign(db: AsyncSession, campaign: Campaign):
     # Get campaign contacts
     if campaign.contact_list_ids:
         # Get contacts from specified lists
-        contacts_query = select(Contact).join(
+        contacts_query = select(*CONTACT_COLUMNS).select_from(Contact).join(
             ContactListMembership
         ).where(
             ContactListMembership.contact_list_id.in_(campaign.contact_list_ids)
@@ -81,7 +144,7 @@ async def _start_campaign(db: AsyncSession, campaign: Campaign):
         )
     else:
         # Get all user contacts if no specific lists
-        contacts_query = select(Contact).where(
+        contacts_query = select(*CONTACT_COLUMNS).where(
             Contact.user_id == campaign.user_id
         ).where(
             Contact.status == ContactStatus.ACTIVE
@@ -93,24 +156,22 @@ async def _start_campaign(db: AsyncSession, campaign: Campaign):
     if campaign.contact_filter:
         contacts_query = _apply_contact_filters(contacts_query, campaign.contact_filter)
     
-    result = await db.execute(contacts_query)
-    contacts = result.scalars().all()
+    # Stream plain rows from a server-side cursor, one batch at a time, so
+    # memory stays flat however many contacts the campaign targets
+    total_recipients = 0
+    result = await db.stream(contacts_query.execution_options(yield_per=CONTACT_BATCH_SIZE))
+    async for batch_contacts in result.partitions():
+        await _queue_campaign_messages(db, campaign, batch_contacts)
+        total_recipients += len(batch_contacts)
     
     # Update estimated recipients
-    campaign.total_recipients = len(contacts)
-    campaign.estimated_recipients = len(contacts)
-    
-    # Create campaign contacts and queue messages
-    batch_size = 1000
-    for i in range(0, len(contacts), batch_size):
-        batch_contacts = contacts[i:i + batch_size]
-        await _queue_campaign_messages(db, campaign, batch_contacts)
+    campaign.total_recipients = total_recipients
+    campaign.estimated_recipients = total_recipients
     
     await db.commit()
     
     # Send WebSocket update
-    connection_manager = ConnectionManager()
-    await connection_manager.send_campaign_update(
+    await channel_manager.send_campaign_update(
         str(campaign.id),
         "running",
         {
@@ -120,112 +181,128 @@ async def _start_campaign(db: AsyncSession, campaign: Campaign):
     )
 
 def _apply_contact_filters(query, filters: Dict[str, Any]):
-    """Apply dynamic filters to contact query"""
-    # This is a simplified implementation
-    # In production, you'd want a more sophisticated filter system
+    """Apply dynamic filters to contact query
     
-    for field, condition in filters.items():
-        if field == "tags" and "contains" in condition:
-            query = query.where(Contact.tags.contains(condition["contains"]))
-        elif field == "country" and "equals" in condition:
-            query = query.where(Contact.country == condition["equals"])
-        elif field == "custom_fields" and "contains" in condition:
-            for key, value in condition["contains"].items():
-                query = query.where(Contact.custom_fields[key].astext == value)
-    
-    return query
+    Filters use the segment rules format; the WHERE clause is built once per
+    distinct filter document and reused by every later run (e.g. recurring
+    executions of the same campaign).
+    """
+    return query.where(compile_segment_rules(filters))
 
-async def _queue_campaign_messages(db: AsyncSession, campaign: Campaign, contacts: List[Contact]):
-    """Queue messages for a batch of contacts"""
-    message_entries = []
+async def _queue_campaign_messages(db: AsyncSession, campaign: Campaign, contacts: List[Row]):
+    """Queue messages for a batch of contact rows (see CONTACT_COLUMNS)
+    
+    Rows go out as one executemany INSERT per table (batched by
+    insertmanyvalues), or as binary COPY for large batches, never as one ORM
+    INSERT per row. Nothing is committed here: _start_campaign commits the
+    whole campaign once.
+    """
+    now_iso = datetime.utcnow().isoformat()
+    campaign_id = str(campaign.id)
+    user_id = str(campaign.user_id)
     
+    campaign_contacts = []
+    payloads = []
     for contact in contacts:
-        # Create campaign contact association
-        campaign_contact = CampaignContact(
-            campaign_id=campaign.id,
-            contact_id=contact.id,
-            personalized_message=_personalize_message(campaign.message_content, contact),
-            personalization_data=_get_personalization_data(contact)
-        )
-        db.add(campaign_contact)
+        personalized_message = _personalize_message(campaign.message_content, contact)
+        
+        # Campaign contact association; the rendered body is only stored in
+        # the queue entry that sends it
+        campaign_contacts.append({
+            "campaign_id": campaign.id,
+            "contact_id": contact.id
+        })
         
-        # Create message queue entry
-        message_data = {
-            "campaign_id": str(campaign.id),
+        # Message queue payload
+        payloads.append({
+            "campaign_id": campaign_id,
             "contact_id": str(contact.id),
-            "user_id": str(campaign.user_id),
+            "user_id": user_id,
             "from_number": campaign.sender_id,
             "to_number": contact.phone_number,
-            "content": campaign_contact.personalized_message,
+            "content": personalized_message,
             "priority": campaign.priority.value,
-            "scheduled_at": datetime.utcnow().isoformat()
-        }
-        
-        queue_entry = MessageQueue(
-            queue_name="campaign_messages",
-            priority=_get_priority_value(campaign.priority),
-            message_data=message_data,
-            scheduled_at=datetime.utcnow(),
-            campaign_id=campaign.id
-        )
-        db.add(queue_entry)
+            "scheduled_at": now_iso
+        })
     
-    await db.commit()
+    use_copy = len(contacts) >= COPY_MIN_BATCH
+    if use_copy:
+        await copy_rows(db, CampaignContact.__table__, campaign_contacts)
+    else:
+        await db.execute(insert(CampaignContact), campaign_contacts)
+    # Queue entries get scheduled_at from the column's now() default
+    await MessageService(db).enqueue(
+        "campaign_messages",
+        payloads,
+        priority=_get_priority_value(campaign.priority),
+        campaign_id=campaign.id,
+        use_copy=use_copy
+    )
 
-def _personalize_message(template: str, contact: Contact) -> str:
-    """Personalize message template with contact data"""
-    personalized = template
-    
-    # Replace common placeholders
-    replacements = {
-        "{first_name}": contact.first_name or "",
-        "{last_name}": contact.last_name or "",
-        "{full_name}": contact.full_name or contact.display_name,
-        "{company}": contact.company or "",
-        "{phone}": contact.phone_number or ""
-    }
-    
-    # Add custom fields
-    if contact.custom_fields:
-        for key, value in contact.custom_fields.items():
-            replacements[f"{{{key}}}"] = str(value) if value else ""
+def _full_name(contact: Row) -> Optional[str]:
+    """First and last name joined, as Contact.full_name"""
+    if contact.first_name and contact.last_name:
+        return f"{contact.first_name} {contact.last_name}"
+    return contact.first_name or contact.last_name
+
+# Standard placeholders; custom_fields keys of the same name take precedence
+_STANDARD_PLACEHOLDERS = {
+    "first_name": lambda contact: contact.first_name or "",
+    "last_name": lambda contact: contact.last_name or "",
+    "full_name": lambda contact: _full_name(contact) or contact.display_name or contact.phone_number,
+    "company": lambda contact: contact.company or "",
+    "phone": lambda contact: contact.phone_number or "",
+}
+_PLACEHOLDER_RE = re.compile(r"\{([^{}]+)\}")
+
+@lru_cache(maxsize=256)
+def _compile_template(template: str) -> Tuple[str, ...]:
+    """Split a template into literal text at even and placeholder names at odd positions"""
+    return tuple(_PLACEHOLDER_RE.split(template))
+
+def _personalize_message(template: str, contact: Row) -> str:
+    """Personalize message template with contact data
     
-    # Apply replacements
-    for placeholder, value in replacements.items():
-        personalized = personalized.replace(placeholder, value)
+    The template is parsed once (and cached); each contact then only fills
+    in its placeholders and joins the pieces. Unknown placeholders are left
+    as they are.
+    """
+    parts = _compile_template(template)
+    if len(parts) == 1:
+        return template
     
-    return personalized
+    custom_fields = contact.custom_fields or {}
+    pieces = list(parts)
+    for i in range(1, len(parts), 2):
+        name = parts[i]
+        if name in custom_fields:
+            value = custom_fields[name]
+            pieces[i] = str(value) if value else ""
+        elif name in _STANDARD_PLACEHOLDERS:
+            pieces[i] = _STANDARD_PLACEHOLDERS[name](contact)
+        else:
+            pieces[i] = f"{{{name}}}"
+    return "".join(pieces)
 
-def _get_personalization_data(contact: Contact) -> Dict[str, Any]:
-    """Get personalization data for contact"""
-    return {
-        "first_name": contact.first_name,
-        "last_name": contact.last_name,
-        "full_name": contact.full_name,
-        "company": contact.company,
-        "phone": contact.phone_number,
-        "email": contact.email,
-        "custom_fields": contact.custom_fields or {}
-    }
+_PRIORITY_VALUES = {
+    "low": 1,
+    "normal": 5,
+    "high": 8,
+    "urgent": 10
+}
 
 def _get_priority_value(priority) -> int:
     """Convert priority enum to numeric value"""
-    priority_map = {
-        "low": 1,
-        "normal": 5,
-        "high": 8,
-        "urgent": 10
-    }
-    return priority_map.get(priority.value, 5)
+    return _PRIORITY_VALUES.get(priority.value, 5)
 
 @celery_app.task(bind=True)
 def process_campaign_completion(self, campaign_id: str):
     """Check and process campaign completion"""
-    return asyncio.run(_process_campaign_completion_async(campaign_id))
+    return run_async(_process_campaign_completion_async(campaign_id))
 
 async def _process_campaign_completion_async(campaign_id: str):
     """Async implementation of campaign completion processing"""
-    async with AsyncSessionLocal() as db:
+    async with SessionLocal() as db:
         try:
             # Get campaign
             result = await db.execute(
@@ -238,15 +315,15 @@ async def _process_campaign_completion_async(campaign_id: str):
             
             # Check if all messages are processed
             pending_result = await db.execute(
-                select(MessageQueue).where(
+                select(func.count()).select_from(MessageQueue).where(
                     MessageQueue.campaign_id == campaign.id
                 ).where(
-                    MessageQueue.status.in_(["pending", "processing"])
+                    MessageQueue.status.in_([QueueStatus.PENDING, QueueStatus.PROCESSING])
                 )
             )
-            pending_messages = pending_result.scalars().all()
+            pending_count = pending_result.scalar_one()
             
-            if not pending_messages:
+            if not pending_count:
                 # Campaign is complete
                 campaign.status = CampaignStatus.COMPLETED
                 campaign.completed_at = datetime.utcnow()
@@ -257,8 +334,7 @@ async def _process_campaign_completion_async(campaign_id: str):
                 await db.commit()
                 
                 # Send completion notification
-                connection_manager = ConnectionManager()
-                await connection_manager.send_campaign_update(
+                await channel_manager.send_campaign_update(
                     str(campaign.id),
                     "completed",
                     {
@@ -271,7 +347,7 @@ async def _process_campaign_completion_async(campaign_id: str):
                 
                 return f"Campaign {campaign_id} completed successfully"
             
-            return f"Campaign {campaign_id} still has {len(pending_messages)} pending messages"
+            return f"Campaign {campaign_id} still has {pending_count} pending messages"
             
         except Exception as e:
             logger.error(f"Error processing campaign completion: {e}")
@@ -279,57 +355,49 @@ async def _process_campaign_completion_async(campaign_id: str):
             raise
 
 async def _calculate_campaign_stats(db: AsyncSession, campaign: Campaign):
-    """Calculate final campaign statistics"""
-    # Get message statistics
-    from sqlalchemy import func
+    """Calculate final campaign statistics
+    
+    Message and click totals are aggregated in two single-row subqueries
+    joined into one statement, so it is one round trip. Clicks are not
+    joined to messages row by row, which would inflate the message counts.
+    """
+    message_stats = select(
+        func.count().label("total_sent"),
+        func.count().filter(Message.status == MessageStatus.DELIVERED).label("delivered"),
+        func.count().filter(
+            Message.status.in_([MessageStatus.FAILED, MessageStatus.REJECTED])
+        ).label("failed"),
+        func.sum(Message.cost_micros).label("total_cost_micros")
+    ).where(Message.campaign_id == campaign.id).subquery("message_stats")
+    
+    click_stats = select(
+        func.count().label("total_clicks"),
+        func.count(func.distinct(ClickEvent.message_id)).label("unique_clicks")
+    ).where(
+        ClickEvent.message_id.in_(select(Message.id).where(Message.campaign_id == campaign.id))
+    ).subquery("click_stats")
     
     stats_result = await db.execute(
-        select(
-            func.count(Message.id).label("total_sent"),
-            func.sum(
-                func.case(
-                    (Message.status == MessageStatus.DELIVERED, 1),
-                    else_=0
-                )
-            ).label("delivered"),
-            func.sum(
-                func.case(
-                    (Message.status.in_([MessageStatus.FAILED, MessageStatus.REJECTED]), 1),
-                    else_=0
-                )
-            ).label("failed"),
-            func.sum(Message.cost).label("total_cost")
-        ).where(Message.campaign_id == campaign.id)
+        select(message_stats, click_stats).select_from(message_stats.join(click_stats, true()))
     )
-    
-    stats = stats_result.first()
+    stats = stats_result.one()
     
     # Update campaign statistics
     campaign.messages_sent = stats.total_sent or 0
     campaign.messages_delivered = stats.delivered or 0
     campaign.messages_failed = stats.failed or 0
-    campaign.total_cost = float(stats.total_cost or 0)
-    
-    # Get click statistics
-    click_result = await db.execute(
-        select(
-            func.count(ClickEvent.id).label("total_clicks"),
-            func.count(func.distinct(ClickEvent.message_id)).label("unique_clicks")
-        ).join(Message).where(Message.campaign_id == campaign.id)
-    )
-    
-    click_stats = click_result.first()
-    campaign.clicks_count = click_stats.total_clicks or 0
-    campaign.unique_clicks = click_stats.unique_clicks or 0
+    campaign.total_cost = float(from_micros(stats.total_cost_micros or 0))
+    campaign.clicks_count = stats.total_clicks or 0
+    campaign.unique_clicks = stats.unique_clicks or 0
 
 @celery_app.task(bind=True)
 def pause_campaign(self, campaign_id: str):
     """Pause a running campaign"""
-    return asyncio.run(_pause_campaign_async(campaign_id))
+    return run_async(_pause_campaign_async(campaign_id))
 
 async def _pause_campaign_async(campaign_id: str):
     """Async implementation of campaign pausing"""
-    async with AsyncSessionLocal() as db:
+    async with SessionLocal() as db:
         try:
             # Get campaign
             result = await db.execute(
@@ -350,15 +418,15 @@ async def _pause_campaign_async(campaign_id: str):
             await db.execute(
                 update(MessageQueue)
                 .where(MessageQueue.campaign_id == campaign.id)
-                .where(MessageQueue.status == "pending")
-                .values(status="paused")
+                .where(MessageQueue.status == QueueStatus.PENDING)
+                .values(status=QueueStatus.PAUSED)
+                .execution_options(synchronize_session=False)
             )
             
             await db.commit()
             
             # Send WebSocket update
-            connection_manager = ConnectionManager()
-            await connection_manager.send_campaign_update(
+            await channel_manager.send_campaign_update(
                 str(campaign.id),
                 "paused",
                 {"paused_at": datetime.utcnow().isoformat()}
@@ -374,11 +442,11 @@ async def _pause_campaign_async(campaign_id: str):
 @celery_app.task(bind=True)
 def resume_campaign(self, campaign_id: str):
     """Resume a paused campaign"""
-    return asyncio.run(_resume_campaign_async(campaign_id))
+    return run_async(_resume_campaign_async(campaign_id))
 
 async def _resume_campaign_async(campaign_id: str):
     """Async implementation of campaign resuming"""
-    async with AsyncSessionLocal() as db:
+    async with SessionLocal() as db:
         try:
             # Get campaign
             result = await db.execute(
@@ -399,15 +467,15 @@ async def _resume_campaign_async(campaign_id: str):
             await db.execute(
                 update(MessageQueue)
                 .where(MessageQueue.campaign_id == campaign.id)
-                .where(MessageQueue.status == "paused")
-                .values(status="pending")
+                .where(MessageQueue.status == QueueStatus.PAUSED)
+                .values(status=QueueStatus.PENDING)
+                .execution_options(synchronize_session=False)
             )
             
             await db.commit()
             
             # Send WebSocket update
-            connection_manager = ConnectionManager()
-            await connection_manager.send_campaign_update(
+            await channel_manager.send_campaign_update(
                 str(campaign.id),
                 "running",
                 {"resumed_at": datetime.utcnow().isoformat()}
@@ -423,11 +491,11 @@ async def _resume_campaign_async(campaign_id: str):
 @celery_app.task(bind=True)
 def cancel_campaign(self, campaign_id: str):
     """Cancel a campaign"""
-    return asyncio.run(_cancel_campaign_async(campaign_id))
+    return run_async(_cancel_campaign_async(campaign_id))
 
 async def _cancel_campaign_async(campaign_id: str):
     """Async implementation of campaign cancellation"""
-    async with AsyncSessionLocal() as db:
+    async with SessionLocal() as db:
         try:
             # Get campaign
             result = await db.execute(
@@ -449,8 +517,9 @@ async def _cancel_campaign_async(campaign_id: str):
             await db.execute(
                 update(MessageQueue)
                 .where(MessageQueue.campaign_id == campaign.id)
-                .where(MessageQueue.status.in_(["pending", "paused"]))
-                .values(status="cancelled")
+                .where(MessageQueue.status.in_([QueueStatus.PENDING, QueueStatus.PAUSED]))
+                .values(status=QueueStatus.CANCELLED)
+                .execution_options(synchronize_session=False)
             )
             
             # Calculate final statistics
@@ -459,8 +528,7 @@ async def _cancel_campaign_async(campaign_id: str):
             await db.commit()
             
             # Send WebSocket update
-            connection_manager = ConnectionManager()
-            await connection_manager.send_campaign_update(
+            await channel_manager.send_campaign_update(
                 str(campaign.id),
                 "cancelled",
                 {
@@ -479,27 +547,32 @@ async def _cancel_campaign_async(campaign_id: str):
 @celery_app.task(bind=True)
 def process_recurring_campaigns(self):
     """Process recurring campaigns that need to be executed"""
-    return asyncio.run(_process_recurring_campaigns_async())
+    return run_async(_process_recurring_campaigns_async())
 
 async def _process_recurring_campaigns_async():
     """Async implementation of recurring campaign processing"""
-    async with AsyncSessionLocal() as db:
+    async with SessionLocal() as db:
         try:
             # Get recurring campaigns due for execution
             now = datetime.utcnow()
             result = await db.execute(
-                select(Campaign)
+                select(Campaign.id)
                 .where(Campaign.is_recurring == True)
                 .where(Campaign.status == CampaignStatus.SCHEDULED)
                 .where(Campaign.next_run_at <= now)
             )
-            campaigns = result.scalars().all()
+            campaign_ids = result.scalars().all()
             
             processed_count = 0
-            for campaign in campaigns:
+            for campaign_id in campaign_ids:
+                # get() reloads the row if an earlier rollback expired it
+                campaign = await db.get(Campaign, campaign_id)
                 try:
-                    # Create a new campaign instance for this execution
+                    # Create a new campaign instance for this execution; the id
+                    # is assigned here so no flush is needed to learn it, and
+                    # the INSERT goes out with _start_campaign's first autoflush
                     new_campaign = Campaign(
+                        id=uuid.uuid4(),
                         name=f"{campaign.name} - {now.strftime('%Y-%m-%d %H:%M')}",
                         description=campaign.description,
                         user_id=campaign.user_id,
@@ -516,7 +589,6 @@ async def _process_recurring_campaigns_async():
                     )
                     
                     db.add(new_campaign)
-                    await db.flush()  # Get the ID
                     
                     # Start the new campaign
                     await _start_campaign(db, new_campaign)
@@ -531,7 +603,9 @@ async def _process_recurring_campaigns_async():
                     logger.info(f"Created recurring campaign execution {new_campaign.id}")
                     
                 except Exception as e:
-                    logger.error(f"Failed to process recurring campaign {campaign.id}: {e}")
+                    logger.error(f"Failed to process recurring campaign {campaign_id}: {e}")
+                    # Discard this execution's partial work before the next campaign
+                    await db.rollback()
             
             await db.commit()
             return f"Processed {processed_count} recurring campaigns"
@@ -551,8 +625,10 @@ def _calculate_next_run_time(recurrence_pattern: Dict[str, Any], current_time: d
     elif pattern_type == "weekly":
         return current_time + timedelta(weeks=interval)
     elif pattern_type == "monthly":
-        # Simplified monthly calculation
-        return current_time + timedelta(days=30 * interval)
+        # Same day next month (clamped to month end), so runs don't drift
+        return current_time + relativedelta(months=interval)
+    elif pattern_type == "yearly":
+        return current_time + relativedelta(years=interval)
     else:
         # Default to daily
         return current_time + timedelta(days=1)
\ No newline at end of file
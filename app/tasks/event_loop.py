@@ -0,0 +1,53 @@
+"""
+Persistent asyncio event loop for the async bodies of Celery tasks
+"""
+
+import asyncio
+import logging
+import threading
+from typing import Any, Coroutine, Optional, TypeVar
+
+from celery.signals import worker_process_init
+
+from app.core.database import engine
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_lock = threading.Lock()
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """The worker's event loop, started in a daemon thread on first use"""
+    global _loop
+    with _lock:
+        if _loop is None or _loop.is_closed():
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="celery-asyncio", daemon=True).start()
+        return _loop
+
+
+def run_async(coro: Coroutine[Any, Any, T]) -> T:
+    """Run ``coro`` on the worker's loop and wait for its result
+
+    Unlike asyncio.run() per task, the loop (and the engine's pooled
+    connections bound to it) lives as long as the worker process, and tasks
+    running in several threads (``-P threads``) overlap their I/O on it.
+    """
+    future = asyncio.run_coroutine_threadsafe(coro, get_loop())
+    try:
+        return future.result()
+    except BaseException:
+        # e.g. SoftTimeLimitExceeded raised in the waiting thread
+        future.cancel()
+        raise
+
+
+@worker_process_init.connect
+def _reset_after_fork(**kwargs):
+    """Prefork children start their own loop and connection pool"""
+    global _loop
+    _loop = None
+    engine.sync_engine.dispose(close=False)
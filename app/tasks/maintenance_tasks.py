@@ -0,0 +1,182 @@
+"""
+Celery tasks for database maintenance
+"""
+
+import logging
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, text
+
+from app.tasks import celery_app
+from app.tasks.event_loop import run_async
+from app.core.config import settings
+from app.core.database import SessionLocal, engine
+from app.core.partitions import (
+    drop_monthly_partitions_before, ensure_monthly_partitions, expired_monthly_partitions
+)
+from app.models.contact import ContactSegment
+
+logger = logging.getLogger(__name__)
+
+# Range-partitioned tables and how many months ahead to keep created
+PARTITIONED_TABLES = {
+    "contact_activities": 2,
+    "messages": 2,
+    "delivery_reports": 2,
+}
+
+# Tables whose old partitions are dropped after MESSAGE_RETENTION_MONTHS
+RETAINED_TABLES = ("messages", "delivery_reports")
+
+# ContactSegment.update_frequency -> how stale its membership may get
+SEGMENT_REFRESH_INTERVALS = {
+    "hourly": timedelta(hours=1),
+    "daily": timedelta(days=1),
+    "weekly": timedelta(weeks=1),
+}
+
+@celery_app.task(bind=True)
+def create_partitions(self):
+    """Pre-create upcoming monthly partitions"""
+    return run_async(_create_partitions_async())
+
+async def _create_partitions_async():
+    """Async implementation of partition creation"""
+    try:
+        async with engine.begin() as conn:
+            for table_name, months_ahead in PARTITIONED_TABLES.items():
+                await conn.run_sync(ensure_monthly_partitions, table_name, months_ahead)
+        return f"Ensured partitions for {len(PARTITIONED_TABLES)} tables"
+        
+    except Exception as e:
+        logger.error(f"Error creating partitions: {e}")
+        raise
+
+@celery_app.task(bind=True)
+def drop_expired_partitions(self, batch_size: int = 10000):
+    """Drop message/DLR partitions older than the retention window"""
+    return run_async(_drop_expired_partitions_async(batch_size))
+
+async def _drop_expired_partitions_async(batch_size: int):
+    """Async implementation of partition retention"""
+    today = datetime.utcnow().date()
+    months = today.year * 12 + today.month - 1 - settings.MESSAGE_RETENTION_MONTHS
+    cutoff = today.replace(year=months // 12, month=months % 12 + 1, day=1)
+    try:
+        # message_details has no FK to the partitioned messages table: purge
+        # the rows of each expiring partition first, in short batches
+        async with engine.connect() as conn:
+            expired = await conn.run_sync(expired_monthly_partitions, "messages", cutoff)
+        purged = 0
+        for partition in expired:
+            purged += await _purge_message_details(partition, batch_size)
+        
+        dropped = []
+        async with engine.begin() as conn:
+            for table_name in RETAINED_TABLES:
+                dropped += await conn.run_sync(drop_monthly_partitions_before, table_name, cutoff)
+            if dropped:
+                await conn.execute(text("DELETE FROM click_events WHERE clicked_at < :cutoff"), {"cutoff": cutoff})
+        return (
+            f"Dropped {len(dropped)} partitions older than {cutoff.isoformat()} "
+            f"and {purged} message details"
+        )
+        
+    except Exception as e:
+        logger.error(f"Error dropping expired partitions: {e}")
+        raise
+
+async def _purge_message_details(partition: str, batch_size: int) -> int:
+    """Delete the message_details rows of one messages partition, walking it by id"""
+    select_batch = text(f"SELECT id FROM {partition} WHERE id > :last_id ORDER BY id LIMIT :batch_size")
+    delete_batch = text("DELETE FROM message_details WHERE message_id = ANY(:ids)")
+    total = 0
+    last_id = uuid.UUID(int=0)
+    while True:
+        async with engine.begin() as conn:
+            ids = (await conn.execute(select_batch, {"last_id": last_id, "batch_size": batch_size})).scalars().all()
+            if ids:
+                total += (await conn.execute(delete_batch, {"ids": ids})).rowcount
+        if len(ids) < batch_size:
+            return total
+        last_id = ids[-1]
+
+@celery_app.task(bind=True)
+def refresh_contact_segments(self):
+    """Re-evaluate auto-updating segments whose membership is due for a refresh"""
+    return run_async(_refresh_contact_segments_async())
+
+async def _refresh_contact_segments_async():
+    """Async implementation of segment refresh, one transaction per segment"""
+    now = datetime.utcnow()
+    async with SessionLocal() as db:
+        segments = (await db.execute(
+            select(ContactSegment.id, ContactSegment.update_frequency, ContactSegment.last_calculated).where(
+                ContactSegment.is_active == True,
+                ContactSegment.auto_update == True
+            )
+        )).all()
+    due = [
+        segment.id for segment in segments
+        if segment.last_calculated is None
+        or segment.last_calculated.replace(tzinfo=None)
+        + SEGMENT_REFRESH_INTERVALS.get(segment.update_frequency, timedelta(days=1)) <= now
+    ]
+    
+    refreshed = 0
+    for segment_id in due:
+        async with SessionLocal() as db:
+            try:
+                segment = await db.get(ContactSegment, segment_id)
+                await segment.refresh_membership(db)
+                await db.commit()
+                refreshed += 1
+            except Exception as e:
+                logger.error(f"Failed to refresh contact segment {segment_id}: {e}")
+                await db.rollback()
+    return f"Refreshed {refreshed} of {len(due)} due contact segments"
+
+@celery_app.task(bind=True)
+def backfill_message_columns(self, batch_size: int = 10000):
+    """One-off: copy country_code/template_id out of message metadata into their columns"""
+    return run_async(_backfill_message_columns_async(batch_size))
+
+async def _backfill_message_columns_async(batch_size: int):
+    """Async implementation of the message column backfill, walking the table by id"""
+    statement = text("""
+        WITH batch AS (
+            SELECT id FROM messages
+            WHERE id > :last_id
+              AND message_metadata ?| array['country_code', 'template_id']
+            ORDER BY id
+            LIMIT :batch_size
+        )
+        UPDATE messages AS m
+        SET country_code = COALESCE(
+                m.country_code, upper(left(NULLIF(m.message_metadata ->> 'country_code', ''), 2))
+            ),
+            -- Only ids of templates that still exist (and are valid uuids)
+            template_id = COALESCE(
+                m.template_id,
+                (SELECT t.id FROM message_templates t WHERE t.id::text = m.message_metadata ->> 'template_id')
+            )
+        FROM batch
+        WHERE m.id = batch.id
+        RETURNING m.id
+    """)
+    total = 0
+    last_id = uuid.UUID(int=0)
+    try:
+        while True:
+            async with engine.begin() as conn:
+                ids = (await conn.execute(statement, {"last_id": last_id, "batch_size": batch_size})).scalars().all()
+            total += len(ids)
+            if len(ids) < batch_size:
+                break
+            last_id = max(ids)
+        return f"Backfilled {total} messages"
+        
+    except Exception as e:
+        logger.error(f"Error backfilling message columns: {e}")
+        raise
@@ -355,4 +355,9 @@ async def ping_task(connection_manager: ConnectionManager):
             
         except Exception as e:
             logger.error(f"Error in ping task: {e}")
-            await asyncio.sleep(60)  # Wait 1 minute on error
\ No newline at end of file
+            await asyncio.sleep(60)  # Wait 1 minute on error
+
+
+# Shared instances; import these rather than constructing new managers
+connection_manager = ConnectionManager()
+channel_manager = ChannelManager(connection_manager)
@@ -0,0 +1,26 @@
+"""
+Tests for recurring-campaign scheduling in app.tasks.campaign_tasks
+"""
+from datetime import datetime
+
+import pytest
+
+campaign_tasks = pytest.importorskip("app.tasks.campaign_tasks")
+
+
+@pytest.mark.parametrize("pattern, expected", [
+    ({"type": "daily"}, datetime(2024, 2, 1, 9, 30)),
+    ({"type": "daily", "interval": 3}, datetime(2024, 2, 3, 9, 30)),
+    ({"type": "weekly", "interval": 2}, datetime(2024, 2, 14, 9, 30)),
+    ({"type": "monthly"}, datetime(2024, 2, 29, 9, 30)),
+    ({"type": "yearly"}, datetime(2025, 1, 31, 9, 30)),
+    ({"type": "hourly"}, datetime(2024, 2, 1, 9, 30)),
+])
+def test_next_run_time(pattern, expected):
+    assert campaign_tasks._calculate_next_run_time(pattern, datetime(2024, 1, 31, 9, 30)) == expected
+
+
+def test_monthly_runs_do_not_drift():
+    # The day of month is only clamped when the target month is shorter
+    start = datetime(2024, 1, 31)
+    assert campaign_tasks._calculate_next_run_time({"type": "monthly", "interval": 2}, start) == datetime(2024, 3, 31)
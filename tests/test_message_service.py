@@ -0,0 +1,79 @@
+"""
+Tests for the DLR parsing and status-update coalescing in app.services.message_service
+"""
+import uuid
+from datetime import datetime
+
+from app.models.message import MessageStatus
+from app.services.message_service import coalesce_status_updates, parse_jasmin_dlr
+
+MESSAGE_ID = uuid.UUID("0190a5c4-0000-7000-8000-000000000001")
+
+
+def test_delivered_dlr_builds_report():
+    update, report = parse_jasmin_dlr(MESSAGE_ID, {
+        "id": "gw-1", "message_status": "DELIVRD", "level": "3",
+        "subdate": "2410151200", "donedate": "2410151201", "connector": "smpp1", "text": "hi",
+    })
+
+    assert update["status"] == MessageStatus.DELIVERED
+    assert update["gateway_message_id"] == "gw-1"
+    assert update["delivered_at"] == datetime(2024, 10, 15, 12, 1)
+    assert update["dlr_status"] == "DELIVRD"
+    assert report["message_id"] == MESSAGE_ID
+    assert report["submit_date"] == datetime(2024, 10, 15, 12, 0)
+    assert report["connector_id"] == "smpp1"
+    assert report["raw_dlr"]["text"] == "hi"
+
+
+def test_level_1_dlr_only_updates_message():
+    update, report = parse_jasmin_dlr(MESSAGE_ID, {"id": "gw-1", "message_status": "ESME_ROK", "level": "1"})
+
+    assert report is None
+    assert update["status"] == MessageStatus.SENT
+    assert "sent_at" in update
+    assert "dlr_status" not in update
+
+
+def test_failed_dlr_records_error_code():
+    update, report = parse_jasmin_dlr(MESSAGE_ID, {"message_status": "UNDELIV", "err": "0123456789abc"})
+
+    assert update["status"] == MessageStatus.FAILED
+    assert update["error_code"] == "0123456789"
+    assert report["dlr_error"] == "0123456789"
+    assert report["gateway_message_id"] == ""
+
+
+def test_unrecognised_dlr_statuses():
+    esme, _ = parse_jasmin_dlr(MESSAGE_ID, {"message_status": "ESME_RTHROTTLED", "level": "1"})
+    other, _ = parse_jasmin_dlr(MESSAGE_ID, {"message_status": "WHATEVER"})
+
+    assert esme["status"] == MessageStatus.FAILED
+    assert esme["error_code"] == "ESME_RTHROTTLED"
+    assert other["status"] == MessageStatus.UNKNOWN
+
+
+def test_malformed_done_date_falls_back_to_now():
+    update, report = parse_jasmin_dlr(MESSAGE_ID, {"message_status": "DELIVRD", "donedate": "garbage"})
+
+    assert isinstance(update["delivered_at"], datetime)
+    assert report["done_date"] is None
+
+
+def test_coalesce_merges_per_message_and_later_values_win():
+    other_id = uuid.uuid4()
+    merged = coalesce_status_updates([
+        {"id": str(MESSAGE_ID), "status": MessageStatus.SENT, "sent_at": 1},
+        {"id": other_id, "status": MessageStatus.FAILED, "error_message": "boom"},
+        {"id": MESSAGE_ID, "status": MessageStatus.DELIVERED, "delivered_at": 2},
+    ])
+
+    assert set(merged) == {MESSAGE_ID, other_id}
+    assert merged[MESSAGE_ID] == {"status": MessageStatus.DELIVERED, "sent_at": 1, "delivered_at": 2}
+    assert merged[other_id] == {"status": MessageStatus.FAILED, "error_message": "boom"}
+
+
+def test_coalesce_drops_unknown_fields():
+    merged = coalesce_status_updates([{"id": MESSAGE_ID, "status": MessageStatus.SENT, "content": "x"}])
+
+    assert merged[MESSAGE_ID] == {"status": MessageStatus.SENT}
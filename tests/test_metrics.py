@@ -0,0 +1,55 @@
+"""
+Tests for the hourly chart buckets kept by MetricsService
+"""
+from datetime import datetime, timedelta
+
+from app.services.metrics import MetricsService
+
+NOW = datetime(2024, 10, 15, 13, 42)
+
+
+def _hours(service):
+    return [bucket["hour"] for bucket in service._hourly]
+
+
+def test_first_update_fills_24_hours_ending_now():
+    service = MetricsService()
+    service._update_hourly(NOW)
+
+    assert len(service._hourly) == 24
+    assert _hours(service)[0] == "14:00"
+    assert _hours(service)[-1] == "13:00"
+
+
+def test_same_hour_only_replaces_last_bucket():
+    service = MetricsService()
+    service._update_hourly(NOW)
+    before = list(service._hourly)
+
+    service._update_hourly(NOW + timedelta(minutes=10))
+
+    assert list(service._hourly)[:-1] == before[:-1]
+    assert _hours(service)[-1] == "13:00"
+
+
+def test_rolled_over_hours_are_appended():
+    service = MetricsService()
+    service._update_hourly(NOW)
+    before = list(service._hourly)
+
+    service._update_hourly(NOW + timedelta(hours=2))
+
+    assert len(service._hourly) == 24
+    assert list(service._hourly)[:-2] == before[2:]
+    assert _hours(service)[-2:] == ["14:00", "15:00"]
+
+
+def test_long_gap_rebuilds_the_window():
+    service = MetricsService()
+    service._update_hourly(NOW)
+
+    service._update_hourly(NOW + timedelta(days=3))
+
+    assert len(service._hourly) == 24
+    assert _hours(service)[-1] == "13:00"
+    assert service._hourly_current == datetime(2024, 10, 18, 13)
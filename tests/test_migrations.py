@@ -0,0 +1,95 @@
+"""
+Migration round trip: the Alembic chain must reproduce the models' DDL
+
+The initial revision is empty (the app bootstraps its baseline schema with
+create_all), so downgrading to base turns a fresh create_all database back
+into that baseline, and upgrading again must land on the models exactly.
+Runs against a scratch PostgreSQL database named by TEST_DATABASE_URL
+(postgresql+asyncpg://...); its public schema is dropped and recreated.
+"""
+import asyncio
+import os
+from pathlib import Path
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+import app.models  # noqa: F401  (registers every table on Base.metadata)
+from app.core.database import Base
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+ROOT = Path(__file__).resolve().parents[1]
+
+pytestmark = pytest.mark.skipif(not TEST_DATABASE_URL, reason="TEST_DATABASE_URL not set")
+
+# Columns, constraints, indexes, triggers, functions and partition keys of
+# every table, partitions folded into their parents (their names are dated)
+CATALOG_QUERY = text(r"""
+    WITH rels AS (
+        SELECT c.oid, c.relname, c.relkind FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = 'public' AND c.relkind IN ('r', 'p') AND NOT c.relispartition
+          AND c.relname <> 'alembic_version'
+    )
+    SELECT 'table ' || relname || ' ' || relkind::text FROM rels
+    UNION ALL
+    SELECT 'column ' || r.relname || '.' || a.attname || ' ' || format_type(a.atttypid, a.atttypmod)
+        || CASE WHEN a.attnotnull THEN ' NOT NULL' ELSE '' END
+        || coalesce(CASE WHEN a.attgenerated = 's' THEN ' GENERATED ' ELSE ' DEFAULT ' END
+                    || pg_get_expr(d.adbin, d.adrelid), '')
+    FROM rels r JOIN pg_attribute a ON a.attrelid = r.oid AND a.attnum > 0 AND NOT a.attisdropped
+    LEFT JOIN pg_attrdef d ON d.adrelid = r.oid AND d.adnum = a.attnum
+    UNION ALL
+    SELECT 'constraint ' || r.relname || ' ' || co.conname || ' ' || pg_get_constraintdef(co.oid)
+    FROM rels r JOIN pg_constraint co ON co.conrelid = r.oid
+    UNION ALL
+    SELECT 'index ' || replace(pg_get_indexdef(i.indexrelid), ' ON ONLY ', ' ON ')
+    FROM rels r JOIN pg_index i ON i.indrelid = r.oid
+    UNION ALL
+    SELECT 'trigger ' || pg_get_triggerdef(t.oid)
+    FROM rels r JOIN pg_trigger t ON t.tgrelid = r.oid AND NOT t.tgisinternal
+    UNION ALL
+    SELECT 'function ' || p.oid::regprocedure::text FROM pg_proc p
+    JOIN pg_namespace n ON n.oid = p.pronamespace WHERE n.nspname = 'public'
+    UNION ALL
+    SELECT 'partition key ' || relname || ' ' || pg_get_partkeydef(oid) FROM rels WHERE relkind = 'p'
+""")
+
+
+async def _round_trip():
+    engine = create_async_engine(TEST_DATABASE_URL)
+    config = Config(str(ROOT / "alembic.ini"))
+    config.set_main_option("script_location", str(ROOT / "alembic"))
+
+    def alembic(connection, action, revision):
+        config.attributes["connection"] = connection
+        getattr(command, action)(config, revision)
+
+    async def catalog(connection):
+        return set((await connection.execute(CATALOG_QUERY)).scalars())
+
+    try:
+        async with engine.begin() as connection:
+            await connection.execute(text("DROP SCHEMA public CASCADE"))
+            await connection.execute(text("CREATE SCHEMA public"))
+            await connection.run_sync(Base.metadata.create_all)
+            from_models = await catalog(connection)
+            await connection.run_sync(alembic, "stamp", "head")
+            await connection.run_sync(alembic, "downgrade", "base")
+            after_downgrade = await catalog(connection)
+            await connection.run_sync(alembic, "upgrade", "head")
+            from_migrations = await catalog(connection)
+    finally:
+        await engine.dispose()
+    return from_models, after_downgrade, from_migrations
+
+
+def test_downgrade_then_upgrade_matches_models():
+    from_models, after_downgrade, from_migrations = asyncio.run(_round_trip())
+
+    assert after_downgrade != from_models
+    assert sorted(from_migrations - from_models) == []
+    assert sorted(from_models - from_migrations) == []
@@ -0,0 +1,52 @@
+"""
+Tests for compile_segment_rules in app.models.contact
+"""
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.models.contact import compile_segment_rules
+
+
+def _sql(rules):
+    return str(compile_segment_rules(rules).compile(dialect=postgresql.dialect()))
+
+
+def test_empty_rules_match_everything():
+    assert _sql(None) == _sql({}) == "true"
+
+
+def test_column_operators_use_bound_parameters():
+    clause = compile_segment_rules({"country_code": {"equals": "FR"}, "preferred_language": {"in": ["fr", "en"]}})
+    sql = str(clause.compile(dialect=postgresql.dialect()))
+    params = clause.compile(dialect=postgresql.dialect()).params
+
+    assert "contacts.country_code = %(country_code_1)s" in sql
+    assert "contacts.preferred_language IN (__[POSTCOMPILE_preferred_language_1])" in sql
+    assert params == {"country_code_1": "FR", "preferred_language_1": ["fr", "en"]}
+
+
+def test_nested_and_or():
+    sql = _sql({"or": [{"country_code": {"equals": "FR"}}, {"and": [{"opted_in": {"equals": True}}]}]})
+
+    assert " OR " in sql
+    assert "contacts.opted_in" in sql
+
+
+def test_custom_fields_contains():
+    assert "contacts.custom_fields @>" in _sql({"custom_fields": {"contains": {"plan": "gold"}}})
+
+
+def test_equal_documents_share_the_compiled_clause():
+    first = compile_segment_rules({"preferred_language": {"equals": "fr"}, "country_code": {"equals": "FR"}})
+    second = compile_segment_rules({"country_code": {"equals": "FR"}, "preferred_language": {"equals": "fr"}})
+
+    assert first is second
+
+
+@pytest.mark.parametrize("rules", [
+    {"no_such_column": {"equals": 1}},
+    {"country_code": {"like": "F%"}},
+])
+def test_unsupported_rules_raise(rules):
+    with pytest.raises(ValueError):
+        compile_segment_rules(rules)